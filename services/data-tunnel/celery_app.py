@@ -1,7 +1,21 @@
 from celery import Celery
+from kombu.serialization import register
 
+from pipeline.serialization import dumps_bytes, loads, orjson
 from settings import get_settings
 
+if orjson:
+    register(
+        "orjson",
+        dumps_bytes,
+        loads,
+        content_type="application/x-orjson",
+        content_encoding="binary",
+    )
+    _SERIALIZER = "orjson"
+else:  # pragma: no cover - fallback for minimal envs
+    _SERIALIZER = "json"
+
 
 def create_celery() -> Celery:
     settings = get_settings()
@@ -12,6 +26,9 @@ def create_celery() -> Celery:
         include=["workers.tasks"],
     )
     celery_app.conf.timezone = "UTC"
+    celery_app.conf.task_serializer = _SERIALIZER
+    celery_app.conf.result_serializer = _SERIALIZER
+    celery_app.conf.accept_content = ["json", _SERIALIZER]
     celery_app.conf.task_acks_late = True
     celery_app.conf.worker_max_tasks_per_child = 100
     celery_app.conf.beat_schedule = {
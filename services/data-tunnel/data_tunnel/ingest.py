@@ -13,7 +13,7 @@ from langdetect import LangDetectException, detect
 from pipeline.models import Manifest
 from settings import get_settings
 
-from .text_extract import TextExtractionResult, extract_text
+from .text_extract import Blob, TextExtractionResult, extract_text, peek
 
 logger = logging.getLogger(__name__)
 _settings = get_settings()
@@ -51,12 +51,12 @@ CHUNKING_PRESETS: Dict[str, Dict[str, int]] = {
 }
 
 
-def _detect_mime(blob: bytes, manifest_mime: str | None = None) -> str:
+def _detect_mime(blob: Blob, manifest_mime: str | None = None) -> str:
     if manifest_mime and manifest_mime != "application/octet-stream":
         return manifest_mime
     if _MAGIC:
         try:
-            return _MAGIC.from_buffer(blob)
+            return _MAGIC.from_buffer(peek(blob))
         except Exception as exc:  # pragma: no cover - libmagic edge cases
             logger.debug("libmagic detection failed: %s", exc)
     return manifest_mime or "application/octet-stream"
@@ -95,7 +95,7 @@ def _extract_filename(manifest: Manifest) -> str:
     return path.rstrip("/").split("/")[-1] or "upload.bin"
 
 
-def ingest_manifest(manifest: Manifest, blob: bytes) -> Dict[str, Any]:
+def ingest_manifest(manifest: Manifest, blob: Blob) -> Dict[str, Any]:
     """Perform parsing, metadata enrichment, and chunking hints for a manifest."""
 
     mime = _detect_mime(blob, manifest.mime)
@@ -5,11 +5,12 @@ import io
 import json
 import logging
 import mimetypes
+import shutil
 import subprocess
 import tempfile
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, BinaryIO, Dict, List, Optional, Union
 
 import pytesseract
 from PIL import Image, UnidentifiedImageError
@@ -49,6 +50,43 @@ except ImportError:  # pragma: no cover
     load_workbook = None
 
 
+# Raw documents arrive either as bytes or as a seekable file (spooled S3 download).
+Blob = Union[bytes, BinaryIO]
+
+
+def _as_stream(data: Blob) -> BinaryIO:
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        return io.BytesIO(data)
+    data.seek(0)
+    return data
+
+
+def _as_bytes(data: Blob) -> bytes:
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        return bytes(data)
+    data.seek(0)
+    return data.read()
+
+
+def _is_empty(data: Blob) -> bool:
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        return not data
+    data.seek(0, io.SEEK_END)
+    empty = data.tell() == 0
+    data.seek(0)
+    return empty
+
+
+def peek(data: Blob, size: int = 2048) -> bytes:
+    """Return the leading bytes of a blob without consuming a stream."""
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        return bytes(data[:size])
+    data.seek(0)
+    head = data.read(size)
+    data.seek(0)
+    return head
+
+
 @dataclass
 class TextExtractionResult:
     text: str
@@ -60,7 +98,7 @@ class TextExtractionResult:
     ocr_confidence: float = 1.0
 
 
-def _extract_pdf(data: bytes) -> TextExtractionResult:
+def _extract_pdf(data: Blob) -> TextExtractionResult:
     if not pdfplumber:
         logger.debug("pdfplumber not available; using pdfminer fallback")
         return _extract_pdf_pdfminer(data)
@@ -68,7 +106,7 @@ def _extract_pdf(data: bytes) -> TextExtractionResult:
     pages: List[str] = []
     tables: List[str] = []
     try:
-        with pdfplumber.open(io.BytesIO(data)) as pdf:
+        with pdfplumber.open(_as_stream(data)) as pdf:
             for page in pdf.pages:
                 text = page.extract_text() or ""
                 pages.append(text.strip())
@@ -105,12 +143,12 @@ def _extract_pdf(data: bytes) -> TextExtractionResult:
     return _extract_pdf_pdfminer(data)
 
 
-def _extract_pdf_pdfminer(data: bytes) -> TextExtractionResult:
+def _extract_pdf_pdfminer(data: Blob) -> TextExtractionResult:
     if not pdfminer_extract_text:
         logger.debug("pdfminer not available; returning empty PDF extraction")
         return TextExtractionResult(text="", doc_type="pdf")
     try:
-        text = pdfminer_extract_text(io.BytesIO(data)) or ""
+        text = pdfminer_extract_text(_as_stream(data)) or ""
         pages = [page.strip() for page in text.split("\f") if page.strip()]
         combined = "\n\n".join(pages) if pages else text
         return TextExtractionResult(text=combined, doc_type="pdf", pages=pages)
@@ -119,10 +157,10 @@ def _extract_pdf_pdfminer(data: bytes) -> TextExtractionResult:
         return TextExtractionResult(text="", doc_type="pdf")
 
 
-def _extract_docx(data: bytes) -> TextExtractionResult:
+def _extract_docx(data: Blob) -> TextExtractionResult:
     if not Document:
         return TextExtractionResult(text="", doc_type="docx")
-    document = Document(io.BytesIO(data))
+    document = Document(_as_stream(data))
     paragraphs = [p.text.strip() for p in document.paragraphs if p.text.strip()]
     tables: List[str] = []
     for table in document.tables:
@@ -132,16 +170,17 @@ def _extract_docx(data: bytes) -> TextExtractionResult:
     return TextExtractionResult(text=text_body, doc_type="docx", pages=paragraphs, tables=tables)
 
 
-def _extract_txt(data: bytes) -> TextExtractionResult:
+def _extract_txt(data: Blob) -> TextExtractionResult:
+    raw = _as_bytes(data)
     try:
-        text = data.decode("utf-8")
+        text = raw.decode("utf-8")
     except UnicodeDecodeError:
-        text = data.decode("latin-1", errors="ignore")
+        text = raw.decode("latin-1", errors="ignore")
     return TextExtractionResult(text=text, doc_type="txt", pages=text.splitlines())
 
 
-def _extract_csv(data: bytes) -> TextExtractionResult:
-    decoded = data.decode("utf-8", errors="ignore")
+def _extract_csv(data: Blob) -> TextExtractionResult:
+    decoded = _as_bytes(data).decode("utf-8", errors="ignore")
     handle = io.StringIO(decoded, newline="")
     reader = csv.reader(handle)
     rows: List[str] = []
@@ -158,10 +197,10 @@ def _extract_csv(data: bytes) -> TextExtractionResult:
     return TextExtractionResult(text=text, doc_type="csv", pages=rows, tables=tables)
 
 
-def _extract_pptx(data: bytes) -> TextExtractionResult:
+def _extract_pptx(data: Blob) -> TextExtractionResult:
     if not Presentation:
         return TextExtractionResult(text="", doc_type="pptx")
-    presentation = Presentation(io.BytesIO(data))
+    presentation = Presentation(_as_stream(data))
     slides: List[str] = []
     for slide in presentation.slides:
         slide_text = []
@@ -174,10 +213,10 @@ def _extract_pptx(data: bytes) -> TextExtractionResult:
     return TextExtractionResult(text=combined, doc_type="pptx", pages=slides)
 
 
-def _extract_xlsx(data: bytes) -> TextExtractionResult:
+def _extract_xlsx(data: Blob) -> TextExtractionResult:
     if not load_workbook:
         return TextExtractionResult(text="", doc_type="xlsx")
-    workbook = load_workbook(io.BytesIO(data), data_only=True, read_only=True)
+    workbook = load_workbook(_as_stream(data), data_only=True, read_only=True)
     sheets_text: List[str] = []
     for sheet in workbook.worksheets:
         values = []
@@ -191,28 +230,28 @@ def _extract_xlsx(data: bytes) -> TextExtractionResult:
     return TextExtractionResult(text=text, doc_type="xlsx", pages=sheets_text, tables=sheets_text)
 
 
-def _extract_image(data: bytes, languages: str) -> TextExtractionResult:
-    with Image.open(io.BytesIO(data)) as image:
+def _extract_image(data: Blob, languages: str) -> TextExtractionResult:
+    with Image.open(_as_stream(data)) as image:
         text = pytesseract.image_to_string(image, lang=languages)
     confidence = 0.6 if text.strip() else 0.0
     return TextExtractionResult(text=text, doc_type="image", pages=[text], ocr_applied=True, ocr_confidence=confidence)
 
 
-def _extract_with_unstructured(data: bytes, filename: str) -> TextExtractionResult:
+def _extract_with_unstructured(data: Blob, filename: str) -> TextExtractionResult:
     if not partition:
         return TextExtractionResult(text="", doc_type="binary")
-    elements = partition(file=io.BytesIO(data), file_filename=filename)
+    elements = partition(file=_as_stream(data), file_filename=filename)
     text_fragments = [element.text for element in elements if getattr(element, "text", None)]
     text = "\n".join(text_fragments)
     return TextExtractionResult(text=text, doc_type="unstructured", pages=text_fragments)
 
 
-def _run_ocrmypdf(data: bytes, languages: str) -> Optional[TextExtractionResult]:
+def _run_ocrmypdf(data: Blob, languages: str) -> Optional[TextExtractionResult]:
     if not pdfplumber:
         return None
     try:
         with tempfile.NamedTemporaryFile(suffix=".pdf") as src, tempfile.NamedTemporaryFile(suffix=".pdf") as dst:
-            src.write(data)
+            shutil.copyfileobj(_as_stream(data), src)
             src.flush()
             cmd = [
                 "ocrmypdf",
@@ -227,9 +266,8 @@ def _run_ocrmypdf(data: bytes, languages: str) -> Optional[TextExtractionResult]
             if completed.returncode != 0:
                 logger.debug("ocrmypdf failed: %s", completed.stderr.decode("utf-8", errors="ignore"))
                 return None
-            dst.seek(0)
             with open(dst.name, "rb") as handle:
-                return _extract_pdf(handle.read())
+                return _extract_pdf(handle)
     except FileNotFoundError:
         logger.debug("ocrmypdf not installed; skipping PDF OCR")
     except Exception as exc:  # pragma: no cover - rare system level error
@@ -237,9 +275,9 @@ def _run_ocrmypdf(data: bytes, languages: str) -> Optional[TextExtractionResult]
     return None
 
 
-def _extract_json(data: bytes) -> TextExtractionResult:
+def _extract_json(data: Blob) -> TextExtractionResult:
     try:
-        parsed = json.loads(data.decode("utf-8", errors="ignore"))
+        parsed = json.loads(_as_bytes(data).decode("utf-8", errors="ignore"))
     except json.JSONDecodeError:
         return TextExtractionResult(text="", doc_type="json")
     text = json.dumps(parsed, indent=2)
@@ -253,7 +291,7 @@ def _extension_from_filename(filename: str | None) -> str:
 
 
 def extract_text(
-    data: bytes,
+    data: Blob,
     filename: str | None,
     mime: str | None,
     *,
@@ -262,7 +300,7 @@ def extract_text(
 ) -> TextExtractionResult:
     """Return a best-effort textual representation for arbitrary files."""
 
-    if not data:
+    if _is_empty(data):
         return TextExtractionResult(text="", doc_type="binary")
 
     extension = _extension_from_filename(filename)
@@ -299,7 +337,7 @@ def extract_text(
             try:
                 return _extract_image(data, ocr_languages)
             except UnidentifiedImageError:
-                fallback_text = data.decode("utf-8", errors="ignore")
+                fallback_text = _as_bytes(data).decode("utf-8", errors="ignore")
                 return TextExtractionResult(
                     text=fallback_text,
                     doc_type="binary",
@@ -7,6 +7,7 @@ from sqlalchemy import (
     DateTime,
     Enum,
     ForeignKey,
+    Index,
     Integer,
     MetaData,
     String,
@@ -57,6 +58,17 @@ lineage_nodes = Table(
     Column("created_at", DateTime, nullable=False),
 )
 
+# At most one completion marker per ingest and stage; atomic_complete relies on it for ON CONFLICT.
+# Kept as literal SQL: ON CONFLICT can only match a partial index whose predicate it sees as a constant.
+STAGE_COMPLETED_WHERE = text(r"node_type LIKE 'stage:%\:completed'")
+Index(
+    "uq_lineage_nodes_stage_completed",
+    lineage_nodes.c.ingest_id,
+    lineage_nodes.c.node_type,
+    unique=True,
+    postgresql_where=STAGE_COMPLETED_WHERE,
+)
+
 lineage_edges = Table(
     "lineage_edges",
     _metadata,
@@ -139,6 +151,12 @@ def init_db() -> None:
         "ALTER TABLE manifests ADD COLUMN IF NOT EXISTS original_basename TEXT",
         "ALTER TABLE manifests ADD COLUMN IF NOT EXISTS doc_type TEXT",
         "ALTER TABLE manifests ADD COLUMN IF NOT EXISTS metadata JSONB DEFAULT '{}'::jsonb",
+        # Older deployments could record a stage twice; keep the earliest marker before adding the index.
+        "DELETE FROM lineage_nodes a USING lineage_nodes b"
+        r" WHERE a.node_type LIKE 'stage:%\:completed' AND a.ingest_id = b.ingest_id AND a.node_type = b.node_type"
+        " AND (a.created_at, a.node_id) > (b.created_at, b.node_id)",
+        "CREATE UNIQUE INDEX IF NOT EXISTS uq_lineage_nodes_stage_completed"
+        r" ON lineage_nodes (ingest_id, node_type) WHERE node_type LIKE 'stage:%\:completed'",
     ]
     with _engine.begin() as conn:
         for statement in patch_statements:
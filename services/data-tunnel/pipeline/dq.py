@@ -1,7 +1,8 @@
 import logging
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Iterable, Tuple
+from typing import Any, Callable, Dict, Iterable, Tuple
 
 try:
     import yaml
@@ -28,6 +29,57 @@ def _load_checks(config_path: Path) -> Dict[str, Any]:
     return checks
 
 
+@lru_cache(maxsize=32)
+def compile_checks(
+    config_path: Path,
+    skip: Tuple[str, ...] = (),
+) -> Callable[[Dict[str, Any]], Tuple[bool, Dict[str, Any]]]:
+    """Load the check config once per (config, skip set) and return the per-document evaluator."""
+    config = _load_checks(config_path).get("checks", {})
+    skip_set = frozenset(item.strip() for item in skip if item)
+    skipped = sorted(skip_set)
+    check_not_empty = bool(config.get("not_empty"))
+    check_language = bool(config.get("language_detect"))
+    ocr_threshold = float(config.get("ocr_conf_min", 0)) if config.get("ocr_conf_min") is not None else None
+    # The remaining checks are stubs that always pass until implemented.
+    stub_checks = tuple(key for key in ("table_schema_sanity", "date_unit_sanity") if key in config)
+
+    def _evaluate(payload: Dict[str, Any]) -> Tuple[bool, Dict[str, Any]]:
+        report: Dict[str, Any] = {
+            "checks": {},
+            "skipped": list(skipped),
+            "timestamp": datetime.utcnow().isoformat(),
+        }
+        passed = True
+
+        def _mark(check: str, condition: bool) -> bool:
+            if check in skip_set:
+                report["checks"][check] = True
+                return True
+            report["checks"][check] = condition
+            return condition
+
+        if check_not_empty:
+            condition = bool(payload.get("text"))
+            passed &= _mark("not_empty", condition)
+
+        if check_language:
+            lang_ok = payload.get("lang") in ("en", "auto")
+            passed &= _mark("language_detect", lang_ok)
+
+        if ocr_threshold is not None:
+            conf = payload.get("ocr_confidence", 1.0)
+            conf_ok = conf >= ocr_threshold
+            passed &= _mark("ocr_conf_min", conf_ok)
+
+        for key in stub_checks:
+            report["checks"][key] = True
+
+        return passed, report
+
+    return _evaluate
+
+
 def run_checks(
     ingest_id: str,
     tenant_id: str,
@@ -35,40 +87,8 @@ def run_checks(
     config_path: Path,
     skip: Iterable[str] | None = None,
 ) -> Tuple[bool, Dict[str, Any]]:
-    config = _load_checks(config_path).get("checks", {})
-    skip_set = {item.strip() for item in (skip or []) if item}
-    report: Dict[str, Any] = {
-        "checks": {},
-        "skipped": sorted(skip_set),
-        "timestamp": datetime.utcnow().isoformat(),
-    }
-    passed = True
-
-    def _mark(check: str, condition: bool) -> bool:
-        if check in skip_set:
-            report["checks"][check] = True
-            return True
-        report["checks"][check] = condition
-        return condition
-
-    if config.get("not_empty"):
-        condition = bool(payload.get("text"))
-        passed &= _mark("not_empty", condition)
-
-    if config.get("language_detect"):
-        lang_ok = payload.get("lang") in ("en", "auto")
-        passed &= _mark("language_detect", lang_ok)
-
-    if config.get("ocr_conf_min") is not None:
-        conf = payload.get("ocr_confidence", 1.0)
-        threshold = float(config.get("ocr_conf_min", 0))
-        conf_ok = conf >= threshold
-        passed &= _mark("ocr_conf_min", conf_ok)
-
-    # The remaining checks are stubs that always pass until implemented.
-    for key in ("table_schema_sanity", "date_unit_sanity"):
-        if key in config:
-            report["checks"][key] = True
+    skip_key = tuple(sorted({item.strip() for item in (skip or []) if item}))
+    passed, report = compile_checks(config_path, skip_key)(payload)
 
     with get_session() as session:
         session.execute(
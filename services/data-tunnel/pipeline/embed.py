@@ -1,13 +1,20 @@
+import hashlib
 import logging
 import random
 from pathlib import Path
-from typing import Iterable, List
+from typing import Iterable, List, Optional
 
 try:
     import yaml
 except ImportError:  # pragma: no cover
     yaml = None
 
+try:
+    import redis
+except ImportError:  # pragma: no cover
+    redis = None
+
+import numpy as np
 import requests
 
 from settings import get_settings
@@ -16,6 +23,8 @@ logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 _settings = get_settings()
 
+_cache_client = None
+
 
 def _load_config(path: Path) -> dict:
     if yaml:
@@ -176,6 +185,84 @@ def generate_embeddings(texts: Iterable[str]) -> List[List[float]]:
     raise RuntimeError(detail)
 
 
+def _get_cache_client():
+    global _cache_client
+    if _cache_client is None and redis is not None and _settings.embed_cache_ttl > 0:
+        try:
+            _cache_client = redis.Redis.from_url(_settings.redis_url)
+        except Exception as exc:  # pragma: no cover - depends on Redis availability
+            logger.warning("Embedding cache unavailable: %s", exc)
+            return None
+    return _cache_client
+
+
+def _cache_namespace(config: dict) -> str:
+    provider = (config.get("provider") or _settings.embed_provider).strip().lower()
+    models = "|".join(
+        str(value)
+        for value in (
+            config.get("ollama_model") or config.get("model") or _settings.embed_model,
+            config.get("openai_model") or _settings.openai_embed_model,
+            config.get("dims", 1536),
+        )
+    )
+    return hashlib.sha1(f"{provider}|{models}".encode("utf-8")).hexdigest()[:12]
+
+
+def _cache_key(namespace: str, text: str) -> str:
+    digest = hashlib.sha1(text.encode("utf-8", errors="ignore")).hexdigest()
+    return f"emb:{namespace}:{digest}"
+
+
+def _generate_fp16(texts: List[str]) -> List[np.ndarray]:
+    vectors = generate_embeddings(texts)
+    if len(vectors) != len(texts):
+        raise RuntimeError(f"Embedding backend returned {len(vectors)} vectors for {len(texts)} texts")
+    return [np.asarray(vector, dtype=np.float16) for vector in vectors]
+
+
+def generate_embeddings_cached(texts: Iterable[str]) -> List[List[float]]:
+    """Like generate_embeddings, but reuses vectors already computed for identical text.
+
+    Vectors are cached in Redis as float16 bytes keyed on the text digest and
+    embedding configuration, so retries and repeated chunks skip the provider call.
+    Every vector returned is rounded to float16, so a text maps to the same vector
+    whether or not it was cached.
+    """
+    text_list = list(texts)
+    client = _get_cache_client()
+    if not text_list or client is None:
+        return [vector.astype(np.float32).tolist() for vector in _generate_fp16(text_list)]
+
+    namespace = _cache_namespace(_load_config(_settings.embed_config))
+    keys = [_cache_key(namespace, text) for text in text_list]
+    try:
+        cached: List[Optional[bytes]] = client.mget(keys)
+    except Exception as exc:  # pragma: no cover - depends on Redis availability
+        logger.warning("Embedding cache lookup failed: %s", exc)
+        cached = [None] * len(text_list)
+
+    results: List[Optional[List[float]]] = [
+        np.frombuffer(raw, dtype=np.float16).astype(np.float32).tolist() if raw else None for raw in cached
+    ]
+    misses = [idx for idx, vector in enumerate(results) if vector is None]
+    logger.info("Embedding cache hits=%d misses=%d", len(text_list) - len(misses), len(misses))
+    if not misses:
+        return results  # type: ignore[return-value]
+
+    fresh = _generate_fp16([text_list[idx] for idx in misses])
+    try:
+        pipe = client.pipeline(transaction=False)
+        for idx, vector in zip(misses, fresh):
+            pipe.set(keys[idx], vector.tobytes(), ex=_settings.embed_cache_ttl)
+        pipe.execute()
+    except Exception as exc:  # pragma: no cover - depends on Redis availability
+        logger.warning("Embedding cache store failed: %s", exc)
+    for idx, vector in zip(misses, fresh):
+        results[idx] = vector.astype(np.float32).tolist()
+    return results  # type: ignore[return-value]
+
+
 def embedding_dimension() -> int:
     config = _load_config(_settings.embed_config)
     return int(config.get("dims", 1536))
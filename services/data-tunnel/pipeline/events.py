@@ -1,11 +1,16 @@
 import asyncio
-import json
 import logging
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from nats.aio.client import Client as NATS
 
+try:
+    import redis
+except ImportError:  # pragma: no cover
+    redis = None
+
 from pipeline.models import EventType
+from pipeline.serialization import dumps, dumps_bytes, loads
 from settings import get_settings
 
 logger = logging.getLogger(__name__)
@@ -13,6 +18,10 @@ _settings = get_settings()
 
 _nats: Optional[NATS] = None
 _lock = asyncio.Lock()
+_buffer_client = None
+
+TERMINAL_EVENTS = frozenset({EventType.INGESTION_COMPLETED, EventType.INGESTION_FAILED})
+_BUFFER_TTL_SECONDS = 24 * 3600
 
 
 def _topic(event_type: EventType) -> str:
@@ -47,6 +56,74 @@ async def publish(event_type: EventType, payload: Dict[str, Any], ingest_id: str
     message = {"ingest_id": ingest_id, "tenant_id": tenant_id, "payload": payload}
     client = await _ensure_connection()
     if client is None:
-        logger.info("[EVENT-FALLBACK] topic=%s data=%s", topic, json.dumps(message))
+        logger.info("[EVENT-FALLBACK] topic=%s data=%s", topic, dumps(message))
+        return
+    await client.publish(topic, dumps_bytes(message))
+
+
+async def publish_batch(events: List[Tuple[EventType, Dict[str, Any]]], ingest_id: str, tenant_id: str) -> None:
+    if not events:
         return
-    await client.publish(topic, json.dumps(message).encode("utf-8"))
+    client = await _ensure_connection()
+    for event_type, payload in events:
+        topic = _topic(event_type)
+        message = {"ingest_id": ingest_id, "tenant_id": tenant_id, "payload": payload}
+        if client is None:
+            logger.info("[EVENT-FALLBACK] topic=%s data=%s", topic, dumps(message))
+            continue
+        await client.publish(topic, dumps_bytes(message))
+    if client is not None:
+        await client.flush()
+
+
+def _get_buffer_client():
+    global _buffer_client
+    if _buffer_client is None and redis is not None:
+        try:
+            _buffer_client = redis.Redis.from_url(_settings.redis_url)
+        except Exception as exc:  # pragma: no cover - depends on Redis availability
+            logger.warning("Event buffer unavailable: %s", exc)
+            return None
+    return _buffer_client
+
+
+def _buffer_key(ingest_id: str) -> str:
+    return f"events:{ingest_id}"
+
+
+def buffer_event(event_type: EventType, payload: Dict[str, Any], ingest_id: str, tenant_id: str) -> bool:
+    """Queue an event in Redis so every Celery worker can see it; False means publish directly."""
+    client = _get_buffer_client()
+    if client is None:
+        return False
+    key = _buffer_key(ingest_id)
+    try:
+        pipe = client.pipeline(transaction=False)
+        pipe.rpush(key, dumps_bytes({"event": event_type.value, "payload": payload, "tenant_id": tenant_id}))
+        pipe.expire(key, _BUFFER_TTL_SECONDS)
+        pipe.execute()
+    except Exception as exc:  # pragma: no cover - depends on Redis availability
+        logger.warning("Event buffering failed for ingest_id=%s: %s", ingest_id, exc)
+        return False
+    return True
+
+
+def drain_events(ingest_id: str) -> List[Tuple[EventType, Dict[str, Any], str]]:
+    """Remove and return the buffered ``(event, payload, tenant_id)`` entries for an ingest, oldest first."""
+    client = _get_buffer_client()
+    if client is None:
+        return []
+    key = _buffer_key(ingest_id)
+    try:
+        pipe = client.pipeline(transaction=True)
+        pipe.lrange(key, 0, -1)
+        pipe.delete(key)
+        raw_events, _ = pipe.execute()
+    except Exception as exc:  # pragma: no cover - depends on Redis availability
+        logger.warning("Event buffer drain failed for ingest_id=%s: %s", ingest_id, exc)
+        return []
+    events: List[Tuple[EventType, Dict[str, Any], str]] = []
+    for raw in raw_events:
+        item = loads(raw)
+        events.append((EventType(item["event"]), item.get("payload") or {}, item.get("tenant_id") or ""))
+    return events
@@ -66,7 +66,17 @@ def ensure_index_template(client: Optional[OpenSearch] = None) -> None:
                     "tenant_id": {"type": "keyword"},
                     "text": {"type": "text"},
                     "metadata": {"type": "object", "enabled": True},
-                    "embedding": {"type": "knn_vector", "dimension": EMBEDDING_DIMENSION},
+                    "embedding": {
+                        "type": "knn_vector",
+                        "dimension": EMBEDDING_DIMENSION,
+                        # Faiss scalar quantization stores vectors as fp16, halving k-NN memory.
+                        "method": {
+                            "name": "hnsw",
+                            "engine": "faiss",
+                            "space_type": "l2",
+                            "parameters": {"encoder": {"name": "sq", "parameters": {"type": "fp16"}}},
+                        },
+                    },
                     "object": {"type": "keyword"},
                     "ingested_at": {"type": "date", "format": "date_optional_time"},
                 }
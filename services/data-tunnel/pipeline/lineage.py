@@ -5,7 +5,7 @@ import uuid
 from sqlalchemy import select
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 
-from pipeline.db import get_session, ingestions, lineage_edges, lineage_nodes
+from pipeline.db import STAGE_COMPLETED_WHERE, get_session, ingestions, lineage_edges, lineage_nodes
 from pipeline.models import IngestionStatus
 
 
@@ -124,6 +124,25 @@ def transition_failed(ingest_id: str, tenant_id: str, stage: str, reason: str) -
     )
 
 
-def mark_stage_complete(ingest_id: str, tenant_id: str, stage: str, payload_ref: Optional[str] = None) -> None:
-    if not stage_completed(ingest_id, stage):
-        record_node(ingest_id, tenant_id, f"stage:{stage}:completed", payload_ref=payload_ref)
+def atomic_complete(ingest_id: str, tenant_id: str, stage: str, payload_ref: Optional[str] = None) -> bool:
+    """Mark ``stage`` complete; True only for the call that inserted the marker, False if it already existed."""
+    node_type = f"stage:{stage}:completed"
+    stmt = (
+        pg_insert(lineage_nodes)
+        .values(
+            node_id=str(uuid.uuid4()),
+            ingest_id=ingest_id,
+            tenant_id=tenant_id,
+            node_type=node_type,
+            payload_ref=payload_ref,
+            created_at=datetime.utcnow(),
+        )
+        # Backed by the unique stage-completion index, so concurrent deliveries cannot both insert.
+        .on_conflict_do_nothing(
+            index_elements=[lineage_nodes.c.ingest_id, lineage_nodes.c.node_type],
+            index_where=STAGE_COMPLETED_WHERE,
+        )
+        .returning(lineage_nodes.c.node_id)
+    )
+    with get_session() as session:
+        return session.execute(stmt).first() is not None
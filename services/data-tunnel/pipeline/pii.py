@@ -1,7 +1,8 @@
 import hashlib
 import logging
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Callable, Dict, List, Tuple, Optional
 
 try:
     import yaml
@@ -40,49 +41,68 @@ def _mask_segment(text: str, start: int, end: int, action: str, mask: str) -> st
     return segment
 
 
-def apply_pii(
-    text: str,
-    config_path: Path,
-    *,
-    default_action: Optional[str] = None,
-    mask: str = "[REDACTED]",
-) -> Tuple[str, Dict[str, int]]:
-    policies = _load_policies(config_path)
-    report: Dict[str, int] = {}
-
+@lru_cache(maxsize=1)
+def _get_analyzer():
     if not AnalyzerEngine:
-        return text, report
-
+        return None
     try:
         import spacy
 
         if not spacy.util.is_package("en_core_web_lg"):
             logger.warning("Skipping PII detection: spaCy model 'en_core_web_lg' not available")
-            return text, report
+            return None
     except Exception:  # pragma: no cover - spaCy optional
         logger.warning("Skipping PII detection: spaCy unavailable")
-        return text, report
+        return None
+    return AnalyzerEngine()
 
-    analyzer = AnalyzerEngine()
-    results = analyzer.analyze(text=text, language="en")
-    if not results:
-        return text, report
 
+@lru_cache(maxsize=32)
+def compile_pii(
+    config_path: Path,
+    default_action: Optional[str] = None,
+    mask: str = "[REDACTED]",
+) -> Callable[[str], Tuple[str, Dict[str, int]]]:
+    """Resolve policies and the analyzer once per (config, action, mask) and return a text matcher."""
+    policies = _load_policies(config_path)
+    analyzer = _get_analyzer()
     override_action = (default_action or "").strip().upper() or None
-    total = 0
-    # Apply transformations from end to start to keep offsets stable.
-    mutable = list(text)
-    for item in sorted(results, key=lambda r: r.start, reverse=True):
-        entity = item.entity_type
-        action = policies.get(entity, policies.get("DEFAULT", "ALLOW")).upper()
-        if override_action:
-            action = override_action
-        report[entity] = report.get(entity, 0) + 1
-        total += 1
-        replacement = _mask_segment(text, item.start, item.end, action, mask)
-        mutable[item.start:item.end] = list(replacement)
-
-    report["_total"] = total
-    report["_action"] = override_action or policies.get("DEFAULT", "ALLOW")
-
-    return "".join(mutable), report
+    default_policy = policies.get("DEFAULT", "ALLOW")
+    entity_actions = {entity: str(action).upper() for entity, action in policies.items()}
+
+    def _apply(text: str) -> Tuple[str, Dict[str, int]]:
+        report: Dict[str, int] = {}
+        if analyzer is None:
+            return text, report
+
+        results = analyzer.analyze(text=text, language="en")
+        if not results:
+            return text, report
+
+        total = 0
+        # Apply transformations from end to start to keep offsets stable.
+        mutable = list(text)
+        for item in sorted(results, key=lambda r: r.start, reverse=True):
+            entity = item.entity_type
+            action = override_action or entity_actions.get(entity, str(default_policy).upper())
+            report[entity] = report.get(entity, 0) + 1
+            total += 1
+            replacement = _mask_segment(text, item.start, item.end, action, mask)
+            mutable[item.start:item.end] = list(replacement)
+
+        report["_total"] = total
+        report["_action"] = override_action or default_policy
+
+        return "".join(mutable), report
+
+    return _apply
+
+
+def apply_pii(
+    text: str,
+    config_path: Path,
+    *,
+    default_action: Optional[str] = None,
+    mask: str = "[REDACTED]",
+) -> Tuple[str, Dict[str, int]]:
+    return compile_pii(config_path, default_action, mask)(text)
@@ -1,4 +1,5 @@
 import json
+import tempfile
 from pathlib import Path, PurePosixPath
 from typing import Any, Dict, Tuple
 
@@ -8,6 +9,7 @@ from botocore.exceptions import ClientError
 from settings import get_settings
 
 _settings = get_settings()
+_SPOOL_MAX_BYTES = 8 << 20
 _s3_client = boto3.client(
     "s3",
     endpoint_url=_settings.s3_endpoint,
@@ -76,14 +78,35 @@ def put_manifest(
     return uri, key
 
 
-def get_object(path: str) -> bytes:
+def _split_s3_path(path: str) -> Tuple[str, str]:
     if not path.startswith("s3://"):
         raise ValueError("Only s3:// paths are supported")
     bucket, key = path.replace("s3://", "", 1).split("/", 1)
+    return bucket, key
+
+
+def get_object(path: str) -> bytes:
+    bucket, key = _split_s3_path(path)
     response = _s3_client.get_object(Bucket=bucket, Key=key)
     return response["Body"].read()
 
 
+def open_object(path: str) -> tempfile.SpooledTemporaryFile:
+    """Stream an object into a spooled file: small objects stay in memory, large ones go to disk.
+
+    The caller owns the returned handle and must close it.
+    """
+    bucket, key = _split_s3_path(path)
+    spool = tempfile.SpooledTemporaryFile(max_size=_SPOOL_MAX_BYTES)
+    try:
+        _s3_client.download_fileobj(bucket, key, spool)
+    except Exception:
+        spool.close()
+        raise
+    spool.seek(0)
+    return spool
+
+
 def ensure_bucket() -> None:
     try:
         _s3_client.head_bucket(Bucket=_settings.s3_bucket)
@@ -43,6 +43,7 @@ class Settings(BaseModel):
     dq_config: Path = Path(os.getenv("DQ_CONFIG", "config/dq_checks.yml"))
     pii_config: Path = Path(os.getenv("PII_CONFIG", "config/pii_policies.yml"))
     embed_config: Path = Path(os.getenv("EMBED_CONFIG", "config/embeddings.yml"))
+    embed_cache_ttl: int = int(os.getenv("EMBED_CACHE_TTL", "604800"))
     enable_ocr: bool = Field(default_factory=lambda: _as_bool(os.getenv("ENABLE_OCR"), True))
     ocr_langs: str = os.getenv("OCR_LANGS", "eng")
     parsers: List[str] = Field(default_factory=lambda: os.getenv("PARSERS", "").split(","))
@@ -0,0 +1,68 @@
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pytest
+
+SERVICE_ROOT = Path(__file__).resolve().parents[1]
+if str(SERVICE_ROOT) not in sys.path:
+    sys.path.insert(0, str(SERVICE_ROOT))
+
+from pipeline import embed
+
+
+class _Redis:
+    """In-memory stand-in for the mget/set calls the embedding cache makes."""
+
+    def __init__(self) -> None:
+        self.values: Dict[str, bytes] = {}
+
+    def mget(self, keys: List[str]) -> List[Optional[bytes]]:
+        return [self.values.get(key) for key in keys]
+
+    def pipeline(self, transaction: bool = True) -> "_Redis":
+        return self
+
+    def set(self, key: str, value: bytes, ex: Optional[int] = None) -> None:
+        self.values[key] = value
+
+    def execute(self) -> None:
+        return None
+
+
+@pytest.fixture
+def backend(monkeypatch: pytest.MonkeyPatch) -> List[List[str]]:
+    calls: List[List[str]] = []
+
+    def fake_generate(texts: List[str]) -> List[List[float]]:
+        calls.append(list(texts))
+        return [[0.1 * (len(text) + 1), 1.0 / 3.0, -2.718281828] for text in texts]
+
+    monkeypatch.setattr(embed, "generate_embeddings", fake_generate)
+    monkeypatch.setattr(embed, "_cache_client", _Redis())
+    monkeypatch.setattr(embed, "_load_config", lambda _path: {"provider": "local", "dims": 3})
+    return calls
+
+
+def test_cached_and_fresh_vectors_are_identical(backend: List[List[str]]) -> None:
+    fresh = embed.generate_embeddings_cached(["alpha", "beta"])
+    cached = embed.generate_embeddings_cached(["beta", "alpha", "gamma"])
+
+    assert backend == [["alpha", "beta"], ["gamma"]]
+    assert cached[:2] == [fresh[1], fresh[0]]
+    assert fresh[0][1] != pytest.approx(1.0 / 3.0, abs=1e-9)
+
+
+def test_vectors_match_without_a_cache(backend: List[List[str]], monkeypatch: pytest.MonkeyPatch) -> None:
+    cached = embed.generate_embeddings_cached(["alpha"])
+    monkeypatch.setattr(embed, "_cache_client", None)
+    monkeypatch.setattr(embed, "redis", None)
+
+    assert embed.generate_embeddings_cached(["alpha"]) == cached
+
+
+def test_short_backend_response_is_an_error(monkeypatch: pytest.MonkeyPatch, backend: List[List[str]]) -> None:
+    monkeypatch.setattr(embed, "generate_embeddings", lambda texts: [[0.0, 0.0, 0.0]])
+
+    with pytest.raises(RuntimeError, match="1 vectors for 2 texts"):
+        embed.generate_embeddings_cached(["alpha", "beta"])
@@ -0,0 +1,113 @@
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import pytest
+
+SERVICE_ROOT = Path(__file__).resolve().parents[1]
+if str(SERVICE_ROOT) not in sys.path:
+    sys.path.insert(0, str(SERVICE_ROOT))
+
+from pipeline import events
+from pipeline.models import EventType
+from workers import tasks
+
+
+class _Redis:
+    """In-memory stand-in for the list commands the event buffer pipelines."""
+
+    def __init__(self) -> None:
+        self.lists: Dict[str, List[bytes]] = {}
+
+    def pipeline(self, transaction: bool = True) -> "_Pipeline":
+        return _Pipeline(self)
+
+
+class _Pipeline:
+    def __init__(self, redis: _Redis) -> None:
+        self.redis = redis
+        self.results: List[Any] = []
+
+    def rpush(self, key: str, value: bytes) -> None:
+        self.redis.lists.setdefault(key, []).append(value)
+        self.results.append(len(self.redis.lists[key]))
+
+    def expire(self, key: str, seconds: int) -> None:
+        self.results.append(True)
+
+    def lrange(self, key: str, start: int, end: int) -> None:
+        self.results.append(list(self.redis.lists.get(key, [])))
+
+    def delete(self, key: str) -> None:
+        self.results.append(1 if self.redis.lists.pop(key, None) is not None else 0)
+
+    def execute(self) -> List[Any]:
+        return self.results
+
+
+@pytest.fixture
+def published(monkeypatch: pytest.MonkeyPatch) -> List[Tuple[List[Tuple[EventType, Dict[str, Any]]], str, str]]:
+    batches: List[Tuple[List[Tuple[EventType, Dict[str, Any]]], str, str]] = []
+    monkeypatch.setattr(events, "_buffer_client", _Redis())
+    monkeypatch.setattr(
+        tasks, "_run_publish", lambda batch, ingest_id, tenant_id: batches.append((batch, ingest_id, tenant_id))
+    )
+    return batches
+
+
+def test_buffered_events_round_trip_with_their_tenant(published: List[Any]) -> None:
+    assert events.buffer_event(EventType.INGESTION_STARTED, {"stage": "parse_normalize"}, "ingest-1", "tenant-1")
+
+    assert events.drain_events("ingest-1") == [(EventType.INGESTION_STARTED, {"stage": "parse_normalize"}, "tenant-1")]
+    assert events.drain_events("ingest-1") == []
+
+
+def test_terminal_event_flushes_the_buffer_in_one_batch(published: List[Any]) -> None:
+    tasks._publish(EventType.INGESTION_STARTED, "ingest-1", "tenant-1", {"stage": "parse_normalize"})
+    assert published == []
+
+    tasks._publish(EventType.INGESTION_COMPLETED, "ingest-1", "tenant-1", {"stage": "index_publish"})
+
+    assert published == [
+        (
+            [
+                (EventType.INGESTION_STARTED, {"stage": "parse_normalize"}),
+                (EventType.INGESTION_COMPLETED, {"stage": "index_publish"}),
+            ],
+            "ingest-1",
+            "tenant-1",
+        )
+    ]
+
+
+def test_unhandled_task_failure_publishes_buffered_events(published: List[Any]) -> None:
+    tasks._publish(EventType.INGESTION_STARTED, "ingest-1", "tenant-1", {"stage": "parse_normalize"})
+
+    tasks.enrich_stage.on_failure(RuntimeError("enrichment crashed"), "task-1", ("ingest-1", {}), {}, None)
+
+    assert published == [
+        (
+            [
+                (EventType.INGESTION_STARTED, {"stage": "parse_normalize"}),
+                (EventType.INGESTION_FAILED, {"stage": "enrich_stage", "error": "enrichment crashed"}),
+            ],
+            "ingest-1",
+            "tenant-1",
+        )
+    ]
+    assert events.drain_events("ingest-1") == []
+
+
+def test_missing_manifest_publishes_buffered_events(published: List[Any], monkeypatch: pytest.MonkeyPatch) -> None:
+    tasks._publish(EventType.INGESTION_STARTED, "ingest-1", "tenant-1", {"stage": "parse_normalize"})
+    monkeypatch.setattr(tasks, "_get_manifest", lambda _ingest_id: None)
+
+    tasks.chunk_embed("ingest-1", {})
+
+    assert published[0][0][-1] == (EventType.INGESTION_FAILED, {"stage": "chunk_embed", "error": "Manifest missing"})
+
+
+def test_failure_without_buffered_events_publishes_nothing(published: List[Any]) -> None:
+    tasks.enrich_stage.on_failure(RuntimeError("boom"), "task-1", ("ingest-2", {}), {}, None)
+
+    assert published == []
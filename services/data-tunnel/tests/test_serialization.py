@@ -0,0 +1,36 @@
+import sys
+from pathlib import Path
+
+from kombu.serialization import dumps as kombu_dumps, loads as kombu_loads
+
+SERVICE_ROOT = Path(__file__).resolve().parents[1]
+if str(SERVICE_ROOT) not in sys.path:
+    sys.path.insert(0, str(SERVICE_ROOT))
+
+from celery_app import celery
+from pipeline import serialization
+
+PAYLOAD = {"ingest_id": "ingest-1", "options": {"ocr": True, "languages": ["en", "fr"]}, "size": 1024, "note": "é"}
+
+
+def test_dumps_round_trips_through_loads() -> None:
+    encoded = serialization.dumps_bytes(PAYLOAD)
+
+    assert isinstance(encoded, bytes)
+    assert serialization.loads(encoded) == PAYLOAD
+    assert serialization.loads(serialization.dumps(PAYLOAD)) == PAYLOAD
+
+
+def test_non_string_keys_are_encoded() -> None:
+    assert serialization.loads(serialization.dumps_bytes({1: "page"})) == {"1": "page"}
+
+
+def test_celery_uses_the_registered_orjson_serializer() -> None:
+    assert celery.conf.task_serializer == "orjson"
+    assert celery.conf.result_serializer == "orjson"
+    assert set(celery.conf.accept_content) == {"json", "orjson"}
+
+    content_type, encoding, body = kombu_dumps(((PAYLOAD["ingest_id"], PAYLOAD), {}, {}), serializer="orjson")
+
+    assert content_type == "application/x-orjson"
+    assert kombu_loads(body, content_type, encoding) == [[PAYLOAD["ingest_id"], PAYLOAD], {}, {}]
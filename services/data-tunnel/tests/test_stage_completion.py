@@ -0,0 +1,86 @@
+import sys
+from pathlib import Path
+from typing import Any, List
+
+import pytest
+
+SERVICE_ROOT = Path(__file__).resolve().parents[1]
+if str(SERVICE_ROOT) not in sys.path:
+    sys.path.insert(0, str(SERVICE_ROOT))
+
+from pipeline import db, lineage
+from pipeline.models import Manifest
+from workers import tasks
+
+
+class _Session:
+    """Stands in for a SQLAlchemy session; records statements and returns a fixed row."""
+
+    def __init__(self, row: Any) -> None:
+        self.row = row
+        self.statements: List[Any] = []
+
+    def execute(self, statement: Any, *_args: Any) -> "_Session":
+        self.statements.append(statement)
+        return self
+
+    def first(self) -> Any:
+        return self.row
+
+    def __enter__(self) -> "_Session":
+        return self
+
+    def __exit__(self, *_exc: Any) -> None:
+        return None
+
+
+@pytest.mark.parametrize(("row", "expected"), [(("node-1",), True), (None, False)])
+def test_atomic_complete_reports_whether_it_inserted_the_marker(
+    monkeypatch: pytest.MonkeyPatch, row: Any, expected: bool
+) -> None:
+    session = _Session(row)
+    monkeypatch.setattr(lineage, "get_session", lambda: session)
+
+    assert lineage.atomic_complete("ingest-1", "tenant-1", "enrich") is expected
+
+    sql = str(session.statements[0].compile(dialect=db._engine.dialect))
+    # The conflict target must name the partial unique index's columns and predicate for Postgres to use it.
+    assert "ON CONFLICT (ingest_id, node_type) WHERE node_type LIKE 'stage:%%:completed' DO NOTHING" in sql
+    assert "RETURNING lineage_nodes.node_id" in sql
+
+
+@pytest.fixture
+def enrich_stage(monkeypatch: pytest.MonkeyPatch) -> List[str]:
+    dispatched: List[str] = []
+
+    class _Signature:
+        def __init__(self, name: str, args: Any = ()) -> None:
+            self.name = name
+
+        def delay(self) -> None:
+            dispatched.append(self.name)
+
+    manifest = Manifest(
+        ingest_id="ingest-1", tenant_id="tenant-1", source="upload", path="", checksum="", size=0, mime="text/plain"
+    )
+    monkeypatch.setattr(tasks, "_get_manifest", lambda _ingest_id: manifest)
+    monkeypatch.setattr(tasks, "transition_processing", lambda *_args: None)
+    monkeypatch.setattr(tasks.enrich_module, "enrich_text", lambda _text: {})
+    monkeypatch.setattr(tasks.celery, "signature", _Signature)
+    return dispatched
+
+
+def test_completed_stage_dispatches_the_next_one(monkeypatch: pytest.MonkeyPatch, enrich_stage: List[str]) -> None:
+    monkeypatch.setattr(tasks, "atomic_complete", lambda *_args: True)
+
+    tasks.enrich_stage("ingest-1", {"text": "hello"})
+
+    assert enrich_stage == ["workers.tasks.chunk_embed"]
+
+
+def test_redelivered_stage_does_not_dispatch_again(monkeypatch: pytest.MonkeyPatch, enrich_stage: List[str]) -> None:
+    monkeypatch.setattr(tasks, "atomic_complete", lambda *_args: False)
+
+    tasks.enrich_stage("ingest-1", {"text": "hello"})
+
+    assert enrich_stage == []
@@ -1,10 +1,11 @@
 import asyncio
 import hashlib
-import json
 import logging
-from typing import Any, Dict, List, Optional
+from collections import ChainMap
+from typing import Any, Dict, List, Optional, Tuple
 
-from sqlalchemy import select, update
+from sqlalchemy import bindparam, func, select, text as sql_text, update
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from celery_app import celery
@@ -13,11 +14,11 @@ from pipeline.chunk import load_strategy, semantic_chunks
 from pipeline.db import chunks as chunks_table
 from pipeline.db import get_session, manifests
 from pipeline.dq import run_checks
-from pipeline.embed import generate_embeddings
-from pipeline.events import publish
+from pipeline.embed import generate_embeddings_cached
+from pipeline.events import TERMINAL_EVENTS, buffer_event, drain_events, publish_batch
 from pipeline.index import index_bm25, upsert_vectors
 from pipeline.lineage import (
-    mark_stage_complete,
+    atomic_complete,
     stage_completed,
     transition_completed,
     transition_failed,
@@ -25,18 +26,28 @@ from pipeline.lineage import (
 )
 from pipeline.models import EventType, Manifest
 from pipeline.pii import apply_pii
+from pipeline.serialization import dumps
 from data_tunnel.ingest import ingest_manifest
-from pipeline.storage import get_object, put_redacted_text
+from pipeline.storage import open_object, put_redacted_text
 from settings import get_settings
 
 logger = logging.getLogger(__name__)
 _settings = get_settings()
 
+# Keys rewritten per document in chunk_embed rather than inherited from upstream metadata.
+_CHUNK_METADATA_OVERRIDES = frozenset(
+    {"path", "raw_path", "object", "object_suffix", "original_basename", "filename", "document_id"}
+)
+
+
+# Built once at import so SQLAlchemy's compiled cache is hit on every call.
+_MANIFEST_SELECT = select(manifests).where(manifests.c.ingest_id == bindparam("ingest_id"))
+_CHUNK_INSERT = pg_insert(chunks_table).on_conflict_do_nothing(index_elements=[chunks_table.c.chunk_id])
+
 
 def _get_manifest(ingest_id: str) -> Optional[Manifest]:
-    stmt = select(manifests).where(manifests.c.ingest_id == ingest_id)
     with get_session() as session:
-        row = session.execute(stmt).mappings().first()
+        row = session.execute(_MANIFEST_SELECT, {"ingest_id": ingest_id}).mappings().first()
     if not row:
         return None
     manifest_data = dict(row)
@@ -48,44 +59,79 @@ def _get_manifest(ingest_id: str) -> Optional[Manifest]:
 
 
 def _record_chunks(tenant_id: str, doc_id: str, chunk_payloads: List[Dict[str, Any]]):
+    rows = [
+        {
+            "chunk_id": payload["chunk_id"],
+            "doc_id": doc_id,
+            "tenant_id": tenant_id,
+            "text": payload["text"],
+            "lang": payload.get("lang"),
+            "tokens": len(payload["text"].split()),
+            "section_path": payload.get("section_path"),
+            "page_start": payload.get("page_start"),
+            "page_end": payload.get("page_end"),
+            "is_table": int(payload.get("is_table", False)),
+            "table_ref": payload.get("table_ref"),
+        }
+        for payload in chunk_payloads
+    ]
     with get_session() as session:
-        for payload in chunk_payloads:
-            stmt = (
-                pg_insert(chunks_table)
-                .values(
-                    chunk_id=payload["chunk_id"],
-                    doc_id=doc_id,
-                    tenant_id=tenant_id,
-                    text=payload["text"],
-                    lang=payload.get("lang"),
-                    tokens=len(payload["text"].split()),
-                    section_path=payload.get("section_path"),
-                    page_start=payload.get("page_start"),
-                    page_end=payload.get("page_end"),
-                    is_table=int(payload.get("is_table", False)),
-                    table_ref=payload.get("table_ref"),
-                )
-                .on_conflict_do_nothing(index_elements=[chunks_table.c.chunk_id])
-            )
-            session.execute(stmt)
+        session.execute(_CHUNK_INSERT, rows)
 
 
-def _publish(event: EventType, ingest_id: str, tenant_id: str, payload: dict):
+def _complete_stage(ingest_id: str, tenant_id: str, stage: str) -> bool:
+    """Mark the stage complete; False when a redelivered copy of the task already did and dispatched what follows."""
+    if atomic_complete(ingest_id, tenant_id, stage):
+        return True
+    logger.info("Stage %s already completed for ingest_id=%s; not dispatching it again", stage, ingest_id)
+    return False
+
+
+def _run_publish(events: List[Tuple[EventType, Dict[str, Any]]], ingest_id: str, tenant_id: str) -> None:
     try:
-        asyncio.run(publish(event, payload, ingest_id, tenant_id))
+        asyncio.run(publish_batch(events, ingest_id, tenant_id))
     except RuntimeError:
         loop = asyncio.get_event_loop()
         if loop.is_running():
-            loop.create_task(publish(event, payload, ingest_id, tenant_id))
+            loop.create_task(publish_batch(events, ingest_id, tenant_id))
         else:
-            loop.run_until_complete(publish(event, payload, ingest_id, tenant_id))
+            loop.run_until_complete(publish_batch(events, ingest_id, tenant_id))
 
 
-@celery.task(name="workers.tasks.parse_normalize")
+def _publish(event: EventType, ingest_id: str, tenant_id: str, payload: dict):
+    # Intermediate events wait in the per-ingest buffer; terminal events flush it in one batch.
+    if event not in TERMINAL_EVENTS and buffer_event(event, payload, ingest_id, tenant_id):
+        return
+    events = [(buffered, data) for buffered, data, _ in drain_events(ingest_id)] if event in TERMINAL_EVENTS else []
+    events.append((event, payload))
+    _run_publish(events, ingest_id, tenant_id)
+
+
+def _flush_events(ingest_id: str, stage: str, error: str) -> None:
+    """Publish events buffered for an ingest that stopped without a terminal event, followed by its failure."""
+    buffered = drain_events(ingest_id)
+    if not buffered:
+        return
+    tenant_id = buffered[0][2]
+    events = [(event, payload) for event, payload, _ in buffered]
+    events.append((EventType.INGESTION_FAILED, {"stage": stage, "error": error}))
+    _run_publish(events, ingest_id, tenant_id)
+
+
+class _PipelineTask(celery.Task):
+    def on_failure(self, exc, task_id, args, kwargs, einfo):
+        # An unhandled exception ends the pipeline; do not leave its buffered events waiting out the TTL.
+        ingest_id = args[0] if args else kwargs.get("ingest_id")
+        if ingest_id:
+            _flush_events(ingest_id, self.name.rsplit(".", 1)[-1], str(exc))
+
+
+@celery.task(name="workers.tasks.parse_normalize", base=_PipelineTask)
 def parse_normalize(ingest_id: str) -> Dict[str, Any]:
     manifest = _get_manifest(ingest_id)
     if not manifest:
         logger.error("Manifest missing for ingest_id=%s", ingest_id)
+        _flush_events(ingest_id, "parse_normalize", "Manifest missing")
         return {"ingest_id": ingest_id}
 
     tenant_id = manifest.tenant_id
@@ -96,25 +142,30 @@ def parse_normalize(ingest_id: str) -> Dict[str, Any]:
     content = b""
     if manifest.path:
         try:
-            content = get_object(manifest.path)
+            content = open_object(manifest.path)
         except Exception as exc:
             logger.warning("Landing object fetch failed: %s", exc)
-    canonical = ingest_manifest(manifest, content)
+    try:
+        canonical = ingest_manifest(manifest, content)
+    finally:
+        if not isinstance(content, bytes):
+            content.close()
     options_payload = canonical.get("options") if isinstance(canonical.get("options"), dict) else {}
     try:
-        logger.info("[%s] Effective options: %s", ingest_id, json.dumps(options_payload))
+        logger.info("[%s] Effective options: %s", ingest_id, dumps(options_payload))
     except TypeError:
         logger.info("[%s] Effective options: %r", ingest_id, options_payload)
 
-    mark_stage_complete(ingest_id, tenant_id, stage)
-    celery.signature("workers.tasks.pii_dq", args=(ingest_id, canonical)).delay()
+    if _complete_stage(ingest_id, tenant_id, stage):
+        celery.signature("workers.tasks.pii_dq", args=(ingest_id, canonical)).delay()
     return canonical
 
 
-@celery.task(name="workers.tasks.pii_dq")
+@celery.task(name="workers.tasks.pii_dq", base=_PipelineTask)
 def pii_dq(ingest_id: str, canonical: Dict[str, Any] | None = None) -> Dict[str, Any]:
     manifest = _get_manifest(ingest_id)
     if not manifest:
+        _flush_events(ingest_id, "pii_dq", "Manifest missing")
         return {"ingest_id": ingest_id}
     tenant_id = manifest.tenant_id
     stage = "pii_dq"
@@ -210,13 +261,11 @@ def pii_dq(ingest_id: str, canonical: Dict[str, Any] | None = None) -> Dict[str,
     canonical.update({"pii_report": pii_report, "dq_report": dq_report, "metadata": metadata})
 
     try:
+        # Merge server-side (jsonb ||) so the stored metadata is never read back.
+        merged_meta = func.coalesce(manifests.c.metadata, sql_text("'{}'::jsonb")).op("||")(
+            bindparam("delta", metadata, type_=JSONB)
+        )
         with get_session() as session:
-            existing_meta = session.execute(
-                select(manifests.c.metadata).where(manifests.c.ingest_id == ingest_id)
-            ).scalar_one_or_none()
-            base_meta = existing_meta if isinstance(existing_meta, dict) else {}
-            merged_meta = base_meta.copy()
-            merged_meta.update(metadata)
             session.execute(
                 update(manifests)
                 .where(manifests.c.ingest_id == ingest_id)
@@ -224,15 +273,16 @@ def pii_dq(ingest_id: str, canonical: Dict[str, Any] | None = None) -> Dict[str,
             )
     except Exception as exc:  # pragma: no cover
         logger.warning("Failed updating manifest metadata for %s: %s", ingest_id, exc)
-    mark_stage_complete(ingest_id, tenant_id, stage)
-    celery.signature("workers.tasks.enrich_stage", args=(ingest_id, canonical)).delay()
+    if _complete_stage(ingest_id, tenant_id, stage):
+        celery.signature("workers.tasks.enrich_stage", args=(ingest_id, canonical)).delay()
     return canonical
 
 
-@celery.task(name="workers.tasks.enrich_stage")
+@celery.task(name="workers.tasks.enrich_stage", base=_PipelineTask)
 def enrich_stage(ingest_id: str, canonical: Dict[str, Any]) -> Dict[str, Any]:
     manifest = _get_manifest(ingest_id)
     if not manifest:
+        _flush_events(ingest_id, "enrich", "Manifest missing")
         return canonical
     tenant_id = manifest.tenant_id
     stage = "enrich"
@@ -240,15 +290,16 @@ def enrich_stage(ingest_id: str, canonical: Dict[str, Any]) -> Dict[str, Any]:
 
     enrichment = enrich_module.enrich_text(canonical.get("text", ""))
     canonical.update(enrichment)
-    mark_stage_complete(ingest_id, tenant_id, stage)
-    celery.signature("workers.tasks.chunk_embed", args=(ingest_id, canonical)).delay()
+    if _complete_stage(ingest_id, tenant_id, stage):
+        celery.signature("workers.tasks.chunk_embed", args=(ingest_id, canonical)).delay()
     return canonical
 
 
-@celery.task(name="workers.tasks.chunk_embed")
+@celery.task(name="workers.tasks.chunk_embed", base=_PipelineTask)
 def chunk_embed(ingest_id: str, canonical: Dict[str, Any]) -> Dict[str, Any]:
     manifest = _get_manifest(ingest_id)
     if not manifest:
+        _flush_events(ingest_id, "chunk_embed", "Manifest missing")
         return canonical
     tenant_id = manifest.tenant_id
     stage = "chunk_embed"
@@ -262,44 +313,40 @@ def chunk_embed(ingest_id: str, canonical: Dict[str, Any]) -> Dict[str, Any]:
     chunk_payloads: List[Dict[str, Any]] = []
     manifest_metadata = manifest.metadata or {}
     canonical_metadata = canonical.get("metadata", {}) or {}
-    chunk_metadata_source = dict(manifest_metadata)
-    chunk_metadata_source.update(canonical_metadata)
     common_meta = {
         "owner": canonical.get("owner"),
         "doc_type": canonical.get("doc_type"),
         "ingested_at": canonical.get("ingested_at"),
     }
     pages = canonical.get("pages")
+    object_suffix = (
+        manifest.original_basename
+        or manifest.object_suffix
+        or canonical_metadata.get("object_suffix")
+        or manifest_metadata.get("object_suffix")
+        or "document.txt"
+    )
+    s3_uri = f"s3://{_settings.s3_bucket}/{tenant_id}/landing/{ingest_id}/raw/{object_suffix}"
+    chunk_object = manifest.object_key
+    # Document-level metadata is identical for every chunk; build it once and copy per chunk.
+    merged_metadata = ChainMap(canonical_metadata, manifest_metadata)
+    base_metadata = {key: value for key, value in merged_metadata.items() if key not in _CHUNK_METADATA_OVERRIDES}
+    base_metadata.update(
+        {
+            "path": s3_uri,
+            "raw_path": s3_uri,
+            "object": chunk_object,
+            "object_suffix": object_suffix,
+            "original_basename": manifest.original_basename or object_suffix,
+            "filename": manifest.original_basename or object_suffix,
+        }
+    )
+    base_metadata.setdefault("doc_type", manifest.doc_type)
+    base_metadata["document_id"] = canonical.get("doc_id", ingest_id)
+    has_pages = isinstance(pages, list)
     for idx, text in enumerate(chunk_texts):
-        chunk_metadata = dict(chunk_metadata_source)
-        for key in (
-            "path",
-            "raw_path",
-            "object",
-            "object_suffix",
-            "original_basename",
-            "filename",
-            "document_id",
-        ):
-            chunk_metadata.pop(key, None)
-        object_suffix = (
-            manifest.original_basename
-            or manifest.object_suffix
-            or canonical_metadata.get("object_suffix")
-            or manifest_metadata.get("object_suffix")
-            or "document.txt"
-        )
-        s3_uri = f"s3://{_settings.s3_bucket}/{tenant_id}/landing/{ingest_id}/raw/{object_suffix}"
-        chunk_metadata["path"] = s3_uri
-        chunk_metadata["raw_path"] = s3_uri
-        chunk_metadata["object"] = manifest.object_key
-        chunk_metadata["object_suffix"] = object_suffix
-        chunk_metadata["original_basename"] = manifest.original_basename or object_suffix
-        chunk_metadata.setdefault("filename", manifest.original_basename or object_suffix)
-        chunk_metadata.setdefault("doc_type", manifest.doc_type)
-        chunk_metadata.setdefault("document_id", canonical.get("doc_id", ingest_id))
-        chunk_object = manifest.object_key
-        if isinstance(pages, list) and idx < len(pages):
+        chunk_metadata = dict(base_metadata)
+        if has_pages and idx < len(pages):
             chunk_metadata.setdefault("page", idx)
         chunk_hash = hashlib.sha1(
             f"{canonical.get('doc_id', ingest_id)}::{idx}::{text}".encode("utf-8", errors="ignore")
@@ -326,15 +373,16 @@ def chunk_embed(ingest_id: str, canonical: Dict[str, Any]) -> Dict[str, Any]:
         _record_chunks(tenant_id, canonical.get("doc_id", ingest_id), chunk_payloads)
 
     canonical.update({"chunks": chunk_payloads, "embeddings": []})
-    mark_stage_complete(ingest_id, tenant_id, stage)
-    celery.signature("workers.tasks.index_publish", args=(ingest_id, canonical)).delay()
+    if _complete_stage(ingest_id, tenant_id, stage):
+        celery.signature("workers.tasks.index_publish", args=(ingest_id, canonical)).delay()
     return canonical
 
 
-@celery.task(name="workers.tasks.index_publish")
+@celery.task(name="workers.tasks.index_publish", base=_PipelineTask)
 def index_publish(ingest_id: str, canonical: Dict[str, Any]) -> Dict[str, Any]:
     manifest = _get_manifest(ingest_id)
     if not manifest:
+        _flush_events(ingest_id, "index_publish", "Manifest missing")
         return canonical
     tenant_id = manifest.tenant_id
     stage = "index_publish"
@@ -348,8 +396,9 @@ def index_publish(ingest_id: str, canonical: Dict[str, Any]) -> Dict[str, Any]:
             ingest_id,
             len(chunks),
         )
-        embeddings = generate_embeddings([chunk.get("text", "") for chunk in chunks])
-        canonical["embeddings"] = embeddings
+        embeddings = generate_embeddings_cached([chunk.get("text", "") for chunk in chunks])
+        # Vectors are persisted below; keep them out of the task result to spare the backend.
+        canonical["embedding_count"] = len(embeddings)
     try:
         upsert_vectors(chunks, embeddings, tenant_id)
         index_bm25(chunks, embeddings, tenant_id)
@@ -360,9 +409,9 @@ def index_publish(ingest_id: str, canonical: Dict[str, Any]) -> Dict[str, Any]:
             _publish(EventType.INGESTION_FAILED, ingest_id, tenant_id, {"stage": stage, "error": str(exc)})
         return canonical
 
-    mark_stage_complete(ingest_id, tenant_id, stage)
-    transition_completed(ingest_id, tenant_id)
-    _publish(EventType.INGESTION_COMPLETED, ingest_id, tenant_id, {"stage": stage})
+    if _complete_stage(ingest_id, tenant_id, stage):
+        transition_completed(ingest_id, tenant_id)
+        _publish(EventType.INGESTION_COMPLETED, ingest_id, tenant_id, {"stage": stage})
     return canonical
 
 
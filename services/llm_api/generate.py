@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import Any, Dict, Optional
 
 from answer_templates import AnswerFormat, format_instructions
@@ -18,6 +19,7 @@ def resolve_answer_format(value: str | None) -> AnswerFormat:
     return AnswerFormat.from_value(value)
 
 
+@lru_cache(maxsize=32)
 def merge_system_prompt(base_system: Optional[str], answer_format: AnswerFormat) -> str:
     """Combine an optional base system prompt with format-specific instructions."""
 
@@ -2,22 +2,47 @@
 
 from __future__ import annotations
 
+import asyncio
+import contextvars
 import json
 import logging
 import math
+import os
 import re
+import struct
 import time
-from functools import lru_cache
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from concurrent.futures import ProcessPoolExecutor
+from functools import cache, lru_cache
 from hashlib import blake2b
-from typing import Any, Dict, List, Literal, Optional
+from itertools import chain
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, AsyncIterator, Dict, List, Literal, Optional, Sequence
 
 import httpx
+import numpy as np
+import orjson
 import yaml
-from fastapi import FastAPI, HTTPException, status
+from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.concurrency import run_in_threadpool
-from pydantic import BaseModel, Field, ValidationError, model_validator
+from fastapi.responses import Response, StreamingResponse
+from starlette.background import BackgroundTask
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, model_validator
 from prometheus_fastapi_instrumentator import Instrumentator
-from prometheus_client import Counter, Histogram
+from prometheus_client import Counter, Gauge, Histogram
+
+try:
+    import blake3
+except ImportError:  # pragma: no cover - optional accelerated hash backend
+    blake3 = None
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - optional JIT backend
+    njit = None
+
 
 from settings import get_settings
 
@@ -29,9 +54,26 @@ from generate import (
     resolve_answer_format,
 )
 
+_json_loads = orjson.loads
+
 settings = get_settings()
+# Hot-path settings bound once; Settings is not reloaded at runtime.
+_EMBED_DIM = settings.embedding_dimension
+_MAX_BATCH = settings.max_batch_size
+_LLM_PROVIDER = (settings.llm_provider or "ollama").lower()
+
+
+class _ORJSONResponse(Response):
+    media_type = "application/json"
 
-app = FastAPI(title=settings.app_name)
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+
+
+app = FastAPI(
+    title=settings.app_name,
+    default_response_class=_ORJSONResponse,
+)
 Instrumentator().instrument(app).expose(app)
 
 logger = logging.getLogger("uvicorn.error")
@@ -46,33 +88,85 @@ LLM_TIMEOUTS_TOTAL = Counter(
     "Total number of LLM requests that timed out",
     ["provider"],
 )
+LLM_CACHE_RESULTS_TOTAL = Counter(
+    "llm_cache_results_total",
+    "How cacheable LLM calls were served (hit, semantic, miss, coalesced)",
+    ["result"],
+)
+EMBED_CACHE_LOOKUPS = Gauge(
+    "embed_cache_lookups",
+    "Deterministic embedding cache lookups since startup",
+    ["result"],
+)
+
+
+_WORD_RE = re.compile(r"\w+")
 
 
 class FewShotExample(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     user: str = Field(min_length=1)
     assistant: str = Field(min_length=1)
 
 
 class ProfileConfig(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     system: str = Field(min_length=1)
     style: Dict[str, Any] = Field(default_factory=dict)
     output: Dict[str, Any] = Field(default_factory=dict)
     few_shots: List[FewShotExample] = Field(default_factory=list)
 
 
+def _read_profile_cache(cache_path: Path, stat: os.stat_result) -> Optional[Dict[str, Any]]:
+    try:
+        cached = _json_loads(cache_path.read_bytes())
+    except (OSError, ValueError):
+        return None
+    if cached.get("mtime_ns") != stat.st_mtime_ns or cached.get("size") != stat.st_size:
+        return None
+    data = cached.get("data")
+    return data if isinstance(data, dict) else None
+
+
+def _write_profile_cache(cache_path: Path, stat: os.stat_result, data: Dict[str, Any]) -> None:
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        tmp_path.write_text(
+            json.dumps({"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "data": data}),
+            encoding="utf-8",
+        )
+        os.replace(tmp_path, cache_path)
+    except (OSError, TypeError, ValueError) as exc:
+        # Read-only profile dirs or non-JSON YAML values simply skip the sidecar.
+        logger.debug("Skipping profile cache %s: %s", cache_path, exc)
+        tmp_path.unlink(missing_ok=True)
+
+
 @lru_cache(maxsize=32)
 def _load_profile(name: str) -> ProfileConfig:
     path = settings.profiles_dir / f"{name}.yaml"
     try:
-        raw = path.read_text(encoding="utf-8")
+        stat = path.stat()
     except FileNotFoundError as exc:
         raise FileNotFoundError(f"Profile '{name}' not found at {path}") from exc
     except OSError as exc:
         raise RuntimeError(f"Failed to read profile '{name}': {exc}") from exc
-    try:
-        data = yaml.safe_load(raw) or {}
-    except yaml.YAMLError as exc:
-        raise RuntimeError(f"Profile '{name}' contains invalid YAML: {exc}") from exc
+
+    # JSON sidecar keyed on the YAML's mtime+size avoids re-parsing YAML on every worker start.
+    cache_path = path.with_name(f"{path.name}.json")
+    data = _read_profile_cache(cache_path, stat)
+    if data is None:
+        try:
+            raw = path.read_text(encoding="utf-8")
+        except OSError as exc:
+            raise RuntimeError(f"Failed to read profile '{name}': {exc}") from exc
+        try:
+            data = yaml.safe_load(raw) or {}
+        except yaml.YAMLError as exc:
+            raise RuntimeError(f"Profile '{name}' contains invalid YAML: {exc}") from exc
+        _write_profile_cache(cache_path, stat, data)
     return ProfileConfig(**data)
 
 
@@ -97,9 +191,15 @@ def _resolve_profile(name: str) -> ProfileConfig:
 
 
 class EmbedRequest(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     texts: List[str] = Field(default_factory=list)
 
 
+class EmbedBinRequest(EmbedRequest):
+    precision: Literal["float32", "int8"] = "float32"
+
+
 class EmbedResponse(BaseModel):
     embeddings: List[List[float]]
 
@@ -110,45 +210,207 @@ def _validate_texts(texts: List[str]) -> None:
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="'texts' must contain at least one item",
         )
-    if len(texts) > settings.max_batch_size:
+    if len(texts) > _MAX_BATCH:
         raise HTTPException(
             status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-            detail=f"Batch size exceeds limit of {settings.max_batch_size}",
+            detail=f"Batch size exceeds limit of {_MAX_BATCH}",
         )
 
 
-def _tokenize(text: str) -> List[str]:
+@lru_cache(maxsize=settings.embed_cache_size)
+def _tokenize(text: str) -> tuple[str, ...]:
     # Lightweight tokenizer that keeps alphanumerics and lowercases for stability.
-    return [token for token in re.findall(r"\w+", text.lower()) if token]
+    return tuple(_WORD_RE.findall(text.lower()))
+
+
+_EMBED_PERSON = b"rag-embed"
+_EMBED_KEY = _EMBED_PERSON.ljust(32, b"\0")
+_U64_MAX = float(2**64 - 1)
+_MAX_POS = 4096
+_POS_TAGS = tuple(f"{i}:".encode("ascii") for i in range(_MAX_POS))
+
+
+def _position_payloads(tokens: Sequence[str]):
+    for position, token in enumerate(tokens):
+        tag = _POS_TAGS[position] if position < _MAX_POS else f"{position}:".encode("ascii")
+        yield tag + token.encode("utf-8")
+
+
+_BLAKE2B_PROTO = blake2b(digest_size=16, person=_EMBED_PERSON, usedforsecurity=False)
+
+
+def _token_digests_blake2b(tokens: Sequence[str]) -> bytes:
+    digests = []
+    for payload in _position_payloads(tokens):
+        hasher = _BLAKE2B_PROTO.copy()
+        hasher.update(payload)
+        digests.append(hasher.digest())
+    return b"".join(digests)
+
+
+_POS_STRUCT = struct.Struct(">I")
+
+
+def _token_digests_blake2b_v2(tokens: Sequence[str]) -> bytes:
+    # Fixed-width big-endian position prefix instead of the ASCII "<pos>:" tag.
+    pack = _POS_STRUCT.pack
+    digests = []
+    for position, token in enumerate(tokens):
+        hasher = _BLAKE2B_PROTO.copy()
+        hasher.update(pack(position))
+        hasher.update(token.encode("utf-8"))
+        digests.append(hasher.digest())
+    return b"".join(digests)
+
+
+def _token_digests_blake3(tokens: Sequence[str]) -> bytes:
+    return b"".join(
+        blake3.blake3(payload, key=_EMBED_KEY).digest(length=16) for payload in _position_payloads(tokens)
+    )
+
+
+def _select_token_digests(scheme: str):
+    # Schemes produce different vectors; indexes must be rebuilt when switching.
+    if scheme == "blake2b-v1":
+        return _token_digests_blake2b
+    if scheme == "blake2b-v2":
+        return _token_digests_blake2b_v2
+    if scheme == "blake3-v2":
+        if blake3 is None:
+            raise RuntimeError("EMBEDDING_SCHEME=blake3-v2 requires the 'blake3' package")
+        return _token_digests_blake3
+    raise RuntimeError(f"Unsupported EMBEDDING_SCHEME: {scheme}")
+
+
+_token_digests = _select_token_digests(settings.embedding_scheme)
+
+
+def _accumulate_numpy(words: np.ndarray, dimension: int) -> np.ndarray:
+    indices = (words[:, 0] % dimension).astype(np.intp)
+    magnitudes = (words[:, 1] / _U64_MAX) * 2.0 - 1.0
+
+    vector = np.zeros(dimension, dtype=np.float64)
+    np.add.at(vector, indices, magnitudes)
+
+    norm = math.sqrt(float(np.dot(vector, vector)))
+    if norm > 0.0:
+        vector /= norm
+    return vector
+
+
+if njit is not None:
+
+    # No fastmath: the sequential sums keep vectors bit-identical across hosts. nogil lets
+    # threadpool shards run the kernel concurrently.
+    @njit(nogil=True)
+    def _accumulate_jit(words: np.ndarray, dimension: int) -> np.ndarray:
+        # Bucket/magnitude decoding is fused into the loop so no temporaries are allocated.
+        buckets = np.uint64(dimension)
+        vector = np.zeros(dimension, dtype=np.float64)
+        for i in range(words.shape[0]):
+            vector[np.intp(words[i, 0] % buckets)] += (words[i, 1] / _U64_MAX) * 2.0 - 1.0
+        total = 0.0
+        for j in range(dimension):
+            total += vector[j] * vector[j]
+        if total > 0.0:
+            norm = math.sqrt(total)
+            for j in range(dimension):
+                vector[j] /= norm
+        return vector
+
+    @njit(nogil=True)
+    def _accumulate_rows_jit(words: np.ndarray, offsets: np.ndarray, dimension: int) -> np.ndarray:
+        out = np.empty((offsets.size - 1, dimension), dtype=np.float64)
+        for row in range(offsets.size - 1):
+            out[row, :] = _accumulate_jit(words[offsets[row] : offsets[row + 1]], dimension)
+        return out
+
+    _accumulate = _accumulate_jit
+    _accumulate_rows = _accumulate_rows_jit
+else:  # pragma: no cover - exercised only without numba
+    _accumulate = _accumulate_numpy
+
+    def _accumulate_rows(words: np.ndarray, offsets: np.ndarray, dimension: int) -> np.ndarray:
+        out = np.empty((offsets.size - 1, dimension), dtype=np.float64)
+        for row in range(offsets.size - 1):
+            out[row, :] = _accumulate_numpy(words[offsets[row] : offsets[row + 1]], dimension)
+        return out
+
+
+_WARMUP_WORDS = np.zeros((1, 2), dtype=np.uint64)
+_WARMUP_OFFSETS = np.array([0, 1], dtype=np.intp)
 
 
 def _embed_single(text: str) -> List[float]:
-    dimension = settings.embedding_dimension
-    vector = [0.0] * dimension
+    dimension = _EMBED_DIM
 
     tokens = _tokenize(text)
     if not tokens:
-        return vector
+        return [0.0] * dimension
 
-    for position, token in enumerate(tokens):
-        token_bytes = f"{position}:{token}".encode("utf-8")
-        digest = blake2b(token_bytes, digest_size=16, person=b"rag-embed").digest()
-        bucket = int.from_bytes(digest[:8], "big")
-        index = bucket % dimension
-        magnitude = int.from_bytes(digest[8:], "big") / float(2**64 - 1)
-        vector[index] += (magnitude * 2.0) - 1.0
-
-    norm = math.sqrt(sum(value * value for value in vector))
-    if norm > 0.0:
-        vector = [value / norm for value in vector]
+    # Each 16-byte digest is two big-endian uint64 words: bucket index, then magnitude.
+    words = np.frombuffer(_token_digests(tokens), dtype=">u8").reshape(-1, 2).astype(np.uint64)
+    return _accumulate(words, dimension).tolist()
+
+
+@lru_cache(maxsize=settings.embed_cache_size)
+def _embed_single_cached(text: str) -> tuple[float, ...]:
+    # Tuples keep cached vectors immutable across callers.
+    return tuple(_embed_single(text))
+
+
+EMBED_CACHE_LOOKUPS.labels("hit").set_function(lambda: _embed_single_cached.cache_info().hits)
+EMBED_CACHE_LOOKUPS.labels("miss").set_function(lambda: _embed_single_cached.cache_info().misses)
 
-    return vector
+
+def _embed_fused(texts: List[str]) -> List[List[float]]:
+    """Embed a batch with one digest buffer, one word decode and one kernel call."""
+    token_lists = [_tokenize(text) for text in texts]
+    buffer = b"".join(_token_digests(tokens) for tokens in token_lists if tokens)
+    words = np.frombuffer(buffer, dtype=">u8").reshape(-1, 2).astype(np.uint64)
+    offsets = np.zeros(len(token_lists) + 1, dtype=np.intp)
+    np.cumsum([len(tokens) for tokens in token_lists], out=offsets[1:])
+    return _accumulate_rows(words, offsets, _EMBED_DIM).tolist()
 
 
 def _embed_batch(texts: List[str]) -> List[List[float]]:
-    return [_embed_single(text) for text in texts]
+    if settings.embed_cache_size == 0:
+        # Without the LRU there is nothing to look up per text, so fuse the request.
+        return _embed_fused(texts)
+    return [list(_embed_single_cached(text)) for text in texts]
+
+
+_EMBED_SEMAPHORE = asyncio.Semaphore(settings.embed_concurrency)
+_EMBED_POOL: Optional[ProcessPoolExecutor] = None
+
+
+def _init_embed_worker() -> None:
+    _accumulate(_WARMUP_WORDS, 1)
+    _accumulate_rows(_WARMUP_WORDS, _WARMUP_OFFSETS, 1)
+
+
+async def _run_embed_batch(texts: List[str]) -> List[List[float]]:
+    if _EMBED_POOL is None:
+        return await run_in_threadpool(_embed_batch, texts)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_EMBED_POOL, _embed_batch, texts)
+
+
+async def _embed_batch_sharded(texts: List[str]) -> List[List[float]]:
+    shard_size = settings.embed_shard_size
+    if len(texts) <= shard_size:
+        return await _run_embed_batch(texts)
+
+    async def _embed_shard(shard: List[str]) -> List[List[float]]:
+        async with _EMBED_SEMAPHORE:
+            return await _run_embed_batch(shard)
 
+    shards = [texts[start : start + shard_size] for start in range(0, len(texts), shard_size)]
+    parts = await asyncio.gather(*(_embed_shard(shard) for shard in shards))
+    return list(chain.from_iterable(parts))
 
+
+@cache
 def _resolve_ollama_embedding_url() -> str:
     raw = settings.embedding_ollama_url or settings.ollama_url
     if not raw:
@@ -164,30 +426,85 @@ def _resolve_ollama_embedding_url() -> str:
     return f"{base}/api/embeddings"
 
 
+try:
+    import h2  # noqa: F401 - enables HTTP/2 in httpx
+
+    _HTTP2 = True
+except ImportError:  # pragma: no cover - HTTP/1.1 keep-alive only
+    _HTTP2 = False
+
+_HTTP_CLIENTS: Dict[str, httpx.AsyncClient] = {}
+
+
+def _get_http_client(name: str, timeout: float, max_connections: int = 100) -> httpx.AsyncClient:
+    # One keep-alive pool per upstream, created lazily so it binds to the serving event loop.
+    client = _HTTP_CLIENTS.get(name)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            timeout=timeout,
+            http2=_HTTP2,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        )
+        _HTTP_CLIENTS[name] = client
+    return client
+
+
+_UPSTREAM_LIMITS: Dict[str, asyncio.Semaphore] = {}
+
+
+@asynccontextmanager
+async def _upstream_slot(name: str, limit: int) -> AsyncIterator[None]:
+    # Cap in-flight calls per upstream so bursts queue here instead of overloading the model server.
+    semaphore = _UPSTREAM_LIMITS.get(name)
+    if semaphore is None:
+        semaphore = _UPSTREAM_LIMITS[name] = asyncio.Semaphore(limit)
+    start = time.perf_counter()
+    async with semaphore:
+        _record_queue_wait(time.perf_counter() - start)
+        yield
+
+
+def _get_embed_client() -> httpx.AsyncClient:
+    # The connection limit also bounds concurrent Ollama embedding calls.
+    return _get_http_client("embed", settings.embedding_timeout_s, max_connections=32)
+
+
+async def _embed_one_via_ollama(client: httpx.AsyncClient, url: str, model: str, text: str) -> List[float]:
+    payload = {"model": model, "prompt": text}
+    try:
+        response = await client.post(url, json=payload)
+        response.raise_for_status()
+    except httpx.HTTPError as exc:
+        raise RuntimeError(f"Ollama embedding request failed: {exc}") from exc
+    data = _json_loads(response.content)
+    embedding = data.get("embedding")
+    if isinstance(embedding, list):
+        return [float(value) for value in embedding]
+    multi = data.get("embeddings")
+    if isinstance(multi, list) and multi and isinstance(multi[0], list):
+        return [float(value) for value in multi[0]]
+    raise RuntimeError("Ollama embeddings response missing vector payload")
+
+
 async def _embed_via_ollama(texts: List[str]) -> List[List[float]]:
     url = _resolve_ollama_embedding_url()
     model = settings.embedding_model or "nomic-embed-text"
-    timeout = settings.embedding_timeout_s
-    vectors: List[List[float]] = []
-    async with httpx.AsyncClient(timeout=timeout) as client:
-        for text in texts:
-            payload = {"model": model, "prompt": text}
-            try:
-                response = await client.post(url, json=payload)
-                response.raise_for_status()
-            except httpx.HTTPError as exc:
-                raise RuntimeError(f"Ollama embedding request failed: {exc}") from exc
-            data = response.json()
-            embedding = data.get("embedding")
-            if isinstance(embedding, list):
-                vectors.append([float(value) for value in embedding])
-                continue
-            multi = data.get("embeddings")
-            if isinstance(multi, list) and multi and isinstance(multi[0], list):
-                vectors.append([float(value) for value in multi[0]])
-                continue
-            raise RuntimeError("Ollama embeddings response missing vector payload")
-    return vectors
+    client = _get_embed_client()
+
+    async def _bounded(text: str) -> List[float]:
+        async with _upstream_slot("embed", settings.embed_concurrency):
+            return await _embed_one_via_ollama(client, url, model, text)
+
+    results: List[Any] = await asyncio.gather(*(_bounded(text) for text in texts), return_exceptions=True)
+    # Retry only the texts that failed once before escalating to the next backend.
+    failed = [index for index, result in enumerate(results) if isinstance(result, BaseException)]
+    if failed:
+        retried = await asyncio.gather(*(_bounded(texts[index]) for index in failed), return_exceptions=True)
+        for index, result in zip(failed, retried):
+            if isinstance(result, BaseException):
+                raise result
+            results[index] = result
+    return results
 
 
 async def _embed_via_openai(texts: List[str]) -> List[List[float]]:
@@ -196,20 +513,19 @@ async def _embed_via_openai(texts: List[str]) -> List[List[float]]:
         raise RuntimeError("OPENAI_API_KEY is required for OpenAI embeddings")
     url = settings.embedding_api_url or f"{settings.openai_base_url.rstrip('/')}/embeddings"
     model = settings.openai_embed_model or settings.embedding_model or settings.openai_model
-    timeout = settings.embedding_timeout_s
     headers = {
         "Authorization": f"Bearer {api_key}",
         "Content-Type": "application/json",
     }
     payload = {"model": model, "input": texts}
     try:
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            response = await client.post(url, json=payload, headers=headers)
-            response.raise_for_status()
+        async with _upstream_slot("embed", settings.embed_concurrency):
+            response = await _get_embed_client().post(url, json=payload, headers=headers)
+        response.raise_for_status()
     except httpx.HTTPError as exc:
         raise RuntimeError(f"OpenAI embedding request failed: {exc}") from exc
 
-    body = response.json()
+    body = _json_loads(response.content)
     data = body.get("data")
     if not isinstance(data, list) or len(data) != len(texts):
         raise RuntimeError("OpenAI embedding response malformed")
@@ -222,16 +538,17 @@ async def _embed_via_openai(texts: List[str]) -> List[List[float]]:
     return vectors
 
 
-def _embedding_backend_sequence() -> List[str]:
+@cache
+def _embedding_backend_sequence() -> tuple[str, ...]:
     backend = (settings.embedding_backend or "fake").strip().lower()
     if backend == "auto":
-        return ["ollama", "openai"]
+        return ("ollama", "openai")
     if backend == "ollama":
         # Fall back to deterministic embeddings if the Ollama endpoint fails
-        return ["ollama", "fake"]
+        return ("ollama", "fake")
     if backend == "openai":
-        return ["openai", "fake"]
-    return [backend]
+        return ("openai", "fake")
+    return (backend,)
 
 
 async def _generate_embeddings(texts: List[str]) -> tuple[str, List[List[float]]]:
@@ -254,7 +571,7 @@ async def _generate_embeddings(texts: List[str]) -> tuple[str, List[List[float]]
                 return backend, await _embed_via_openai(texts)
             if backend == "fake":
                 logger.info("Embedding backend: Deterministic (batch=%d)", len(texts))
-                vectors = await run_in_threadpool(_embed_batch, texts)
+                vectors = await _embed_batch_sharded(texts)
                 return backend, vectors
             raise RuntimeError(f"Unsupported embedding backend '{backend}'")
         except HTTPException:
@@ -266,7 +583,90 @@ async def _generate_embeddings(texts: List[str]) -> tuple[str, List[List[float]]
     raise RuntimeError("; ".join(errors) or "Embedding generation failed")
 
 
+class _EmbedBatcher:
+    """Coalesce concurrent /embed requests into one upstream call per short window."""
+
+    def __init__(self, window_s: float, max_texts: int) -> None:
+        self._window_s = window_s
+        self._max_texts = max_texts
+        self._queue: asyncio.Queue[tuple[List[str], asyncio.Future]] = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+        self._flushes: set[asyncio.Task] = set()
+        # Request that did not fit the previous window; it opens the next one.
+        self._carry: Optional[tuple[List[str], asyncio.Future]] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def submit(self, texts: List[str]) -> tuple[str, List[List[float]]]:
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((texts, future))
+        return await future
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            first, self._carry = self._carry, None
+            batch = [first if first is not None else await self._queue.get()]
+            total = len(batch[0][0])
+            deadline = loop.time() + self._window_s
+            while total < self._max_texts:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                # Upstream calls stay within the per-request batch limit the backends enforce.
+                if total + len(item[0]) > self._max_texts:
+                    self._carry = item
+                    break
+                batch.append(item)
+                total += len(item[0])
+            # Flush in the background so the next window starts collecting immediately.
+            task = asyncio.create_task(self._flush(batch))
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+
+    @staticmethod
+    async def _flush(batch: List[tuple[List[str], asyncio.Future]]) -> None:
+        unique = list(dict.fromkeys(text for texts, _ in batch for text in texts))
+        try:
+            backend, vectors = await _generate_embeddings(unique)
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        by_text = dict(zip(unique, vectors))
+        for texts, future in batch:
+            if not future.done():
+                future.set_result((backend, [by_text[text] for text in texts]))
+
+
+_EMBED_BATCHER = _EmbedBatcher(settings.embed_batch_window_ms / 1000.0, _MAX_BATCH)
+
+
+async def _coalesced_embeddings(texts: List[str]) -> tuple[str, List[List[float]]]:
+    if _EMBED_BATCHER.running:
+        return await _EMBED_BATCHER.submit(texts)
+    return await _generate_embeddings(texts)
+
+
 class Message(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     role: Literal["system", "user", "assistant"]
     content: str = Field(min_length=1)
 
@@ -285,6 +685,8 @@ class GenerateRequest(BaseModel):
     stop: Optional[List[str]] = None
     options: Optional[Dict[str, Any]] = None
     answer_format: Optional[str] = Field(default=None)
+    stream: bool = False
+    include_raw_context: bool = False
 
     @model_validator(mode="after")
     def ensure_prompt_or_messages(self) -> "GenerateRequest":
@@ -408,12 +810,33 @@ def _build_profile_system(profile: ProfileConfig, custom_system: Optional[str],
     return "\n\n".join(part for part in segments if part).strip()
 
 
+@lru_cache(maxsize=256)
+def _build_profile_system_cached(profile_name: str, custom_system: Optional[str], mode: str) -> str:
+    # Profiles are memoised by _load_profile, so the name fully identifies the ProfileConfig.
+    return _build_profile_system(_load_profile(profile_name), custom_system, mode)
+
+
+@lru_cache(maxsize=256)
+def _profile_meta_template(profile_name: str, custom_system: Optional[str], mode: str) -> MappingProxyType:
+    # Everything in raw["profile"] except answer_format is fixed per (profile, system, mode).
+    profile_cfg = _load_profile(profile_name)
+    return MappingProxyType(
+        {
+            "name": profile_name,
+            "mode": mode,
+            "style": profile_cfg.style,
+            "output": profile_cfg.output,
+            "system": _build_profile_system_cached(profile_name, custom_system, mode),
+        }
+    )
+
+
 def _prepare_complete_request(payload: CompleteRequest) -> tuple[GenerateRequest, str, ProfileConfig, str, str]:
     profile_name = payload.profile or settings.default_profile
     mode = payload.mode or "LLM"
     profile = _resolve_profile(profile_name)
 
-    system_prompt = _build_profile_system(profile, payload.system, mode)
+    system_prompt = _build_profile_system_cached(profile_name, payload.system, mode)
     answer_format = resolve_answer_format(payload.answer_format)
 
     messages: List[Message] = []
@@ -453,6 +876,8 @@ def _prepare_complete_request(payload: CompleteRequest) -> tuple[GenerateRequest
 
 
 class CompletionRequest(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     prompt: str = Field(min_length=1)
     max_tokens: Optional[int] = Field(default=None, gt=0)
     temperature: float = Field(default=0.2, ge=0.0, le=1.0)
@@ -460,6 +885,7 @@ class CompletionRequest(BaseModel):
     model: Optional[str] = None
     adapter: Optional[str] = None
     stop: Optional[List[str]] = None
+    stream: bool = False
 
 
 class CompletionResponse(BaseModel):
@@ -469,15 +895,7 @@ class CompletionResponse(BaseModel):
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
 
-def _fallback_completion(prompt: str) -> str:
-    """Return a deterministic summary extracted from the provided context."""
-
-    context_start = prompt.lower().find("context:")
-    if context_start != -1:
-        context_section = prompt[context_start + len("context:") :]
-    else:
-        context_section = prompt
-
+def _clean_context(context_section: str) -> str:
     # Keep non-empty lines, strip bullets, and collapse whitespace.
     lines = []
     for raw_line in context_section.splitlines():
@@ -486,23 +904,40 @@ def _fallback_completion(prompt: str) -> str:
             lines.append(line)
 
     if not lines:
-        return "I don't have enough information in the provided context to answer."
+        return ""
 
     summary = " ".join(lines)
-    summary = re.sub(r"\s+", " ", summary).strip()
+    summary = " ".join(summary.split())
     if len(summary) > 500:
         summary = summary[:497].rsplit(" ", 1)[0] + "..."
     return summary
 
 
+def _fallback_completion(prompt: str) -> str:
+    """Return a deterministic summary extracted from the provided context."""
+
+    context_start = prompt.lower().find("context:")
+    if context_start != -1:
+        context_section = prompt[context_start + len("context:") :]
+    else:
+        context_section = prompt
+
+    summary = _clean_context(context_section)
+    if not summary:
+        return "I don't have enough information in the provided context to answer."
+    return summary
+
+
 def _normalize_duration_ns(raw: Any) -> Optional[float]:
+    # Ollama returns durations as non-negative integer nanoseconds; only coerce anything else.
+    if type(raw) is int:
+        return raw / 1_000_000_000 if raw >= 0 else None
     try:
         value = int(raw)
     except (TypeError, ValueError):
         return None
     if value < 0:
         return None
-    # Ollama returns durations in nanoseconds.
     return value / 1_000_000_000
 
 
@@ -552,6 +987,9 @@ def _infer_mode_from_text(text: str) -> str:
 
 def _enforce_allowed_model(payload: GenerateRequest) -> GenerateRequest:
     allowed = settings.allowed_model_id
+    if payload.model == allowed:
+        # Already normalised (callers chain through here more than once); skip the model_copy.
+        return payload
     requested = payload.model or settings.model_name or allowed
     candidate = str(requested).strip()
     if candidate != allowed:
@@ -615,7 +1053,7 @@ def _fake_generate(payload: GenerateRequest) -> GenerateResponse:
 
     model_id = payload.model or settings.allowed_model_id or settings.model_name or "fake-llm"
     metadata = _response_metadata(model_id, payload, 0, 0)
-    return GenerateResponse(
+    return GenerateResponse.model_construct(
         text=text,
         model=model_id,
         raw={
@@ -629,20 +1067,17 @@ def _fake_generate(payload: GenerateRequest) -> GenerateResponse:
 
 
 def _prepare_openai_messages(payload: GenerateRequest) -> List[Dict[str, str]]:
-    messages: List[Dict[str, str]] = []
-
-    if payload.system and payload.system.strip():
-        messages.append({"role": "system", "content": payload.system.strip()})
-
-    if payload.messages:
-        for message in payload.messages:
-            content = message.content.strip()
-            if not content:
-                continue
-            messages.append({"role": message.role, "content": content})
-
-    if payload.prompt and payload.prompt.strip():
-        messages.append({"role": "user", "content": payload.prompt.strip()})
+    # Strip each field once; empty entries are dropped.
+    candidates = chain(
+        (("system", payload.system or ""),),
+        ((message.role, message.content) for message in payload.messages or ()),
+        (("user", payload.prompt or ""),),
+    )
+    messages = [
+        {"role": role, "content": content}
+        for role, raw in candidates
+        if (content := raw.strip())
+    ]
 
     if not messages:
         raise HTTPException(
@@ -652,7 +1087,9 @@ def _prepare_openai_messages(payload: GenerateRequest) -> List[Dict[str, str]]:
     return messages
 
 
-async def _call_openai(payload: GenerateRequest) -> GenerateResponse:
+def _prepare_openai_request(
+    payload: GenerateRequest,
+) -> tuple[GenerateRequest, AnswerFormat, List[Dict[str, str]], Dict[str, Any]]:
     if not settings.openai_api_key:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -677,18 +1114,29 @@ async def _call_openai(payload: GenerateRequest) -> GenerateResponse:
     }
     if payload.stop:
         request_body["stop"] = payload.stop
+    return payload, answer_format, messages, request_body
+
 
+def _openai_url_and_headers() -> tuple[str, Dict[str, str]]:
     url = settings.openai_base_url.rstrip("/") + "/chat/completions"
     headers = {
         "Authorization": f"Bearer {settings.openai_api_key}",
         "Content-Type": "application/json",
     }
+    return url, headers
+
+
+async def _call_openai(payload: GenerateRequest) -> GenerateResponse:
+    payload, answer_format, messages, request_body = _prepare_openai_request(payload)
+    url, headers = _openai_url_and_headers()
+    prompt_chars = sum(len(message["content"]) for message in messages)
 
     start = time.perf_counter()
     try:
-        async with httpx.AsyncClient(timeout=settings.openai_timeout_s) as client:
-            response = await client.post(url, headers=headers, json=request_body)
-            response.raise_for_status()
+        response = await _get_http_client("openai", settings.openai_timeout_s).post(
+            url, headers=headers, json=request_body
+        )
+        response.raise_for_status()
     except httpx.TimeoutException as exc:
         LLM_TIMEOUTS_TOTAL.labels("openai").inc()
         logger.warning("Timeout while waiting for OpenAI response")
@@ -719,11 +1167,11 @@ async def _call_openai(payload: GenerateRequest) -> GenerateResponse:
                 "Slow OpenAI response (%.2fs) for model=%s prompt_chars=%d",
                 duration,
                 model_name,
-                len(json.dumps(messages)),
+                prompt_chars,
             )
 
     try:
-        data = response.json()
+        data = _json_loads(response.content)
     except ValueError as exc:  # pragma: no cover - defensive
         raise HTTPException(
             status_code=status.HTTP_502_BAD_GATEWAY,
@@ -763,8 +1211,12 @@ async def _call_openai(payload: GenerateRequest) -> GenerateResponse:
     )
 
 
-async def _call_ollama(payload: GenerateRequest) -> GenerateResponse:
+_OLLAMA_BASE_OPTIONS = MappingProxyType(ensure_option_defaults(settings.ollama_default_options))
 
+
+def _prepare_ollama_request(
+    payload: GenerateRequest,
+) -> tuple[GenerateRequest, AnswerFormat, str, Dict[str, Any]]:
     answer_format = resolve_answer_format(payload.answer_format)
     merged_system = merge_system_prompt(payload.system, answer_format)
     if merged_system != (payload.system or "").strip():
@@ -779,7 +1231,7 @@ async def _call_ollama(payload: GenerateRequest) -> GenerateResponse:
         "stream": False,
     }
 
-    options: Dict[str, Any] = ensure_option_defaults(settings.ollama_default_options)
+    options: Dict[str, Any] = dict(_OLLAMA_BASE_OPTIONS)
     if payload.options:
         options.update(payload.options)
     options.update(
@@ -801,12 +1253,26 @@ async def _call_ollama(payload: GenerateRequest) -> GenerateResponse:
 
     if payload.stop:
         request_body["stop"] = payload.stop
+    return payload, answer_format, prompt, request_body
+
+
+# Ollama echoes the full KV "context" token array (thousands of ints) that clients almost never reuse.
+_OLLAMA_BULK_RAW_FIELDS = frozenset({"context"})
+
+
+def _slim_ollama_raw(data: Dict[str, Any]) -> Dict[str, Any]:
+    if _OLLAMA_BULK_RAW_FIELDS.isdisjoint(data):
+        return data
+    return {key: value for key, value in data.items() if key not in _OLLAMA_BULK_RAW_FIELDS}
+
+
+async def _call_ollama(payload: GenerateRequest) -> GenerateResponse:
+    payload, answer_format, prompt, request_body = _prepare_ollama_request(payload)
 
     start = time.perf_counter()
     try:
-        async with httpx.AsyncClient(timeout=settings.ollama_timeout_s) as client:
-            response = await client.post(settings.ollama_url, json=request_body)
-            response.raise_for_status()
+        response = await _get_http_client("ollama", settings.ollama_timeout_s).post(settings.ollama_url, json=request_body)
+        response.raise_for_status()
     except httpx.TimeoutException as exc:
         LLM_TIMEOUTS_TOTAL.labels("ollama").inc()
         logger.warning("Timeout while waiting for Ollama response")
@@ -832,7 +1298,7 @@ async def _call_ollama(payload: GenerateRequest) -> GenerateResponse:
                 len(prompt),
             )
 
-    data = response.json()
+    data = _json_loads(response.content)
     text = data.get("response")
     if not isinstance(text, str) or not text.strip():
         logger.warning("Ollama response missing 'response' field or empty")
@@ -841,15 +1307,20 @@ async def _call_ollama(payload: GenerateRequest) -> GenerateResponse:
             detail="Ollama response missing text",
         )
 
+    if not payload.include_raw_context:
+        data = _slim_ollama_raw(data)
+
     reported_model = str(data.get("model") or request_body["model"])
-    metadata = _response_metadata(reported_model, payload, data.get("prompt_eval_count"), data.get("eval_count"))
+    eval_count = data.get("eval_count")
+    prompt_eval_count = data.get("prompt_eval_count")
+    metadata = _response_metadata(reported_model, payload, prompt_eval_count, eval_count)
 
     return GenerateResponse(
         text=text.strip(),
         model=reported_model,
-        eval_count=data.get("eval_count"),
+        eval_count=eval_count,
         eval_duration_s=_normalize_duration_ns(data.get("eval_duration")),
-        prompt_eval_count=data.get("prompt_eval_count"),
+        prompt_eval_count=prompt_eval_count,
         prompt_eval_duration_s=_normalize_duration_ns(data.get("prompt_eval_duration")),
         total_duration_s=_normalize_duration_ns(data.get("total_duration")),
         raw=data,
@@ -858,29 +1329,497 @@ async def _call_ollama(payload: GenerateRequest) -> GenerateResponse:
     )
 
 
+async def _open_openai_stream(payload: GenerateRequest) -> httpx.Response:
+    payload, _, _, request_body = _prepare_openai_request(payload)
+    request_body["stream"] = True
+    url, headers = _openai_url_and_headers()
+
+    # Open the upstream stream before responding so connection and status errors still map to HTTP errors.
+    client = _get_http_client("openai", settings.openai_timeout_s)
+    try:
+        response = await client.send(client.build_request("POST", url, headers=headers, json=request_body), stream=True)
+        if response.is_error:
+            await response.aread()
+            response.raise_for_status()
+    except httpx.TimeoutException as exc:
+        LLM_TIMEOUTS_TOTAL.labels("openai").inc()
+        logger.warning("Timeout while waiting for OpenAI stream")
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="Timed out while waiting for OpenAI",
+        ) from exc
+    except httpx.HTTPStatusError as exc:
+        logger.error("OpenAI stream request failed: %s", exc.response.text)
+        status_code = exc.response.status_code
+        raise HTTPException(
+            status_code=status_code if 400 <= status_code < 600 else status.HTTP_502_BAD_GATEWAY,
+            detail=f"OpenAI request failed: {exc.response.text or exc}",
+        ) from exc
+    except httpx.HTTPError as exc:
+        logger.error("OpenAI stream request failed: %s", exc)
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=f"OpenAI request failed: {exc}",
+        ) from exc
+
+    return response
+
+
+async def _openai_deltas(response: httpx.Response) -> AsyncIterator[str]:
+    async for line in response.aiter_lines():
+        if not line.startswith("data:"):
+            continue
+        data = line[len("data:") :].strip()
+        if data == "[DONE]":
+            break
+        try:
+            chunk = _json_loads(data)
+        except ValueError:
+            logger.debug("Skipping malformed OpenAI stream chunk: %s", data)
+            continue
+        choices = chunk.get("choices") or []
+        delta = (choices[0].get("delta") or {}).get("content") if choices else None
+        if delta:
+            yield delta
+
+
+async def _open_ollama_stream(payload: GenerateRequest) -> httpx.Response:
+    payload, _, _, request_body = _prepare_ollama_request(payload)
+    request_body["stream"] = True
+
+    client = _get_http_client("ollama", settings.ollama_timeout_s)
+    try:
+        response = await client.send(client.build_request("POST", settings.ollama_url, json=request_body), stream=True)
+        if response.is_error:
+            await response.aread()
+            response.raise_for_status()
+    except httpx.TimeoutException as exc:
+        LLM_TIMEOUTS_TOTAL.labels("ollama").inc()
+        logger.warning("Timeout while waiting for Ollama stream")
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="Timed out while waiting for Ollama",
+        ) from exc
+    except httpx.HTTPError as exc:
+        logger.error("Ollama stream request failed: %s", exc)
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=f"Ollama request failed: {exc}",
+        ) from exc
+
+    return response
+
+
+async def _ollama_deltas(response: httpx.Response) -> AsyncIterator[str]:
+    # Ollama streams one JSON object per line until a chunk with "done": true.
+    async for line in response.aiter_lines():
+        if not line.strip():
+            continue
+        try:
+            chunk = _json_loads(line)
+        except ValueError:
+            logger.debug("Skipping malformed Ollama stream chunk: %s", line)
+            continue
+        delta = chunk.get("response")
+        if delta:
+            yield delta
+        if chunk.get("done"):
+            break
+
+
+async def _single_delta(text: str) -> AsyncIterator[str]:
+    yield text
+
+
+async def _stream_llm(provider: str, payload: GenerateRequest) -> AsyncIterator[str]:
+    # The slot is held until the stream is drained, since the model is busy for that long. Slot and upstream
+    # response are owned by this generator, so closing it (or its garbage collection) releases both.
+    async with _upstream_slot(provider, settings.llm_max_concurrency):
+        if provider == "openai":
+            response = await _open_openai_stream(payload)
+            deltas = _openai_deltas(response)
+        else:
+            response = await _open_ollama_stream(payload)
+            deltas = _ollama_deltas(response)
+        try:
+            yield ""  # upstream is open
+            async for delta in deltas:
+                yield delta
+        finally:
+            await response.aclose()
+
+
+async def _open_llm_stream(payload: GenerateRequest) -> AsyncIterator[str]:
+    normalized = _enforce_allowed_model(payload)
+    provider = _LLM_PROVIDER
+    if provider == "fake":
+        return _single_delta(_fake_generate(normalized).text)
+    stream = _stream_llm(provider, normalized)
+    # Run up to the first yield so upstream connection and status errors still map to HTTP errors; once started,
+    # asyncio finalizes the generator even if the response body is never iterated.
+    await stream.__anext__()
+    return stream
+
+
+def _sse_response(deltas: AsyncIterator[str]) -> StreamingResponse:
+    return StreamingResponse(
+        _sse_events(deltas),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        # Releases the upstream slot when the body was never iterated; a no-op after a full stream.
+        background=BackgroundTask(deltas.aclose),
+    )
+
+
+async def _sse_events(deltas: AsyncIterator[str]) -> AsyncIterator[str]:
+    async for delta in deltas:
+        yield f"data: {json.dumps({'delta': delta})}\n\n"
+    yield "data: [DONE]\n\n"
+
+
+# Greedy (temperature=0) completions are reproducible, so identical requests reuse the upstream answer.
+_LLM_CACHE_SIZE = 2048
+_LLM_CACHE: OrderedDict[bytes, tuple[float, GenerateResponse]] = OrderedDict()
+
+
+# Bump to invalidate every cache/dedupe key when the key layout changes.
+_REQUEST_KEY_SECRET = b"llm-cache-v1"
+
+
+def _request_key(provider: str, payload: GenerateRequest, exclude: Optional[set[str]] = None) -> bytes:
+    # One keyed hash over the provider and the full payload JSON, so every request field is part of the key.
+    hasher = blake2b(digest_size=16, key=_REQUEST_KEY_SECRET)
+    hasher.update(provider.encode("utf-8"))
+    hasher.update(b"\0")
+    hasher.update(payload.model_dump_json(exclude=exclude).encode("utf-8"))
+    return hasher.digest()
+
+
+def _llm_cache_key(provider: str, payload: GenerateRequest) -> Optional[bytes]:
+    if settings.llm_cache_ttl_s <= 0 or payload.temperature != 0:
+        return None
+    return _request_key(provider, payload)
+
+
+def _llm_cache_get(key: bytes) -> Optional[GenerateResponse]:
+    entry = _LLM_CACHE.get(key)
+    if entry is None:
+        return None
+    expires_at, response = entry
+    if expires_at < time.monotonic():
+        _LLM_CACHE.pop(key, None)
+        return None
+    _LLM_CACHE.move_to_end(key)
+    return response
+
+
+def _llm_cache_put(key: bytes, response: GenerateResponse) -> None:
+    _LLM_CACHE[key] = (time.monotonic() + settings.llm_cache_ttl_s, response)
+    _LLM_CACHE.move_to_end(key)
+    while len(_LLM_CACHE) > _LLM_CACHE_SIZE:
+        _LLM_CACHE.popitem(last=False)
+
+
+# Semantic hits: rows of L2-normalised request embeddings, grouped by a digest of the non-prompt parameters.
+_SEMANTIC_MIN_TOKENS = 8
+_SEMANTIC_VECTORS: Optional[np.ndarray] = None
+_SEMANTIC_PARAMS = np.zeros(_LLM_CACHE_SIZE, dtype="S16")
+# Digest of the prompt's digit-bearing tokens ("q3", "2024", "15"); embeddings barely separate "Q3" from "Q4",
+# so prompts whose figures differ never share an answer whatever the similarity.
+_SEMANTIC_GUARDS = np.zeros(_LLM_CACHE_SIZE, dtype="S16")
+_SEMANTIC_KEYS: List[Optional[bytes]] = [None] * _LLM_CACHE_SIZE
+_SEMANTIC_NEXT = 0
+
+class _Flight:
+    """An upstream call shared by identical greedy requests, with the number of requests still awaiting it."""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: "asyncio.Task[GenerateResponse]") -> None:
+        self.task = task
+        self.waiters = 0
+
+
+# Single-flight: identical greedy requests already on their way upstream share one call.
+_INFLIGHT: Dict[bytes, _Flight] = {}
+
+# Per-request holder so middleware can report how _call_llm was served and how long it queued upstream.
+_CACHE_STATUS: contextvars.ContextVar[Optional[Dict[str, Any]]] = contextvars.ContextVar("llm_cache_status", default=None)
+
+
+def _mark_cache_status(value: str) -> None:
+    LLM_CACHE_RESULTS_TOTAL.labels(value).inc()
+    holder = _CACHE_STATUS.get()
+    if holder is not None:
+        holder["status"] = value
+
+
+def _record_queue_wait(seconds: float) -> None:
+    holder = _CACHE_STATUS.get()
+    if holder is not None:
+        holder["queue_wait_s"] = holder.get("queue_wait_s", 0.0) + seconds
+
+
+def _semantic_params_key(provider: str, payload: GenerateRequest) -> bytes:
+    return _request_key(provider, payload, exclude={"prompt", "messages"})
+
+
+def _semantic_text(payload: GenerateRequest) -> str:
+    parts = [message.content for message in payload.messages or ()]
+    if payload.prompt:
+        parts.append(payload.prompt)
+    return "\n".join(parts)
+
+
+def _semantic_guard(payload: GenerateRequest) -> bytes:
+    figures = sorted({token for token in _tokenize(_semantic_text(payload)) if any(char.isdigit() for char in token)})
+    return blake2b("\0".join(figures).encode("utf-8"), digest_size=16).digest()
+
+
+async def _semantic_query_vector(payload: GenerateRequest) -> Optional[np.ndarray]:
+    text = _semantic_text(payload)
+    if len(_tokenize(text)) < _SEMANTIC_MIN_TOKENS:
+        return None
+    try:
+        _, vectors = await _generate_embeddings([text])
+    except RuntimeError as exc:
+        logger.debug("Semantic cache lookup skipped: %s", exc)
+        return None
+    vector = np.asarray(vectors[0], dtype=np.float32)
+    norm = float(np.linalg.norm(vector))
+    return vector / norm if norm > 0.0 else None
+
+
+def _semantic_cache_get(vector: np.ndarray, params_key: bytes, guard: bytes) -> Optional[GenerateResponse]:
+    if _SEMANTIC_VECTORS is None or _SEMANTIC_VECTORS.shape[1] != vector.shape[0]:
+        return None
+    candidates = np.flatnonzero((_SEMANTIC_PARAMS == params_key) & (_SEMANTIC_GUARDS == guard))
+    if candidates.size == 0:
+        return None
+    scores = _SEMANTIC_VECTORS[candidates] @ vector
+    best = int(np.argmax(scores))
+    if scores[best] < settings.llm_semantic_cache_threshold:
+        return None
+    key = _SEMANTIC_KEYS[candidates[best]]
+    return _llm_cache_get(key) if key is not None else None
+
+
+def _semantic_cache_put(vector: np.ndarray, params_key: bytes, guard: bytes, cache_key: bytes) -> None:
+    global _SEMANTIC_VECTORS, _SEMANTIC_NEXT
+    if _SEMANTIC_VECTORS is None or _SEMANTIC_VECTORS.shape[1] != vector.shape[0]:
+        _SEMANTIC_VECTORS = np.zeros((_LLM_CACHE_SIZE, vector.shape[0]), dtype=np.float32)
+        _SEMANTIC_PARAMS[:] = b""
+    slot = _SEMANTIC_NEXT
+    _SEMANTIC_VECTORS[slot] = vector
+    _SEMANTIC_PARAMS[slot] = params_key
+    _SEMANTIC_GUARDS[slot] = guard
+    _SEMANTIC_KEYS[slot] = cache_key
+    _SEMANTIC_NEXT = (slot + 1) % _LLM_CACHE_SIZE
+
+
+async def _call_provider(provider: str, payload: GenerateRequest) -> GenerateResponse:
+    async with _upstream_slot(provider, settings.llm_max_concurrency):
+        if provider == "openai":
+            return await _call_openai(payload)
+        return await _call_ollama(payload)
+
+
 async def _call_llm(payload: GenerateRequest) -> GenerateResponse:
     normalized = _enforce_allowed_model(payload)
-    provider = (settings.llm_provider or "ollama").lower()
+    provider = _LLM_PROVIDER
     if provider == "fake":
         return _fake_generate(normalized)
-    if provider == "openai":
-        return await _call_openai(normalized)
-    return await _call_ollama(normalized)
+
+    cache_key = _llm_cache_key(provider, normalized)
+    if cache_key is not None:
+        cached = _llm_cache_get(cache_key)
+        if cached is not None:
+            _mark_cache_status("hit")
+            return cached
+        _mark_cache_status("miss")
+
+    flight_key = cache_key
+    if flight_key is None and normalized.temperature == 0:
+        flight_key = _request_key(provider, normalized)
+    if flight_key is None:
+        return await _call_provider(provider, normalized)
+
+    flight = _INFLIGHT.get(flight_key)
+    if flight is None:
+        flight = _start_flight(flight_key, _call_and_cache(provider, normalized, cache_key))
+    else:
+        _mark_cache_status("coalesced")
+    return await _await_flight(flight_key, flight)
+
+
+async def _call_and_cache(provider: str, payload: GenerateRequest, cache_key: Optional[bytes]) -> GenerateResponse:
+    # The semantic lookup runs inside the flight, so requests coalesced onto it do not embed the prompt again.
+    vector: Optional[np.ndarray] = None
+    params_key = guard = b""
+    if cache_key is not None and settings.llm_semantic_cache_threshold > 0:
+        vector = await _semantic_query_vector(payload)
+        if vector is not None:
+            params_key = _semantic_params_key(provider, payload)
+            guard = _semantic_guard(payload)
+            cached = _semantic_cache_get(vector, params_key, guard)
+            if cached is not None:
+                _mark_cache_status("semantic")
+                return cached
+    result = await _call_provider(provider, payload)
+    if cache_key is not None:
+        _llm_cache_put(cache_key, result)
+        if vector is not None:
+            _semantic_cache_put(vector, params_key, guard, cache_key)
+    return result
+
+
+def _start_flight(flight_key: bytes, call: Any) -> _Flight:
+    # The call runs detached from the request that started it, so that request disconnecting does not
+    # cancel the answer for the others sharing it.
+    flight = _Flight(asyncio.create_task(call))
+
+    def _finished(task: "asyncio.Task[GenerateResponse]") -> None:
+        if _INFLIGHT.get(flight_key) is flight:
+            del _INFLIGHT[flight_key]
+        # Mark the outcome as retrieved so a failure nobody awaited is not logged as unhandled.
+        if not task.cancelled():
+            task.exception()
+
+    flight.task.add_done_callback(_finished)
+    _INFLIGHT[flight_key] = flight
+    return flight
+
+
+async def _await_flight(flight_key: bytes, flight: _Flight) -> GenerateResponse:
+    flight.waiters += 1
+    try:
+        return await asyncio.shield(flight.task)
+    finally:
+        flight.waiters -= 1
+        if flight.waiters == 0 and not flight.task.done():
+            # Everyone sharing the call has gone away; stop it and let the next request start afresh.
+            if _INFLIGHT.get(flight_key) is flight:
+                del _INFLIGHT[flight_key]
+            flight.task.cancel()
+
+
+@app.middleware("http")
+async def _cache_status_header(request: Request, call_next):
+    holder: Dict[str, Any] = {}
+    token = _CACHE_STATUS.set(holder)
+    try:
+        response = await call_next(request)
+    finally:
+        _CACHE_STATUS.reset(token)
+    if "status" in holder:
+        response.headers["X-Cache"] = holder["status"]
+    if "queue_wait_s" in holder:
+        response.headers["X-Queue-Wait-ms"] = f"{holder['queue_wait_s'] * 1000.0:.1f}"
+    return response
+
+
+@app.on_event("startup")
+def _preload_profiles() -> None:
+    # Parse every profile once up front so the first /v1/complete per profile skips disk I/O.
+    for path in sorted(settings.profiles_dir.glob("*.yaml")):
+        try:
+            _load_profile(path.stem)
+        except (OSError, RuntimeError, ValidationError) as exc:
+            logger.warning("Failed to preload profile %s: %s", path.stem, exc)
 
 
-@app.post("/embed", response_model=EmbedResponse)
-async def embed_texts(payload: EmbedRequest) -> EmbedResponse:
-    _validate_texts(payload.texts)
+@app.on_event("startup")
+def _warm_embedding_kernel() -> None:
+    # Trigger JIT compilation before the first request arrives.
+    _accumulate(_WARMUP_WORDS, 1)
+    _accumulate_rows(_WARMUP_WORDS, _WARMUP_OFFSETS, 1)
+
+
+@app.on_event("startup")
+def _start_embed_pool() -> None:
+    global _EMBED_POOL
+    if settings.embed_processes > 0 and _EMBED_POOL is None:
+        _EMBED_POOL = ProcessPoolExecutor(max_workers=settings.embed_processes, initializer=_init_embed_worker)
+        logger.info("Embedding process pool started (workers=%d)", settings.embed_processes)
+
+
+@app.on_event("startup")
+async def _start_embed_batcher() -> None:
+    # Only remote backends benefit; deterministic embeddings are local CPU work.
+    if settings.embed_batch_window_ms > 0 and _embedding_backend_sequence()[0] != "fake":
+        _EMBED_BATCHER.start()
+
+
+_PREWARM_TASK: Optional[asyncio.Task] = None
+
+
+async def _prewarm_llm_cache(prompts: Sequence[str]) -> None:
+    # One prompt at a time so warming never competes with live traffic for more than one upstream slot.
+    for prompt in prompts:
+        try:
+            request = CompleteRequest(messages=[Message(role="user", content=prompt)], temperature=0)
+            request_payload = _prepare_complete_request(request)[0]
+            await _call_llm(request_payload)
+        except Exception as exc:  # noqa: BLE001 - warming is best effort
+            logger.warning("Cache prewarm failed for prompt %r: %s", prompt[:80], exc)
+    logger.info("Prewarmed LLM cache with %d prompts", len(prompts))
+
+
+@app.on_event("startup")
+async def _start_llm_cache_prewarm() -> None:
+    # temperature=0 /v1/complete calls on the default profile for these prompts then start as cache hits.
+    global _PREWARM_TASK
+    if settings.prewarm_prompts and settings.llm_cache_ttl_s > 0 and _LLM_PROVIDER != "fake":
+        _PREWARM_TASK = asyncio.create_task(_prewarm_llm_cache(settings.prewarm_prompts))
+
+
+@app.on_event("shutdown")
+async def _stop_llm_cache_prewarm() -> None:
+    global _PREWARM_TASK
+    if _PREWARM_TASK is not None:
+        _PREWARM_TASK.cancel()
+        await asyncio.gather(_PREWARM_TASK, return_exceptions=True)
+        _PREWARM_TASK = None
+
+
+@app.on_event("shutdown")
+async def _stop_embed_batcher() -> None:
+    await _EMBED_BATCHER.stop()
+
+
+@app.on_event("shutdown")
+async def _close_http_clients() -> None:
+    clients = list(_HTTP_CLIENTS.values())
+    _HTTP_CLIENTS.clear()
+    for client in clients:
+        await client.aclose()
+
+
+@app.on_event("shutdown")
+def _stop_embed_pool() -> None:
+    global _EMBED_POOL
+    if _EMBED_POOL is not None:
+        _EMBED_POOL.shutdown(wait=True, cancel_futures=True)
+        _EMBED_POOL = None
+
+
+async def _embed_request(texts: List[str]) -> np.ndarray:
+    _validate_texts(texts)
 
     try:
-        backend, embeddings = await _generate_embeddings(payload.texts)
+        backend, embeddings = await _coalesced_embeddings(texts)
     except RuntimeError as exc:
         raise HTTPException(
             status_code=status.HTTP_502_BAD_GATEWAY,
             detail=str(exc),
         ) from exc
 
-    if not embeddings or len(embeddings[0]) != settings.embedding_dimension:
+    # One contiguous (N, D) float32 matrix; checks every row rather than just the first.
+    try:
+        matrix = np.asarray(embeddings, dtype=np.float32)
+    except ValueError:
+        matrix = None
+    if matrix is None or matrix.shape != (len(texts), _EMBED_DIM):
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Embedding generation failed",
@@ -888,30 +1827,68 @@ async def embed_texts(payload: EmbedRequest) -> EmbedResponse:
 
     logger.info(
         "Generated %d embeddings via %s backend (dims=%d)",
-        len(embeddings),
+        matrix.shape[0],
         backend.upper(),
-        len(embeddings[0]),
+        matrix.shape[1],
     )
+    return matrix
 
-    return EmbedResponse(embeddings=embeddings)
+
+@app.post("/embed", response_model=EmbedResponse)
+async def embed_texts(payload: EmbedRequest) -> Response:
+    matrix = await _embed_request(payload.texts)
+    # float32 matches what pgvector/OpenSearch store and serializes without boxing every value.
+    return _ORJSONResponse({"embeddings": matrix})
+
+
+_INT8_SCALE = 1.0 / 127.0
+
+
+def _quantize_int8(matrix: np.ndarray) -> np.ndarray:
+    """Project rows onto the unit sphere and round to int8 (value * 1/127 ~ float)."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    unit = matrix / np.where(norms == 0.0, 1.0, norms)
+    return np.clip(np.round(unit * 127.0), -128, 127).astype(np.int8)
+
+
+@app.post("/embed_bin")
+async def embed_texts_binary(payload: EmbedBinRequest) -> Response:
+    """Return embeddings as one contiguous row-major buffer.
+
+    Read with ``np.frombuffer(resp.content, dtype=resp.headers["X-Dtype"]).reshape(-1, int(resp.headers["X-Dim"]))``;
+    int8 rows are unit-normalised and must be multiplied by ``X-Scale`` to recover floats.
+    """
+    matrix = await _embed_request(payload.texts)
+    headers = {"X-Dim": str(matrix.shape[1]), "X-Count": str(matrix.shape[0]), "X-Dtype": payload.precision}
+    if payload.precision == "int8":
+        matrix = _quantize_int8(matrix)
+        headers["X-Scale"] = repr(_INT8_SCALE)
+    return Response(content=matrix.tobytes(), media_type="application/octet-stream", headers=headers)
+
+
+@app.post("/embed/cache/clear")
+def clear_embed_cache() -> Dict[str, int]:
+    cleared = _embed_single_cached.cache_info().currsize
+    _embed_single_cached.cache_clear()
+    _tokenize.cache_clear()
+    return {"cleared": cleared}
+
+
+def _model_response(model: BaseModel) -> Response:
+    # Serialize once in pydantic-core; returning the model would make FastAPI dump, re-validate and dump it again.
+    return Response(content=model.model_dump_json(), media_type="application/json")
 
 
 @app.post("/v1/complete", response_model=CompleteResponse)
-async def complete_with_profile(payload: CompleteRequest) -> CompleteResponse:
-    request_payload, profile_name, profile_cfg, system_prompt, mode = _prepare_complete_request(payload)
+async def complete_with_profile(payload: CompleteRequest) -> Response:
+    request_payload, profile_name, _, _, mode = _prepare_complete_request(payload)
     normalized_payload = _enforce_allowed_model(request_payload)
 
-    if settings.llm_provider.lower() == "fake":
+    if _LLM_PROVIDER == "fake":
         fake_response = _fake_generate(normalized_payload)
         raw_payload = dict(fake_response.raw)
-        raw_payload["profile"] = {
-            "name": profile_name,
-            "mode": mode,
-            "style": profile_cfg.style,
-            "output": profile_cfg.output,
-            "system": system_prompt,
-        }
-        return CompleteResponse(
+        raw_payload["profile"] = dict(_profile_meta_template(profile_name, payload.system, mode))
+        response = CompleteResponse.model_construct(
             text=fake_response.text,
             model=fake_response.model,
             eval_count=fake_response.eval_count,
@@ -926,21 +1903,19 @@ async def complete_with_profile(payload: CompleteRequest) -> CompleteResponse:
             answer_format=fake_response.answer_format,
             metadata=fake_response.metadata,
         )
+        return _model_response(response)
 
     result = await _call_llm(normalized_payload)
 
     base_raw = result.raw if isinstance(result.raw, dict) else {}
     raw_payload = dict(base_raw)
     raw_payload["profile"] = {
-        "name": profile_name,
-        "mode": mode,
-        "style": profile_cfg.style,
-        "output": profile_cfg.output,
-        "system": system_prompt,
+        **_profile_meta_template(profile_name, payload.system, mode),
         "answer_format": result.answer_format,
     }
 
-    return CompleteResponse(
+    # Fields come from an already validated GenerateResponse, so skip re-validation.
+    response = CompleteResponse.model_construct(
         text=result.text,
         model=result.model,
         eval_count=result.eval_count,
@@ -955,15 +1930,18 @@ async def complete_with_profile(payload: CompleteRequest) -> CompleteResponse:
         answer_format=result.answer_format,
         metadata=result.metadata,
     )
+    return _model_response(response)
 
 
 @app.post("/v1/generate", response_model=GenerateResponse)
-async def generate(payload: GenerateRequest) -> GenerateResponse:
-    return await _call_llm(payload)
+async def generate(payload: GenerateRequest) -> Response:
+    if payload.stream:
+        return _sse_response(await _open_llm_stream(payload))
+    return _model_response(await _call_llm(payload))
 
 
 @app.post("/complete", response_model=CompletionResponse)
-async def complete_text(payload: CompletionRequest) -> CompletionResponse:
+async def complete_text(payload: CompletionRequest) -> Response:
     request = GenerateRequest(
         prompt=payload.prompt,
         model=payload.model,
@@ -974,12 +1952,17 @@ async def complete_text(payload: CompletionRequest) -> CompletionResponse:
         top_p=payload.top_p,
     )
 
+    if payload.stream:
+        return _sse_response(await _open_llm_stream(request))
+
     response = await _call_llm(request)
-    return CompletionResponse(
-        completion=response.text,
-        model=response.model,
-        fallback_used=False,
-        metadata=response.metadata,
+    return _model_response(
+        CompletionResponse.model_construct(
+            completion=response.text,
+            model=response.model,
+            fallback_used=False,
+            metadata=response.metadata,
+        )
     )
 
 
@@ -6,21 +6,27 @@ import os
 import json
 from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
-from dotenv import load_dotenv
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
-load_dotenv()
-
-ALLOWED_MODEL_ID = os.getenv("ALLOWED_LLM_MODEL", "ft:gpt-4o-mini-2024-07-18:esprit:ai-business-agent-v1")
-DEFAULT_MODEL = ALLOWED_MODEL_ID
+# Overridden by ALLOWED_LLM_MODEL, which is only read in get_settings() once .env has been loaded.
+DEFAULT_MODEL = "ft:gpt-4o-mini-2024-07-18:esprit:ai-business-agent-v1"
 
 
 class Settings(BaseModel):
+    # Read once at import; main.py derives module-level constants from it, so it must not change afterwards.
+    model_config = ConfigDict(frozen=True)
+
     app_name: str = Field(default="LLM API Service")
     embedding_dimension: int = Field(default=1536, gt=0)
+    embedding_scheme: str = Field(default="blake2b-v1")
     max_batch_size: int = Field(default=256, gt=0)
+    embed_cache_size: int = Field(default=8192, ge=0)
+    embed_shard_size: int = Field(default=32, gt=0)
+    embed_concurrency: int = Field(default=4, gt=0)
+    embed_processes: int = Field(default=0, ge=0)
+    embed_batch_window_ms: float = Field(default=5.0, ge=0)
     default_max_tokens: int = Field(default=900, gt=0)
     embedding_backend: str = Field(default="fake")
     embedding_model: str = Field(default="text-embedding-3-small")
@@ -41,8 +47,12 @@ class Settings(BaseModel):
     default_profile: str = Field(default="business_default")
     profiles_dir: Path = Field(default_factory=lambda: Path(__file__).resolve().parent / "profiles")
     slow_request_threshold_s: float = Field(default=45.0, gt=0)
+    llm_max_concurrency: int = Field(default=8, gt=0)
+    llm_cache_ttl_s: float = Field(default=300.0, ge=0)
+    llm_semantic_cache_threshold: float = Field(default=0.0, ge=0, le=1)
+    prewarm_prompts: List[str] = Field(default_factory=list)
     ollama_default_options: Dict[str, Any] = Field(default_factory=dict)
-    allowed_model_id: str = Field(default=ALLOWED_MODEL_ID)
+    allowed_model_id: str = Field(default=DEFAULT_MODEL)
 
 
 def _coerce_int(env_name: str, default: int) -> int:
@@ -78,14 +88,32 @@ def _coerce_json_dict(env_name: str) -> Dict[str, Any]:
     return data
 
 
+def _coerce_json_str_list(env_name: str) -> List[str]:
+    raw = os.getenv(env_name)
+    if not raw:
+        return []
+    try:
+        data = json.loads(raw)
+    except json.JSONDecodeError as exc:  # pragma: no cover - defensive guard
+        raise RuntimeError(f"{env_name} must be valid JSON: {exc}") from exc
+    if not isinstance(data, list) or not all(isinstance(item, str) for item in data):
+        raise RuntimeError(f"{env_name} must decode to a JSON list of strings.")
+    return data
+
+
 @lru_cache(maxsize=1)
 def get_settings() -> Settings:
+    # Deferred so importing this module stays cheap; get_settings() is memoised, so .env loads once.
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    allowed_model_id = os.getenv("ALLOWED_LLM_MODEL", DEFAULT_MODEL)
     resolved_model = (
         os.getenv("MODEL_NAME")
         or os.getenv("DEFAULT_LLM_MODEL")
         or os.getenv("OPENAI_MODEL")
         or os.getenv("OLLAMA_MODEL")
-        or DEFAULT_MODEL
+        or allowed_model_id
     )
     profiles_dir_env = os.getenv("PROFILES_DIR")
     profiles_dir = (
@@ -96,7 +124,13 @@ def get_settings() -> Settings:
 
     return Settings(
         embedding_dimension=_coerce_int("EMBEDDING_DIMENSION", 1536),
+        embedding_scheme=os.getenv("EMBEDDING_SCHEME", "blake2b-v1").strip().lower(),
         max_batch_size=_coerce_int("EMBED_MAX_BATCH", 256),
+        embed_cache_size=_coerce_int("EMBED_CACHE", 8192),
+        embed_shard_size=_coerce_int("EMBED_SHARD_SIZE", 32),
+        embed_concurrency=_coerce_int("EMBED_CONCURRENCY", 4),
+        embed_processes=_coerce_int("EMBED_PROCESSES", 0),
+        embed_batch_window_ms=_coerce_float("EMBED_BATCH_WINDOW_MS", 5.0),
         default_max_tokens=_coerce_int("LLM_MAX_TOKENS", 900),
         embedding_backend=os.getenv("EMBEDDING_BACKEND") or os.getenv("EMBED_PROVIDER", "fake"),
         embedding_model=os.getenv("EMBEDDING_MODEL")
@@ -120,6 +154,10 @@ def get_settings() -> Settings:
         default_profile=os.getenv("PROFILE", "business_default"),
         profiles_dir=profiles_dir,
         slow_request_threshold_s=_coerce_float("SLOW_REQUEST_THRESHOLD_S", 45.0),
+        llm_max_concurrency=_coerce_int("LLM_MAX_CONCURRENCY", 8),
+        llm_cache_ttl_s=_coerce_float("LLM_CACHE_TTL_S", 300.0),
+        llm_semantic_cache_threshold=_coerce_float("LLM_SEMANTIC_CACHE_THRESHOLD", 0.0),
+        prewarm_prompts=_coerce_json_str_list("PREWARM_PROMPTS"),
         ollama_default_options=_coerce_json_dict("OLLAMA_DEFAULT_OPTIONS"),
-        allowed_model_id=ALLOWED_MODEL_ID,
+        allowed_model_id=allowed_model_id,
     )
@@ -1,5 +1,11 @@
 """Unit tests for the deterministic embedding generator."""
 
+import asyncio
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
 from services.llm_api import main as llm_main
 
 
@@ -15,3 +21,82 @@ def test_embed_shape_and_determinism() -> None:
 
     single_embedding = llm_main._embed_batch([texts[0]])[0]
     assert embeddings[0] == single_embedding
+
+
+def test_cached_embeddings_match_the_uncached_path() -> None:
+    texts = ["Revenue policy", "Travel approvals", "Revenue policy"]
+    llm_main._embed_single_cached.cache_clear()
+
+    cached = llm_main._embed_batch(texts)
+
+    assert cached == llm_main._embed_fused(texts)
+    info = llm_main._embed_single_cached.cache_info()
+    assert (info.hits, info.misses) == (1, 2)
+
+
+def test_cache_clear_endpoint_empties_the_caches() -> None:
+    llm_main._embed_single_cached.cache_clear()
+    llm_main._embed_batch(["Revenue policy", "Travel approvals"])
+
+    response = TestClient(llm_main.app).post("/embed/cache/clear")
+
+    assert response.status_code == 200
+    assert response.json() == {"cleared": 2}
+    assert llm_main._embed_single_cached.cache_info().currsize == 0
+    assert llm_main._tokenize.cache_info().currsize == 0
+
+
+def test_embed_bin_returns_a_float32_matrix() -> None:
+    texts = ["Revenue policy", "Travel approvals"]
+
+    response = TestClient(llm_main.app).post("/embed_bin", json={"texts": texts})
+
+    assert response.status_code == 200
+    assert response.headers["X-Dtype"] == "float32"
+    assert response.headers["X-Count"] == "2"
+    matrix = np.frombuffer(response.content, dtype=response.headers["X-Dtype"]).reshape(-1, int(response.headers["X-Dim"]))
+    np.testing.assert_array_equal(matrix, np.asarray(llm_main._embed_batch(texts), dtype=np.float32))
+
+
+def test_embed_bin_int8_rows_recover_the_unit_vectors() -> None:
+    texts = ["Revenue policy", "Travel approvals", ""]
+
+    response = TestClient(llm_main.app).post("/embed_bin", json={"texts": texts, "precision": "int8"})
+
+    assert response.status_code == 200
+    assert response.headers["X-Dtype"] == "int8"
+    quantized = np.frombuffer(response.content, dtype=np.int8).reshape(-1, int(response.headers["X-Dim"]))
+    recovered = quantized.astype(np.float32) * float(response.headers["X-Scale"])
+    floats = np.asarray(llm_main._embed_batch(texts), dtype=np.float32)
+    norms = np.linalg.norm(floats, axis=1, keepdims=True)
+    expected = floats / np.where(norms == 0.0, 1.0, norms)
+    # Rounding to 1/127 steps keeps every component within half a step.
+    np.testing.assert_allclose(recovered, expected, atol=0.5 / 127.0 + 1e-6)
+
+
+def test_embed_batcher_keeps_each_upstream_call_within_the_batch_limit(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[list[str]] = []
+
+    async def fake_generate(texts: list[str]) -> tuple[str, list[list[float]]]:
+        calls.append(list(texts))
+        return "fake", [[float(len(text))] for text in texts]
+
+    monkeypatch.setattr(llm_main, "_generate_embeddings", fake_generate)
+
+    async def _run() -> list[tuple[str, list[list[float]]]]:
+        batcher = llm_main._EmbedBatcher(window_s=0.05, max_texts=4)
+        batcher.start()
+        try:
+            return await asyncio.gather(
+                batcher.submit(["a", "bb", "ccc"]),
+                batcher.submit(["dddd", "eeeee"]),
+                batcher.submit(["f"]),
+            )
+        finally:
+            await batcher.stop()
+
+    results = asyncio.run(_run())
+
+    assert all(len(call) <= 4 for call in calls)
+    assert sorted(text for call in calls for text in call) == ["a", "bb", "ccc", "dddd", "eeeee", "f"]
+    assert [vectors for _, vectors in results] == [[[1.0], [2.0], [3.0]], [[4.0], [5.0]], [[1.0]]]
@@ -0,0 +1,166 @@
+"""Single-flight sharing and semantic reuse of greedy LLM calls."""
+
+import asyncio
+from collections import OrderedDict
+from typing import List
+
+import numpy as np
+import pytest
+
+from services.llm_api import main as llm_main
+
+
+class _Upstream:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.cancelled = 0
+        self.release = asyncio.Event()
+        self.error: Exception | None = None
+
+    async def __call__(self, _provider: str, payload: llm_main.GenerateRequest) -> llm_main.GenerateResponse:
+        self.calls += 1
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.error is not None:
+            raise self.error
+        return llm_main.GenerateResponse(text=f"answer {self.calls}", model="m")
+
+
+@pytest.fixture
+def upstream(monkeypatch: pytest.MonkeyPatch) -> _Upstream:
+    fake = _Upstream()
+    monkeypatch.setattr(llm_main, "_LLM_PROVIDER", "ollama")
+    monkeypatch.setattr(llm_main, "_enforce_allowed_model", lambda payload: payload)
+    monkeypatch.setattr(llm_main, "_call_provider", fake)
+    # Exact caching off, so only single-flight can share work.
+    monkeypatch.setattr(llm_main, "settings", llm_main.settings.model_copy(update={"llm_cache_ttl_s": 0}))
+    monkeypatch.setattr(llm_main, "_INFLIGHT", {})
+    return fake
+
+
+def _request() -> llm_main.GenerateRequest:
+    return llm_main.GenerateRequest(prompt="What is our runway?", temperature=0)
+
+
+async def _settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_owner_disconnect_does_not_cancel_followers(upstream: _Upstream) -> None:
+    async def _run() -> List[str]:
+        upstream.release = asyncio.Event()
+        owner = asyncio.create_task(llm_main._call_llm(_request()))
+        await _settle()
+        followers = [asyncio.create_task(llm_main._call_llm(_request())) for _ in range(2)]
+        await _settle()
+        owner.cancel()
+        await _settle()
+        upstream.release.set()
+        results = await asyncio.gather(*followers)
+        assert owner.cancelled()
+        return [result.text for result in results]
+
+    assert asyncio.run(_run()) == ["answer 1", "answer 1"]
+    assert upstream.calls == 1
+    assert upstream.cancelled == 0
+    assert llm_main._INFLIGHT == {}
+
+
+def test_call_is_cancelled_once_every_waiter_leaves(upstream: _Upstream) -> None:
+    async def _run() -> str:
+        upstream.release = asyncio.Event()
+        waiters = [asyncio.create_task(llm_main._call_llm(_request())) for _ in range(2)]
+        await _settle()
+        for waiter in waiters:
+            waiter.cancel()
+        await _settle()
+        assert upstream.cancelled == 1
+        assert llm_main._INFLIGHT == {}
+        # A later identical request starts its own call instead of joining the cancelled one.
+        upstream.release.set()
+        return (await llm_main._call_llm(_request())).text
+
+    assert asyncio.run(_run()) == "answer 2"
+
+
+def test_upstream_failure_reaches_every_waiter(upstream: _Upstream) -> None:
+    upstream.error = RuntimeError("upstream down")
+
+    async def _run() -> List[BaseException]:
+        upstream.release = asyncio.Event()
+        waiters = [asyncio.create_task(llm_main._call_llm(_request())) for _ in range(3)]
+        await _settle()
+        upstream.release.set()
+        return await asyncio.gather(*waiters, return_exceptions=True)
+
+    results = asyncio.run(_run())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert upstream.calls == 1
+
+
+_BOARD_PROMPT = "Summarize the revenue for Q3 2024 across the EMEA region for the board"
+
+
+@pytest.fixture
+def semantic(monkeypatch: pytest.MonkeyPatch, upstream: _Upstream) -> List[str]:
+    embedded: List[str] = []
+
+    async def deterministic_embeddings(texts: List[str]) -> tuple:
+        embedded.extend(texts)
+        return "fake", llm_main._embed_batch(texts)
+
+    monkeypatch.setattr(llm_main, "_generate_embeddings", deterministic_embeddings)
+    monkeypatch.setattr(
+        llm_main,
+        "settings",
+        llm_main.settings.model_copy(update={"llm_cache_ttl_s": 300, "llm_semantic_cache_threshold": 0.99}),
+    )
+    monkeypatch.setattr(llm_main, "_LLM_CACHE", OrderedDict())
+    monkeypatch.setattr(llm_main, "_SEMANTIC_VECTORS", None)
+    monkeypatch.setattr(llm_main, "_SEMANTIC_PARAMS", np.zeros(llm_main._LLM_CACHE_SIZE, dtype="S16"))
+    monkeypatch.setattr(llm_main, "_SEMANTIC_GUARDS", np.zeros(llm_main._LLM_CACHE_SIZE, dtype="S16"))
+    monkeypatch.setattr(llm_main, "_SEMANTIC_KEYS", [None] * llm_main._LLM_CACHE_SIZE)
+    monkeypatch.setattr(llm_main, "_SEMANTIC_NEXT", 0)
+    upstream.release.set()
+    return embedded
+
+
+def _ask(prompt: str) -> str:
+    return asyncio.run(llm_main._call_llm(llm_main.GenerateRequest(prompt=prompt, temperature=0))).text
+
+
+def test_semantic_cache_reuses_only_equivalent_prompts(semantic: List[str], upstream: _Upstream) -> None:
+    assert _ask(_BOARD_PROMPT) == "answer 1"
+    # Case and punctuation do not change the tokens, so the answer is shared.
+    assert _ask(_BOARD_PROMPT.lower() + ".") == "answer 1"
+    # One different word is a different question.
+    assert _ask(_BOARD_PROMPT.replace("revenue", "costs")) == "answer 2"
+    assert upstream.calls == 2
+
+
+def test_semantic_cache_never_mixes_figures(monkeypatch: pytest.MonkeyPatch, semantic: List[str]) -> None:
+    # Even with a loose threshold that the Q3/Q4 embeddings clear, differing figures must not share an answer.
+    monkeypatch.setattr(
+        llm_main, "settings", llm_main.settings.model_copy(update={"llm_semantic_cache_threshold": 0.9})
+    )
+    assert _ask(_BOARD_PROMPT) == "answer 1"
+    assert _ask(_BOARD_PROMPT.replace("Q3", "Q4")) == "answer 2"
+    assert _ask(_BOARD_PROMPT.replace("2024", "2023")) == "answer 3"
+
+
+def test_coalesced_requests_embed_once(semantic: List[str], upstream: _Upstream) -> None:
+    async def _run() -> None:
+        upstream.release = asyncio.Event()
+        request = llm_main.GenerateRequest(prompt=_BOARD_PROMPT, temperature=0)
+        waiters = [asyncio.create_task(llm_main._call_llm(request)) for _ in range(3)]
+        await _settle()
+        upstream.release.set()
+        await asyncio.gather(*waiters)
+
+    asyncio.run(_run())
+    assert semantic == [_BOARD_PROMPT]
+    assert upstream.calls == 1
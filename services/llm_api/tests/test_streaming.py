@@ -0,0 +1,94 @@
+"""Upstream slot accounting for streamed completions."""
+
+import asyncio
+import gc
+from typing import AsyncIterator, List
+
+import pytest
+from fastapi import HTTPException
+
+from services.llm_api import main as llm_main
+
+
+class _FakeUpstream:
+    def __init__(self, lines: List[str]) -> None:
+        self._lines = lines
+        self.closed = False
+
+    async def aiter_lines(self) -> AsyncIterator[str]:
+        for line in self._lines:
+            yield line
+
+    async def aclose(self) -> None:
+        self.closed = True
+
+
+def _slot_value() -> int:
+    semaphore = llm_main._UPSTREAM_LIMITS.get("ollama")
+    return semaphore._value if semaphore is not None else llm_main.settings.llm_max_concurrency
+
+
+@pytest.fixture
+def upstream(monkeypatch: pytest.MonkeyPatch) -> _FakeUpstream:
+    fake = _FakeUpstream(['{"response": "Hel", "done": false}', '{"response": "lo", "done": true}'])
+
+    async def fake_open(_payload: llm_main.GenerateRequest) -> _FakeUpstream:
+        return fake
+
+    monkeypatch.setattr(llm_main, "_LLM_PROVIDER", "ollama")
+    monkeypatch.setattr(llm_main, "_open_ollama_stream", fake_open)
+    monkeypatch.setattr(llm_main, "_enforce_allowed_model", lambda payload: payload)
+    return fake
+
+
+def test_drained_stream_releases_slot(upstream: _FakeUpstream) -> None:
+    async def _run() -> List[str]:
+        before = _slot_value()
+        deltas = await llm_main._open_llm_stream(llm_main.GenerateRequest(prompt="hi"))
+        assert _slot_value() == before - 1
+        chunks = [delta async for delta in deltas]
+        assert _slot_value() == before
+        return chunks
+
+    assert asyncio.run(_run()) == ["Hel", "lo"]
+    assert upstream.closed
+
+
+def test_unread_stream_releases_slot_on_close(upstream: _FakeUpstream) -> None:
+    async def _run() -> None:
+        before = _slot_value()
+        deltas = await llm_main._open_llm_stream(llm_main.GenerateRequest(prompt="hi"))
+        await deltas.aclose()
+        assert _slot_value() == before
+
+    asyncio.run(_run())
+    assert upstream.closed
+
+
+def test_dropped_stream_releases_slot(upstream: _FakeUpstream) -> None:
+    async def _run() -> None:
+        before = _slot_value()
+        deltas = await llm_main._open_llm_stream(llm_main.GenerateRequest(prompt="hi"))
+        del deltas
+        gc.collect()
+        for _ in range(3):
+            await asyncio.sleep(0)
+        assert _slot_value() == before
+
+    asyncio.run(_run())
+    assert upstream.closed
+
+
+def test_failed_open_releases_slot(monkeypatch: pytest.MonkeyPatch, upstream: _FakeUpstream) -> None:
+    async def failing_open(_payload: llm_main.GenerateRequest) -> _FakeUpstream:
+        raise HTTPException(status_code=502, detail="down")
+
+    monkeypatch.setattr(llm_main, "_open_ollama_stream", failing_open)
+
+    async def _run() -> None:
+        before = _slot_value()
+        with pytest.raises(HTTPException):
+            await llm_main._open_llm_stream(llm_main.GenerateRequest(prompt="hi"))
+        assert _slot_value() == before
+
+    asyncio.run(_run())
@@ -2,20 +2,28 @@
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import json
 import logging
 import re
 import time
+from collections import OrderedDict
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional, Sequence
+from functools import lru_cache
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence
 
 import httpx
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional fast JSON encoder
+    orjson = None
+
 import planner
 import synthesis
 from memory import approx_token_len, memory
-from rag import estimate_confidence, hybrid_search, rerank
+from rag import estimate_confidence_from_scores, hybrid_search, rerank
 from risk import bound_trials, current_data_version, read as risk_read, run as risk_run, store as risk_store
 from schemas import AssistantResponse, Plan
 from settings import get_settings
@@ -43,6 +51,7 @@ APPLE_QUERY_TERMS = [
     "India",
     "supply chain",
 ]
+_APPLE_QUERY_PAIRS = tuple((term.lower(), term) for term in APPLE_QUERY_TERMS)
 FORCE_RAG_KEYWORDS = [
     "company",
     "companies",
@@ -69,7 +78,39 @@ FORCE_RAG_KEYWORDS = [
     "trend",
 ]
 FRESHNESS_HINTS = ("latest", "recent", "since", "update", "new", "today", "this week")
+APPLE_MENTIONS = ("apple", "aapl", "app store")
 INSUFFICIENT_MESSAGE = "INSUFFICIENT EVIDENCE"
+# Near-duplicates need a lead within SIMHASH_MAX_DISTANCE bits (word-pair shingles over the first
+# SIMHASH_TEXT_CHARS of text) and a headline whose terms contain, or are contained in, the other's.
+SIMHASH_MAX_DISTANCE = 3
+SIMHASH_TEXT_CHARS = 200
+SIMHASH_SHINGLE_WORDS = 2
+RERANK_DEDUP_HEADROOM = 3
+
+
+# Inflections accepted after a keyword, so "recently", "updated", "newest" and "launched" still count while
+# "productivity" or "sincere" do not.
+_KEYWORD_SUFFIXES = ("s", "es", "d", "ed", "ing", "ly", "er", "ers", "est")
+
+
+def _keyword_pattern(keywords: Sequence[str]) -> re.Pattern[str]:
+    stems: List[str] = []
+    for keyword in keywords:
+        stems.append(r"\s+".join(re.escape(word) for word in keyword.split()))
+        if keyword.endswith("e"):
+            stems.append(re.escape(keyword[:-1]) + "ing")
+    stems.sort(key=len, reverse=True)
+    return re.compile(r"\b(?:%s)(?:%s)?\b" % ("|".join(stems), "|".join(_KEYWORD_SUFFIXES)))
+
+
+_SENTENCE_RE = re.compile(r"[^.!?]+")
+_CLAIM_RE = re.compile(r"\d|percent|increase|decrease|roi|margin", re.IGNORECASE)
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_KEYWORD_PATTERNS = (
+    ("force", _keyword_pattern(FORCE_RAG_KEYWORDS)),
+    ("fresh", _keyword_pattern(FRESHNESS_HINTS)),
+    ("apple", _keyword_pattern(APPLE_MENTIONS)),
+)
 
 
 def token_len(text: str | None) -> int:
@@ -77,54 +118,57 @@ def token_len(text: str | None) -> int:
 
 
 def count_factual_claims(text: str) -> int:
-    sentences = [segment.strip() for segment in re.split(r"[.!?]", text) if segment.strip()]
-    count = 0
-    for sentence in sentences:
-        if re.search(r"\d", sentence) or any(keyword in sentence.lower() for keyword in ("percent", "increase", "decrease", "roi", "margin")):
-            count += 1
-    return count
+    return sum(1 for sentence in _SENTENCE_RE.finditer(text) if _CLAIM_RE.search(sentence.group()))
 
 
-def _should_force_rag(user_msg: str) -> bool:
+def _classify(user_msg: str) -> frozenset[str]:
+    """Return the keyword buckets ("force", "fresh", "apple") mentioned in the message."""
     lowered = user_msg.lower()
-    return any(keyword in lowered for keyword in FORCE_RAG_KEYWORDS)
+    return frozenset(tag for tag, pattern in _KEYWORD_PATTERNS if pattern.search(lowered))
 
 
 def _is_short_query(user_msg: str) -> bool:
     return len(user_msg.split()) < 8
 
 
-def _needs_fresh_results(user_msg: str) -> bool:
-    lowered = user_msg.lower()
-    return any(hint in lowered for hint in FRESHNESS_HINTS)
-
-
 def _mentions_apple(user_msg: str) -> bool:
-    lowered = user_msg.lower()
-    return "apple" in lowered or "aapl" in lowered or "app store" in lowered
+    return "apple" in _classify(user_msg)
 
 
-def _expand_queries(base_queries: List[str], user_msg: str) -> List[str]:
-    seen: set[str] = set()
-    expanded: List[str] = []
+def _expand_queries(base_queries: List[str], user_msg: str, mentions_apple: Optional[bool] = None) -> List[str]:
+    # Keyed by the lowered query so the first spelling of each query wins, in order.
+    expanded: Dict[str, str] = {}
     for query in base_queries:
-        if not query:
-            continue
-        normalized = query.strip()
-        if not normalized:
-            continue
-        lowered = normalized.lower()
-        if lowered in seen:
-            continue
-        seen.add(lowered)
-        expanded.append(normalized)
-    if _mentions_apple(user_msg):
-        for term in APPLE_QUERY_TERMS:
-            lowered = term.lower()
-            if lowered not in seen:
-                expanded.append(term)
-                seen.add(lowered)
-    return expanded or [user_msg]
+        normalized = query.strip() if query else ""
+        if normalized:
+            expanded.setdefault(normalized.lower(), normalized)
+    if mentions_apple is None:
+        mentions_apple = _mentions_apple(user_msg)
+    if mentions_apple:
+        for lowered, term in _APPLE_QUERY_PAIRS:
+            expanded.setdefault(lowered, term)
+    expanded_queries = list(expanded.values())
+    # Bound retrieval fan-out; Apple expansion alone adds 14 terms.
+    return expanded_queries[: settings.max_rag_rewrites] or [user_msg]
+
+
+_Prefetch = tuple[List[str], "asyncio.Task[List[Dict[str, Any]]]"]
+
+
+async def _search_with_prefetch(rewrites: List[str], top_k: int, prefetch: Optional[_Prefetch]) -> List[Dict[str, Any]]:
+    """Search ``rewrites``, reusing results of a speculative search started before planning."""
+    if prefetch is None:
+        return await hybrid_search(rewrites, top_k=top_k)
+    prefetched_queries, task = prefetch
+    # A failed prefetch fails the search; retrying here would only double latency while RAG is down.
+    prefetched = await task
+    covered = set(prefetched_queries)
+    missing = [query for query in rewrites if query not in covered]
+    if not missing and covered.issubset(rewrites):
+        return prefetched
+    wanted = set(rewrites)
+    kept = [hit for hit in prefetched if hit.get("_query") in wanted]
+    return kept + (await hybrid_search(missing, top_k=top_k) if missing else [])
 
 
 def _filter_short_chunks(hits: List[Dict[str, Any]], min_chars: int = RAG_MIN_CHARS) -> List[Dict[str, Any]]:
@@ -136,37 +180,46 @@ def _filter_short_chunks(hits: List[Dict[str, Any]], min_chars: int = RAG_MIN_CH
     return filtered
 
 
+@lru_cache(maxsize=8192)
+def _parse_iso(value: str) -> Optional[datetime]:
+    # The same corpus dates come back on every query (and twice per query), so parse each string once.
+    cleaned = value.strip()
+    if not cleaned:
+        return None
+    try:
+        parsed = datetime.fromisoformat(cleaned.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
 def _parse_doc_date(metadata: Dict[str, Any]) -> Optional[datetime]:
     for key in ("date", "published_at", "published", "timestamp"):
         value = metadata.get(key)
-        if not isinstance(value, str):
-            continue
-        cleaned = value.strip()
-        if not cleaned:
-            continue
-        normalized = cleaned.replace("Z", "+00:00")
-        try:
-            parsed = datetime.fromisoformat(normalized)
-        except ValueError:
-            continue
-        if parsed.tzinfo is None:
-            parsed = parsed.replace(tzinfo=timezone.utc)
-        return parsed
+        if isinstance(value, str):
+            parsed = _parse_iso(value)
+            if parsed is not None:
+                return parsed
     return None
 
 
-def _apply_freshness_bias(hits: List[Dict[str, Any]], bias_recent: bool) -> List[Dict[str, Any]]:
+def _freshness_biased_score(facts: _HitFacts) -> float:
+    bonus = 0.05 if facts.doc_date and facts.doc_date >= DATE_BIAS_START else 0.0
+    return facts.score + bonus
+
+
+def _apply_freshness_bias(
+    hits: List[Dict[str, Any]],
+    bias_recent: bool,
+    facts: Optional[Dict[int, _HitFacts]] = None,
+) -> List[Dict[str, Any]]:
     if not bias_recent:
         return hits
-    scored: List[tuple[float, Dict[str, Any]]] = []
-    for hit in hits:
-        base_score = float(hit.get("score") or 0.0)
-        metadata = hit.get("metadata") or {}
-        doc_date = _parse_doc_date(metadata)
-        bonus = 0.05 if doc_date and doc_date >= DATE_BIAS_START else 0.0
-        scored.append((base_score + bonus, hit))
-    scored.sort(key=lambda item: item[0], reverse=True)
-    return [item[1] for item in scored]
+    facts = facts or _enrich_hits(hits)
+    # Sort the hits directly by key (stable, like the old tuple sort) instead of building and unpacking pairs.
+    return sorted(hits, key=lambda hit: _freshness_biased_score(facts[id(hit)]), reverse=True)
 
 
 def _describe_title(hit: Dict[str, Any]) -> str:
@@ -181,6 +234,27 @@ def _describe_title(hit: Dict[str, Any]) -> str:
     return str(hit.get("doc_id") or hit.get("chunk_id") or "unknown")
 
 
+class _HitFacts(NamedTuple):
+    title: str
+    outlet: str
+    doc_date: Optional[datetime]
+    score: float
+
+
+def _enrich_hits(hits: Sequence[Dict[str, Any]]) -> Dict[int, _HitFacts]:
+    """Scan each hit's metadata once; keyed by id() so the hit dicts handed to synthesis stay untouched."""
+    facts: Dict[int, _HitFacts] = {}
+    for hit in hits:
+        metadata = hit.get("metadata") or {}
+        facts[id(hit)] = _HitFacts(
+            title=_describe_title(hit),
+            outlet=str(metadata.get("source") or metadata.get("publisher") or metadata.get("outlet") or "").strip().lower(),
+            doc_date=_parse_doc_date(metadata),
+            score=float(hit.get("score") or 0.0),
+        )
+    return facts
+
+
 def _doc_identifier(hit: Dict[str, Any]) -> Optional[str]:
     doc_id = hit.get("doc_id")
     chunk_id = hit.get("chunk_id")
@@ -191,46 +265,101 @@ def _doc_identifier(hit: Dict[str, Any]) -> Optional[str]:
     return None
 
 
-def _deduplicate_hits(hits: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+@lru_cache(maxsize=8192)
+def _simhash(text: str) -> int:
+    """64-bit SimHash over word-pair shingles; changing a single word moves several bits."""
+    words = _WORD_RE.findall(text.lower())
+    width = SIMHASH_SHINGLE_WORDS
+    shingles = {" ".join(words[i : i + width]) for i in range(max(1, len(words) - width + 1))}
+    # Bit-sliced counters: planes[k] holds bit k of every position's count of set bits, so adding a shingle
+    # is a short carry chain over whole 64-bit words rather than a loop over the 64 positions.
+    planes: List[int] = []
+    for shingle in shingles:
+        carry = int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+        for k, plane in enumerate(planes):
+            planes[k] = plane ^ carry
+            carry &= plane
+            if not carry:
+                break
+        if carry:
+            planes.append(carry)
+    half = len(shingles) // 2
+    signature = 0
+    for bit in range(64):
+        if sum((plane >> bit & 1) << k for k, plane in enumerate(planes)) > half:
+            signature |= 1 << bit
+    return signature
+
+
+def _title_terms(title: str) -> frozenset[str]:
+    # A trailing "s" is dropped so "beats"/"beat" and "earnings"/"earning" compare equal.
+    return frozenset(word[:-1] if len(word) > 3 and word.endswith("s") else word for word in _WORD_RE.findall(title))
+
+
+def _deduplicate_hits(
+    hits: List[Dict[str, Any]],
+    facts: Optional[Dict[int, _HitFacts]] = None,
+) -> List[Dict[str, Any]]:
+    facts = facts or _enrich_hits(hits)
     seen: set[tuple[str, str, str]] = set()
+    # (title terms, lead signature) per (outlet, day), so near-duplicate comparisons stay within a small bucket.
+    signatures: Dict[tuple[str, str], List[tuple[frozenset[str], int]]] = {}
     unique: List[Dict[str, Any]] = []
     for hit in hits:
-        metadata = hit.get("metadata") or {}
-        outlet = str(metadata.get("source") or metadata.get("publisher") or metadata.get("outlet") or "").strip().lower()
-        title = _describe_title(hit).strip().lower()
-        doc_date = _parse_doc_date(metadata) or None
-        date_key = doc_date.date().isoformat() if doc_date else ""
+        hit_facts = facts[id(hit)]
+        outlet = hit_facts.outlet
+        title = hit_facts.title.lower()
+        date_key = hit_facts.doc_date.date().isoformat() if hit_facts.doc_date else ""
         dedupe_key = (outlet, date_key, title or str(hit.get("chunk_id")))
         if dedupe_key in seen:
             continue
+        bucket = signatures.setdefault((outlet, date_key), [])
+        # Near-duplicate matching targets syndicated news; documents without an outlet (exports, reports)
+        # often share a template, so those only collapse on an exact title.
+        signature = None
+        if outlet:
+            text = hit.get("text")
+            lead = text[:SIMHASH_TEXT_CHARS] if isinstance(text, str) and text.strip() else title
+            if lead.strip():
+                signature = (_title_terms(title), _simhash(lead))
+        # Same-template headlines ("Apple stock rises" / "Apple stock falls") differ in a term on both sides,
+        # so they are never merged however close their leads are.
+        if signature is not None and any(
+            (terms <= signature[0] or signature[0] <= terms)
+            and (signature[1] ^ other).bit_count() <= SIMHASH_MAX_DISTANCE
+            for terms, other in bucket
+        ):
+            continue
         seen.add(dedupe_key)
+        if signature is not None:
+            bucket.append(signature)
         unique.append(hit)
     return unique
 
 
+_META_NAME_KEYS = ("file_name", "filename", "original_basename", "title", "doc_title", "name")
+_META_PATH_KEYS = ("path", "raw_path", "raw_uri", "rawKey", "raw_key", "object", "object_key")
+_DOC_PATH_KEYS = ("path", "raw_path", "raw_uri", "s3_path", "uri", "url", "object", "object_key")
+
+
+def _first_string(source: Dict[str, Any], keys: Sequence[str]) -> Optional[str]:
+    return next(
+        (value for key in keys if isinstance(value := source.get(key), str) and (value := value.strip())),
+        None,
+    )
+
+
 def _pick_metadata_string(metadata: Dict[str, Any], keys: Sequence[str]) -> Optional[str]:
-    for key in keys:
-        value = metadata.get(key)
-        if isinstance(value, str):
-            candidate = value.strip()
-            if candidate:
-                return candidate
-    nested = metadata.get("user_metadata")
-    if isinstance(nested, dict):
-        for key in keys:
-            value = nested.get(key)
-            if isinstance(value, str):
-                candidate = value.strip()
-                if candidate:
-                    return candidate
-    return None
+    found = _first_string(metadata, keys)
+    if found is None:
+        nested = metadata.get("user_metadata")
+        if isinstance(nested, dict):
+            found = _first_string(nested, keys)
+    return found
 
 
 def _resolve_meta_file_name(metadata: Dict[str, Any], fallback: str) -> str:
-    name = _pick_metadata_string(
-        metadata,
-        ("file_name", "filename", "original_basename", "title", "doc_title", "name"),
-    )
+    name = _pick_metadata_string(metadata, _META_NAME_KEYS)
     if name:
         return name
     source = metadata.get("source")
@@ -240,82 +369,69 @@ def _resolve_meta_file_name(metadata: Dict[str, Any], fallback: str) -> str:
 
 
 def _resolve_meta_path(metadata: Dict[str, Any], doc: Optional[Dict[str, Any]] = None) -> Optional[str]:
-    path = _pick_metadata_string(
-        metadata,
-        ("path", "raw_path", "raw_uri", "rawKey", "raw_key", "object", "object_key"),
-    )
+    path = _pick_metadata_string(metadata, _META_PATH_KEYS)
     if path:
         return path
-    if doc:
-        for key in ("path", "raw_path", "raw_uri", "s3_path", "uri", "url", "object", "object_key"):
-            value = doc.get(key) if isinstance(doc, dict) else None
-            if isinstance(value, str):
-                candidate = value.strip()
-                if candidate:
-                    return candidate
+    if isinstance(doc, dict):
+        return _first_string(doc, _DOC_PATH_KEYS)
     return None
 
 
+def _citation_entry(doc_id: str, doc: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    metadata = doc.get("metadata")
+    if not isinstance(metadata, dict):
+        metadata = {}
+    path = _resolve_meta_path(metadata, doc)
+    if not path:
+        return None
+    entry: Dict[str, Any] = {"id": doc_id, "file_name": _resolve_meta_file_name(metadata, doc_id), "path": path}
+    score = doc.get("score")
+    if not isinstance(score, (int, float)):
+        for key in ("rerank_score", "score_vector", "score_bm25"):
+            alt = doc.get(key)
+            if isinstance(alt, (int, float)):
+                score = alt
+                break
+    if isinstance(score, (int, float)):
+        entry["score"] = round(float(score), 3)
+    return entry
+
+
 def _build_citation_meta(final_citations: Sequence[Dict[str, str]], docs: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
     if not docs:
         return []
-    lookup: Dict[str, Dict[str, Any]] = {}
-    insertion_order: List[str] = []
+    # Resolve each retrieved doc once; the citation pass and the fallback both read from this map.
+    entries_by_id: Dict[str, Optional[Dict[str, Any]]] = {}
     for doc in docs:
         doc_id = str(doc.get("doc_id") or doc.get("chunk_id") or "").strip()
-        if not doc_id or doc_id in lookup:
-            continue
-        lookup[doc_id] = doc
-        insertion_order.append(doc_id)
+        if doc_id and doc_id not in entries_by_id:
+            entries_by_id[doc_id] = _citation_entry(doc_id, doc)
     entries: List[Dict[str, Any]] = []
     seen: set[str] = set()
     for citation in final_citations:
         cid = str(citation.get("id") or "").strip()
-        if not cid or cid in seen or cid not in lookup:
+        entry = entries_by_id.get(cid)
+        if entry is None or cid in seen:
             continue
-        doc = lookup[cid]
-        metadata = doc.get("metadata") or {}
-        path = _resolve_meta_path(metadata if isinstance(metadata, dict) else {}, doc)
-        if not path:
-            continue
-        file_name = _resolve_meta_file_name(metadata if isinstance(metadata, dict) else {}, cid)
-        entry: Dict[str, Any] = {"id": cid, "file_name": file_name, "path": path}
-        score = doc.get("score") if isinstance(doc, dict) else None
-        if not isinstance(score, (int, float)):
-            for key in ("rerank_score", "score_vector", "score_bm25"):
-                alt = doc.get(key) if isinstance(doc, dict) else None
-                if isinstance(alt, (int, float)):
-                    score = alt
-                    break
-        if isinstance(score, (int, float)):
-            entry["score"] = round(float(score), 3)
         entries.append(entry)
         seen.add(cid)
     if entries:
         return entries
     # Fallback: include the retrieved docs directly when the writer omitted structured citations.
-    for doc_id in insertion_order:
-        if doc_id in seen:
-            continue
-        doc = lookup[doc_id]
-        metadata = doc.get("metadata") or {}
-        path = _resolve_meta_path(metadata if isinstance(metadata, dict) else {}, doc)
-        if not path:
-            continue
-        file_name = _resolve_meta_file_name(metadata if isinstance(metadata, dict) else {}, doc_id)
-        entry = {"id": doc_id, "file_name": file_name, "path": path}
-        score = doc.get("score")
-        if not isinstance(score, (int, float)):
-            for key in ("rerank_score", "score_vector", "score_bm25"):
-                alt = doc.get(key)
-                if isinstance(alt, (int, float)):
-                    score = alt
-                    break
-        if isinstance(score, (int, float)):
-            entry["score"] = round(float(score), 3)
-        entries.append(entry)
-        seen.add(doc_id)
-    return entries
+    return [entry for entry in entries_by_id.values() if entry is not None]
+
+
+def _risk_signature(payload: Dict[str, Any]) -> str:
+    # Only keys the in-process simulation cache, so a fast 128-bit blake2b replaces sha256.
+    canonical: Optional[bytes] = None
+    if orjson is not None:
+        try:
+            canonical = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+        except TypeError:  # e.g. integers beyond 64 bits
+            canonical = None
+    if canonical is None:
+        canonical = json.dumps(payload, sort_keys=True).encode("utf-8")
+    return hashlib.blake2b(canonical, digest_size=16).hexdigest()
 
 
 def build_disclosure(rag_pack: Optional[Dict[str, Any]], risk_pack: Optional[Dict[str, Any]]) -> str:
@@ -396,71 +512,171 @@ def _build_insufficient_response(
     )
 
 
+_RESPONSE_CACHE_MAX = 1024
+_RESPONSE_CACHE: "OrderedDict[tuple[str, str], tuple[float, AssistantResponse]]" = OrderedDict()
+
+
+class _Flight:
+    """An answer shared by identical requests, with the number of requests still awaiting it."""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: "asyncio.Task[AssistantResponse]") -> None:
+        self.task = task
+        self.waiters = 0
+
+
+# Identical requests that arrive while the first is still being answered share its answer.
+_INFLIGHT: Dict[tuple[str, str], _Flight] = {}
+
+
+def _response_cache_key(thread_id: str, user_msg: str) -> tuple[str, str]:
+    return thread_id, hashlib.blake2b(user_msg.encode("utf-8"), digest_size=16).hexdigest()
+
+
+async def _answer_and_cache(key: tuple[str, str], thread_id: str, user_msg: str, meta: Dict[str, Any]) -> AssistantResponse:
+    response = await _answer_query(thread_id, user_msg, meta)
+    # Simulation output depends on the latest data version, so risk answers are always recomputed.
+    if not response.used.get("risk"):
+        _RESPONSE_CACHE[key] = (time.monotonic(), response)
+        _RESPONSE_CACHE.move_to_end(key)
+        while len(_RESPONSE_CACHE) > _RESPONSE_CACHE_MAX:
+            _RESPONSE_CACHE.popitem(last=False)
+    return response
+
+
+def _start_flight(key: tuple[str, str], call: Any) -> _Flight:
+    # The answer runs detached from the request that started it, so that request disconnecting does not
+    # cancel it for the duplicates waiting on it.
+    flight = _Flight(asyncio.create_task(call))
+
+    def _finished(task: "asyncio.Task[AssistantResponse]") -> None:
+        if _INFLIGHT.get(key) is flight:
+            del _INFLIGHT[key]
+        # Mark the outcome as retrieved so a failure nobody awaited is not logged as unhandled.
+        if not task.cancelled():
+            task.exception()
+
+    flight.task.add_done_callback(_finished)
+    _INFLIGHT[key] = flight
+    return flight
+
+
+async def _await_flight(key: tuple[str, str], flight: _Flight) -> AssistantResponse:
+    flight.waiters += 1
+    try:
+        return await asyncio.shield(flight.task)
+    finally:
+        flight.waiters -= 1
+        if flight.waiters == 0 and not flight.task.done():
+            # Every request waiting on the answer has gone away; stop it and let the next one start afresh.
+            if _INFLIGHT.get(key) is flight:
+                del _INFLIGHT[key]
+            flight.task.cancel()
+
+
 async def handle_query(thread_id: str, user_msg: str, meta: Dict[str, Any]) -> AssistantResponse:
+    # Clients retry the same message (double submit, reconnect); answer those from the last response, or
+    # from the one still being produced.
+    ttl = settings.response_cache_ttl_s
+    if ttl <= 0:
+        return await _answer_query(thread_id, user_msg, meta)
+    key = _response_cache_key(thread_id, user_msg)
+    cached = _RESPONSE_CACHE.get(key)
+    if cached is not None:
+        stored_at, cached_response = cached
+        if time.monotonic() - stored_at < ttl:
+            return cached_response.model_copy(deep=True)
+        del _RESPONSE_CACHE[key]
+    flight = _INFLIGHT.get(key) or _start_flight(key, _answer_and_cache(key, thread_id, user_msg, meta))
+    response = await _await_flight(key, flight)
+    # The shared answer is also the cached one; every caller gets its own copy.
+    return response.model_copy(deep=True)
+
+
+async def _answer_query(thread_id: str, user_msg: str, meta: Dict[str, Any]) -> AssistantResponse:
     t0 = time.time()
 
     short_ctx = memory.get_recent_window(thread_id, token_cap=settings.memory_short_cap_tokens)
     long_ctx = memory.retrieve_long_summary(thread_id)
     recalls = memory.vector_recall(thread_id, user_msg, top_k=5)
 
-    plan = await planner.plan(user_msg, short_ctx, long_ctx, recalls)
-    shape_hint = synthesis.infer_shape(user_msg)
-
-    rag_pack: Optional[Dict[str, Any]] = None
-    rag_conf = 0.0
-    rag_latency_ms = 0.0
-    rag_debug_payload: Optional[Dict[str, Any]] = None
-    router_metadata: Optional[Dict[str, Any]] = None
-    risk_pack: Optional[Dict[str, Any]] = None
-    risk_error: Optional[str] = None
-
-    telemetry: Dict[str, Any] = {
-        "plan": plan.model_dump(),
-        "rag_used": False,
-        "risk_used": False,
-        "meta": meta or {},
-    }
+    keyword_tags = _classify(user_msg)
+    force_rag = "force" in keyword_tags
+    top_k = 12 if _is_short_query(user_msg) else 10
+    # Keyword-forced queries will search regardless of the plan, so overlap that search with the planner call.
+    prefetch: Optional[_Prefetch] = None
+    if force_rag:
+        prefetch_queries = _expand_queries([user_msg], user_msg, mentions_apple="apple" in keyword_tags)
+        prefetch = (prefetch_queries, asyncio.create_task(hybrid_search(prefetch_queries, top_k=top_k)))
+
+    # Anything raising before the search awaits the prefetch must not leave it running unobserved.
+    try:
+        plan = await planner.plan(user_msg, short_ctx, long_ctx, recalls)
+        shape_hint = synthesis.infer_shape(user_msg)
+
+        rag_pack: Optional[Dict[str, Any]] = None
+        rag_conf = 0.0
+        rag_latency_ms = 0.0
+        rag_debug_payload: Optional[Dict[str, Any]] = None
+        router_metadata: Optional[Dict[str, Any]] = None
+        risk_pack: Optional[Dict[str, Any]] = None
+        risk_error: Optional[str] = None
+
+        telemetry: Dict[str, Any] = {
+            # Kept as the model; it is dumped once when the response is serialized.
+            "plan": plan,
+            "rag_used": False,
+            "risk_used": False,
+            "meta": meta or {},
+        }
 
-    force_rag = _should_force_rag(user_msg)
-    rag_required = plan.needRag or force_rag
-    telemetry["rag_required"] = rag_required
-    telemetry["rag_mode_forced"] = force_rag
+        rag_required = plan.needRag or force_rag
+        telemetry["rag_required"] = rag_required
+        telemetry["rag_mode_forced"] = force_rag
+
+        if rag_required:
+            rewrites = _expand_queries(plan.ragQueries or [user_msg], user_msg, mentions_apple="apple" in keyword_tags)
+            freshness_bias = "fresh" in keyword_tags
+            telemetry["rag_rewrites"] = rewrites
+            t_rag = time.time()
+            hits: List[Dict[str, Any]] = []
+            rag_failure: Optional[str] = None
+            try:
+                hits = await _search_with_prefetch(rewrites, top_k, prefetch)
+            except httpx.HTTPError as exc:
+                status_code = getattr(exc.response, "status_code", None)
+                rag_failure = "INDEX_NOT_READY" if status_code in {425, 429, 503} else "INDEX_NOT_READY"
+                rag_debug_payload = {"error": str(exc)}
+            except Exception as exc:  # pragma: no cover - defensive
+                rag_failure = "INDEX_NOT_READY"
+                rag_debug_payload = {"error": str(exc)}
+            finally:
+                rag_latency_ms = (time.time() - t_rag) * 1000
+    finally:
+        if prefetch is not None:
+            prefetch[1].cancel()
 
     if rag_required:
-        top_k = 12 if _is_short_query(user_msg) else 10
-        rewrites = _expand_queries(plan.ragQueries or [user_msg], user_msg)
-        freshness_bias = _needs_fresh_results(user_msg)
-        telemetry["rag_rewrites"] = rewrites
-        t_rag = time.time()
-        hits: List[Dict[str, Any]] = []
-        rag_failure: Optional[str] = None
-        try:
-            hits = await hybrid_search(rewrites, top_k=top_k)
-        except httpx.HTTPError as exc:
-            status_code = getattr(exc.response, "status_code", None)
-            rag_failure = "INDEX_NOT_READY" if status_code in {425, 429, 503} else "INDEX_NOT_READY"
-            rag_debug_payload = {"error": str(exc)}
-        except Exception as exc:  # pragma: no cover - defensive
-            rag_failure = "INDEX_NOT_READY"
-            rag_debug_payload = {"error": str(exc)}
-        finally:
-            rag_latency_ms = (time.time() - t_rag) * 1000
-
         if not rag_failure:
             filtered_hits = _filter_short_chunks(hits, RAG_MIN_CHARS)
-            rerank_k = max(top_k, settings.max_context_chunks)
+            # Dedup runs on the ranked list (it keeps the first of each duplicate group), so over-fetch
+            # enough ranked hits that the context window is still full once duplicates are dropped.
+            rerank_k = max(top_k, settings.max_context_chunks * RERANK_DEDUP_HEADROOM)
             re_ranked = rerank(filtered_hits, k=rerank_k)
-            re_ranked = _apply_freshness_bias(re_ranked, freshness_bias)
-            deduped_hits = _deduplicate_hits(re_ranked)
-            rag_conf = estimate_confidence(deduped_hits)
-            max_score = max((float(hit.get("score") or 0.0) for hit in deduped_hits), default=0.0)
+            hit_facts = _enrich_hits(re_ranked)
+            re_ranked = _apply_freshness_bias(re_ranked, freshness_bias, hit_facts)
+            deduped_hits = _deduplicate_hits(re_ranked, hit_facts)
+            # One pass over the deduped hits for confidence inputs, max score and qualifying doc ids.
+            scores: List[float] = []
             high_quality_ids: List[str] = []
             for hit in deduped_hits:
-                score = float(hit.get("score") or 0.0)
-                if score >= RAG_SCORE_THRESHOLD:
-                    identifier = _doc_identifier(hit)
-                    if identifier:
-                        high_quality_ids.append(identifier)
+                score = hit_facts[id(hit)].score
+                scores.append(score)
+                if score >= RAG_SCORE_THRESHOLD and (identifier := _doc_identifier(hit)):
+                    high_quality_ids.append(identifier)
+            rag_conf = estimate_confidence_from_scores(scores)
+            max_score = max(scores, default=0.0)
             distinct_doc_ids = list(dict.fromkeys(high_quality_ids))
             doc_count = len(distinct_doc_ids)
             router_metadata = {
@@ -485,8 +701,8 @@ async def handle_query(thread_id: str, user_msg: str, meta: Dict[str, Any]) -> A
             else:
                 rag_failure = "NO_MATCHES" if not deduped_hits else "LOW_CONFIDENCE"
                 rag_debug_payload = {
-                    "top_scores": [round(float(hit.get("score") or 0.0), 3) for hit in deduped_hits[:3]],
-                    "matched_titles": [_describe_title(hit) for hit in deduped_hits[:3]],
+                    "top_scores": [round(score, 3) for score in scores[:3]],
+                    "matched_titles": [hit_facts[id(hit)].title for hit in deduped_hits[:3]],
                     "corpus_status_hint": rag_failure,
                 }
 
@@ -534,7 +750,7 @@ async def handle_query(thread_id: str, user_msg: str, meta: Dict[str, Any]) -> A
         else:
             data_version = current_data_version()
             signature_payload = {"spec": risk_spec, "v": data_version}
-            signature = hashlib.sha256(json.dumps(signature_payload, sort_keys=True).encode("utf-8")).hexdigest()
+            signature = _risk_signature(signature_payload)
             cached = risk_read(signature)
             cache_hit = False
             sim_result: Optional[Dict[str, Any]] = None
@@ -587,7 +803,10 @@ async def handle_query(thread_id: str, user_msg: str, meta: Dict[str, Any]) -> A
         rag_template=bool(rag_pack),
     )
 
-    if rag_pack and count_factual_claims(final.text) > 2 and len(final.citations or []) < 2:
+    # Claims only matter for RAG answers; count them once for both the evidence gate and citation accounting.
+    # The acknowledged draft has no citations, so its miss rate is 1.0 whatever the recount would be.
+    claim_count = count_factual_claims(final.text) if rag_pack else 0
+    if rag_pack and claim_count > 2 and len(final.citations or []) < 2:
         final = synthesis.acknowledge_low_evidence(final)
 
     memory.append_turn(thread_id, user=user_msg, assistant=final.text)
@@ -600,7 +819,7 @@ async def handle_query(thread_id: str, user_msg: str, meta: Dict[str, Any]) -> A
 
     doc_ids = [cite["id"] for cite in final.citations]
     citation_count = len(final.citations)
-    claims = max(1, count_factual_claims(final.text))
+    claims = max(1, claim_count)
     expected_citations = max(1, min(claims, len((rag_pack or {}).get("docs", []))))
     citation_miss_rate = (
         0.0 if not rag_pack else max(0.0, 1.0 - (citation_count / expected_citations if expected_citations else 1.0))
@@ -0,0 +1,28 @@
+"""Named, lazily created HTTP clients shared by the orchestrator's service helpers."""
+
+from __future__ import annotations
+
+from typing import Dict
+
+import httpx
+
+_clients: Dict[str, httpx.AsyncClient] = {}
+
+
+def get_client(name: str, timeout: float, max_connections: int = 64) -> httpx.AsyncClient:
+    """Return the pooled client for ``name``, created on first use so it binds to the serving event loop."""
+    client = _clients.get(name)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(max_keepalive_connections=max_connections // 2, max_connections=max_connections),
+        )
+        _clients[name] = client
+    return client
+
+
+async def aclose_all() -> None:
+    clients = list(_clients.values())
+    _clients.clear()
+    for client in clients:
+        await client.aclose()
@@ -4,8 +4,12 @@ from __future__ import annotations
 
 from typing import Any, Dict
 
-import httpx
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional fast JSON decoder
+    orjson = None
 
+from http_pool import get_client
 from settings import get_settings
 
 settings = get_settings()
@@ -14,10 +18,9 @@ settings = get_settings()
 async def complete(payload: Dict[str, Any]) -> Dict[str, Any]:
     """Send a completion request to the configured LLM API."""
     url = f"{settings.llm_url.rstrip('/')}/v1/complete"
-    async with httpx.AsyncClient(timeout=settings.llm_request_timeout_s) as client:
-        response = await client.post(url, json=payload)
-        response.raise_for_status()
-        data = response.json()
-        if not isinstance(data, dict):
-            raise RuntimeError("LLM API returned malformed payload")
-        return data
+    response = await get_client("llm", settings.llm_request_timeout_s).post(url, json=payload)
+    response.raise_for_status()
+    data = orjson.loads(response.content) if orjson else response.json()
+    if not isinstance(data, dict):
+        raise RuntimeError("LLM API returned malformed payload")
+    return data
@@ -5,9 +5,11 @@ from __future__ import annotations
 from typing import Any, Dict, Optional
 
 from fastapi import FastAPI, HTTPException, status
+from fastapi.responses import Response
 from pydantic import BaseModel, Field, model_validator
 from prometheus_fastapi_instrumentator import Instrumentator
 
+import http_pool
 from handler import handle_query
 from schemas import AssistantResponse
 from settings import get_settings
@@ -29,12 +31,19 @@ class QueryRequest(BaseModel):
         return self
 
 
+@app.on_event("shutdown")
+async def _close_http_clients() -> None:
+    await http_pool.aclose_all()
+
+
 @app.post("/v1/query", response_model=AssistantResponse)
-async def orchestrate(request: QueryRequest) -> AssistantResponse:
+async def orchestrate(request: QueryRequest) -> Response:
     if not request.message:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="message is required")
     thread_id = request.thread_id or "default"
-    return await handle_query(thread_id, request.message, request.meta)
+    response = await handle_query(thread_id, request.message, request.meta)
+    # handle_query already built a validated model; serialize it once instead of letting FastAPI re-validate it.
+    return Response(content=response.model_dump_json(), media_type="application/json")
 
 
 @app.get("/health")
@@ -4,8 +4,8 @@ from __future__ import annotations
 
 import threading
 from collections import deque
-from dataclasses import dataclass
-from typing import Deque, Dict, List, Tuple
+from dataclasses import dataclass, field
+from typing import Deque, Dict, FrozenSet, List, Tuple
 
 
 def approx_token_len(text: str | None) -> int:
@@ -15,11 +15,17 @@ def approx_token_len(text: str | None) -> int:
     return max(1, len(text.strip().split()))
 
 
+def _recall_tokens(text: str) -> FrozenSet[str]:
+    return frozenset(token.lower() for token in text.split())
+
+
 @dataclass
 class MemoryTurn:
     user: str
     assistant: str
     tokens: int
+    # Lowercased token set of "user assistant", built once so recall does not re-tokenize every turn.
+    recall_tokens: FrozenSet[str] = field(default_factory=frozenset, repr=False)
 
 
 class MemoryStore:
@@ -65,16 +71,17 @@ class MemoryStore:
         turns = self._turns.get(thread_id)
         if not turns:
             return []
-        query_tokens = set(token.lower() for token in query.split())
+        query_tokens = _recall_tokens(query)
+        query_size = len(query_tokens)
         scored: List[Tuple[float, MemoryTurn]] = []
         for turn in turns:
-            haystack = f"{turn.user} {turn.assistant}"
-            hay_tokens = set(token.lower() for token in haystack.split())
+            hay_tokens = turn.recall_tokens
             if not hay_tokens:
                 continue
             overlap = len(query_tokens & hay_tokens)
-            union = len(query_tokens | hay_tokens) or 1
-            score = overlap / union
+            if not overlap:
+                continue
+            score = overlap / (query_size + len(hay_tokens) - overlap)
             if score > 0:
                 scored.append((score, turn))
         scored.sort(key=lambda item: item[0], reverse=True)
@@ -87,7 +94,14 @@ class MemoryStore:
         with self._lock_for(thread_id):
             turns = self._turns.setdefault(thread_id, deque(maxlen=40))
             tokens = approx_token_len(user) + approx_token_len(assistant)
-            turns.append(MemoryTurn(user=user, assistant=assistant, tokens=tokens))
+            turns.append(
+                MemoryTurn(
+                    user=user,
+                    assistant=assistant,
+                    tokens=tokens,
+                    recall_tokens=_recall_tokens(f"{user} {assistant}"),
+                )
+            )
             self._turn_counters[thread_id] = self._turn_counters.get(thread_id, 0) + 1
 
     def maybe_update_long_summary(self, thread_id: str, summary_every: int = 6, cap_chars: int = 1200) -> bool:
@@ -2,9 +2,12 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
 import re
+import time
+from collections import OrderedDict
 from typing import Any, Dict, Sequence
 
 from pydantic import ValidationError
@@ -34,6 +37,29 @@ SIM_KEYWORDS = (
 )
 
 
+_PLAN_CACHE_MAX = 512
+_PLAN_CACHE: "OrderedDict[str, tuple[float, Plan]]" = OrderedDict()
+
+
+def _cached_plan(key: str) -> Plan | None:
+    cached = _PLAN_CACHE.get(key)
+    if cached is None:
+        return None
+    stored_at, cached_plan = cached
+    if time.monotonic() - stored_at >= settings.plan_cache_ttl_s:
+        del _PLAN_CACHE[key]
+        return None
+    _PLAN_CACHE.move_to_end(key)
+    return cached_plan.model_copy(deep=True)
+
+
+def _store_plan(key: str, plan: Plan) -> None:
+    _PLAN_CACHE[key] = (time.monotonic(), plan.model_copy(deep=True))
+    _PLAN_CACHE.move_to_end(key)
+    while len(_PLAN_CACHE) > _PLAN_CACHE_MAX:
+        _PLAN_CACHE.popitem(last=False)
+
+
 def _default_plan() -> Plan:
     return Plan(needRag=False, needRisk=False, ragQueries=[], riskSpec=None, expected=["summary"], confidence=0.0)
 
@@ -95,6 +121,13 @@ async def plan(user_msg: str, short_ctx: str, long_ctx: str, recalls: Sequence[D
         "profile": profile_name,
         "answer_format": "custom",
     }
+    # The planner runs at temperature 0, so an identical prompt yields the same plan; skip the LLM round trip.
+    cache_key = ""
+    if settings.plan_cache_ttl_s > 0:
+        cache_key = hashlib.blake2b(f"{profile_name}\0{context_block}".encode("utf-8"), digest_size=16).hexdigest()
+        cached = _cached_plan(cache_key)
+        if cached is not None:
+            return cached
     try:
         data = await complete(payload)
         raw_text = str(data.get("text") or "").strip()
@@ -105,6 +138,8 @@ async def plan(user_msg: str, short_ctx: str, long_ctx: str, recalls: Sequence[D
             plan.needRisk = False
         if force_risk:
             plan.needRisk = True
+        if cache_key:
+            _store_plan(cache_key, plan)
         return plan
     except (ValidationError, json.JSONDecodeError) as exc:
         logger.warning("Planner JSON parse failed: %s", exc)
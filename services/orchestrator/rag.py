@@ -2,33 +2,83 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, Iterable, List
-
-import httpx
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Iterable, List, Optional
 
+from http_pool import get_client
 from settings import get_settings
 
 settings = get_settings()
+logger = logging.getLogger("uvicorn.error")
+# Caps in-flight retrievals across all requests below the pool size, so bursts queue here rather than
+# failing with httpx.PoolTimeout.
+_retrieve_slots = asyncio.Semaphore(settings.rag_max_concurrency)
+# Set when the RAG service answers 404/405 (it predates /v1/retrieve/batch); the batch endpoint is tried
+# again once this monotonic deadline passes, so a redeployed service is picked up without a restart.
+_BATCH_RETRY_S = 300.0
+_batch_retry_at = 0.0
+# The RAG service rejects batches above this size.
+_BATCH_MAX_QUERIES = 32
 
 
 async def _retrieve(query: str, top_k: int) -> Dict[str, Any]:
     url = f"{settings.rag_url.rstrip('/')}/v1/retrieve"
     payload = {"query": query, "top_k": top_k}
-    async with httpx.AsyncClient(timeout=settings.request_timeout_s) as client:
-        response = await client.post(url, json=payload)
-        response.raise_for_status()
-        data = response.json()
-        if not isinstance(data, dict):
-            raise RuntimeError("RAG response payload must be a JSON object.")
-        return data
+    async with _retrieve_slots:
+        response = await get_client("rag", settings.request_timeout_s).post(url, json=payload)
+    response.raise_for_status()
+    data = response.json()
+    if not isinstance(data, dict):
+        raise RuntimeError("RAG response payload must be a JSON object.")
+    return data
+
+
+async def _retrieve_batch(queries: List[str], top_k: int) -> Optional[List[Any]]:
+    """Send all rewrites in one request; None means the service has no batch endpoint."""
+    global _batch_retry_at
+    url = f"{settings.rag_url.rstrip('/')}/v1/retrieve/batch"
+    payload = {"queries": queries, "top_k": top_k}
+    async with _retrieve_slots:
+        response = await get_client("rag", settings.request_timeout_s).post(url, json=payload)
+    if response.status_code in (404, 405):
+        _batch_retry_at = time.monotonic() + _BATCH_RETRY_S
+        return None
+    response.raise_for_status()
+    data = response.json()
+    results = data.get("results") if isinstance(data, dict) else None
+    if not isinstance(results, list) or len(results) != len(queries):
+        raise RuntimeError("RAG batch response must carry one result per query.")
+    return [_batch_result(result) for result in results]
+
+
+def _batch_result(result: Any) -> Any:
+    # Failed queries come back as exceptions, the same shape asyncio.gather(return_exceptions=True) gives.
+    if not isinstance(result, dict):
+        return RuntimeError("RAG response payload must be a JSON object.")
+    if result.get("error"):
+        return RuntimeError(str(result["error"]))
+    return result
 
 
 async def hybrid_search(queries: Iterable[str], top_k: int = 8) -> List[Dict[str, Any]]:
+    active = [query for query in queries if query]
+    results: Optional[List[Any]] = None
+    if 1 < len(active) <= _BATCH_MAX_QUERIES and time.monotonic() >= _batch_retry_at:
+        results = await _retrieve_batch(active, top_k)
+    if results is None:
+        # Rewrites are independent, so retrieve them concurrently; results keep the query order.
+        results = await asyncio.gather(*(_retrieve(query, top_k) for query in active), return_exceptions=True)
+    failures = [result for result in results if isinstance(result, BaseException)]
+    # One failed rewrite should not discard the others; only fail the search when nothing came back.
+    if failures and len(failures) == len(results):
+        raise failures[0]
     hits: List[Dict[str, Any]] = []
-    for query in queries:
-        if not query:
+    for query, data in zip(active, results):
+        if isinstance(data, BaseException):
+            logger.warning("RAG retrieval failed for rewrite %r: %s", query, data)
             continue
-        data = await _retrieve(query, top_k)
         chunks = data.get("chunks") or []
         for chunk in chunks:
             if isinstance(chunk, dict):
@@ -47,11 +97,10 @@ def rerank(hits: Iterable[Dict[str, Any]], k: int = 5) -> List[Dict[str, Any]]:
     return scored[:k]
 
 
-def estimate_confidence(hits: Iterable[Dict[str, Any]]) -> float:
+def estimate_confidence_from_scores(scores: Iterable[float]) -> float:
     top_score = 0.0
     second_score = 0.0
-    for hit in hits:
-        score = float(hit.get("score") or 0.0)
+    for score in scores:
         if score > top_score:
             second_score = top_score
             top_score = score
@@ -9,6 +9,7 @@ from typing import Any, Dict, Optional
 
 import httpx
 
+from http_pool import get_client
 from settings import get_settings
 
 settings = get_settings()
@@ -109,10 +110,9 @@ async def run(spec: Dict[str, Any]) -> Dict[str, Any]:
 
     url = f"{settings.sim_url.rstrip('/')}/v1/run"
     try:
-        async with httpx.AsyncClient(timeout=settings.request_timeout_s) as client:
-            response = await client.post(url, json=payload)
-            response.raise_for_status()
-            data = response.json()
+        response = await get_client("risk", settings.request_timeout_s, max_connections=32).post(url, json=payload)
+        response.raise_for_status()
+        data = response.json()
     except httpx.HTTPError as exc:
         status_code = getattr(exc.response, "status_code", None)
         logger.error("Simulation HTTP error (status=%s): %s", status_code, exc)
@@ -28,6 +28,10 @@ class Settings(BaseSettings):
     llm_request_timeout_s: float = Field(default=45.0)
     default_top_k: int = Field(default=5, gt=0)
     max_context_chunks: int = Field(default=5, gt=0)
+    max_rag_rewrites: int = Field(default=8, gt=0)
+    rag_max_concurrency: int = Field(default=32, gt=0)
+    response_cache_ttl_s: float = Field(default=30.0, ge=0.0)
+    plan_cache_ttl_s: float = Field(default=300.0, ge=0.0)
     excerpt_chars: int = Field(default=320, gt=40)
     classifier_temperature: float = Field(default=0.1, ge=0.0, le=1.0)
     classifier_top_p: float = Field(default=0.9, gt=0.0, le=1.0)
@@ -119,6 +123,10 @@ def get_settings() -> Settings:
         llm_request_timeout_s=_coerce_float("LLM_REQUEST_TIMEOUT_S", 45.0),
         default_top_k=_coerce_int("DEFAULT_TOP_K", 5),
         max_context_chunks=_coerce_int("LLM_MAX_CONTEXT_CHUNKS", 5),
+        max_rag_rewrites=_coerce_int("MAX_RAG_REWRITES", 8),
+        rag_max_concurrency=_coerce_int("RAG_MAX_CONCURRENCY", 32),
+        response_cache_ttl_s=_coerce_float("RESPONSE_CACHE_TTL_S", 30.0),
+        plan_cache_ttl_s=_coerce_float("PLAN_CACHE_TTL_S", 300.0),
         excerpt_chars=_coerce_int("ANSWER_EXCERPT_CHARS", 320),
         classifier_temperature=_coerce_float("CLASSIFIER_TEMPERATURE", 0.1),
         classifier_top_p=_coerce_float("CLASSIFIER_TOP_P", 0.9),
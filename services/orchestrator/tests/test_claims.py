@@ -0,0 +1,36 @@
+import re
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[3]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from services.orchestrator import handler
+
+
+def _split_and_scan(text: str) -> int:
+    # The per-sentence split the precompiled scan replaced.
+    sentences = [segment.strip() for segment in re.split(r"[.!?]", text) if segment.strip()]
+    keywords = ("percent", "increase", "decrease", "roi", "margin")
+    return sum(1 for sentence in sentences if re.search(r"\d", sentence) or any(k in sentence.lower() for k in keywords))
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "",
+        "No figures here.",
+        "Revenue grew 3.5% in Q4. Margins held! Did ROI Increase? Costs fell.",
+        "   .  ! ? ",
+        "Gross MARGIN widened\nOperating costs were flat",
+    ],
+)
+def test_claim_count_matches_the_sentence_split(text: str) -> None:
+    assert handler.count_factual_claims(text) == _split_and_scan(text)
+
+
+def test_each_sentence_counts_once() -> None:
+    assert handler.count_factual_claims("Revenue rose 5 percent and margin grew 2 points.") == 1
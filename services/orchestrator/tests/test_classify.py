@@ -0,0 +1,30 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[3]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from services.orchestrator import handler
+
+
+@pytest.mark.parametrize(
+    ("message", "expected"),
+    [
+        ("What are the recently updated numbers?", {"fresh"}),
+        ("Summarize the newest filings", {"fresh"}),
+        ("Which features launched this quarter?", {"force"}),
+        ("Any product launches planned?", {"force"}),
+        ("Show the updating KPIs", {"force", "fresh"}),
+        ("What changed since the last earnings call?", {"force", "fresh"}),
+        ("Anything new this week?", {"fresh"}),
+        ("How did AAPL trade after the App Store ruling?", {"apple"}),
+        ("Tips to boost productivity", set()),
+        ("Thanks for the sincere answer", set()),
+        ("Tell me a joke", set()),
+    ],
+)
+def test_classify_matches_keyword_inflections(message: str, expected: set[str]) -> None:
+    assert handler._classify(message) == expected
@@ -0,0 +1,94 @@
+import sys
+from pathlib import Path
+from typing import Any, Dict
+
+ROOT = Path(__file__).resolve().parents[3]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from services.orchestrator import handler
+
+APPLE_LEAD = (
+    "Apple Inc. reported fourth-quarter revenue of $89.5 billion on Thursday, beating Wall Street estimates as "
+    "iPhone sales held up and services revenue hit a record, sending shares higher in after-hours trading."
+)
+APPLE_REWRITE = (
+    "Apple reported fourth quarter revenue of $89.5 billion on Thursday, topping Wall Street estimates as "
+    "iPhone sales held up and services revenue reached a record, sending its shares higher in late trading."
+)
+MICROSOFT_LEAD = (
+    "Microsoft Corp. reported fourth-quarter revenue of $56.2 billion on Tuesday, beating Wall Street estimates as "
+    "Azure cloud growth accelerated and Office sales held up, sending shares higher in after-hours trading."
+)
+
+
+def _hit(chunk_id: str, title: str, text: str) -> Dict[str, Any]:
+    return {
+        "chunk_id": chunk_id,
+        "text": text,
+        "score": 0.8,
+        "metadata": {"title": title, "source": "Wire", "published_at": "2024-10-31"},
+    }
+
+
+def test_deduplicate_hits_drops_retitled_copies_of_a_story() -> None:
+    hits = [
+        _hit("c1", "Apple beats Q4 earnings", APPLE_LEAD),
+        _hit("c2", "Apple Q4 earnings beat estimates", APPLE_LEAD),
+        _hit("c3", "Apple beats Q4 earnings estimates", APPLE_LEAD + " Analysts had expected $87.6 billion."),
+        _hit("c4", "Microsoft beats Q4 earnings", MICROSOFT_LEAD),
+    ]
+
+    kept = [hit["chunk_id"] for hit in handler._deduplicate_hits(hits)]
+
+    assert kept == ["c1", "c4"]
+
+
+def test_deduplicate_hits_keeps_reworded_leads() -> None:
+    hits = [
+        _hit("c1", "Apple beats Q4 earnings", APPLE_LEAD),
+        _hit("c2", "Apple Q4 earnings beat estimates", APPLE_REWRITE),
+    ]
+
+    assert handler._deduplicate_hits(hits) == hits
+
+
+def test_deduplicate_hits_keeps_same_template_headlines() -> None:
+    hits = [
+        _hit("c1", "Apple stock rises 3% after earnings", "Apple shares rose 3% on Thursday after quarterly earnings."),
+        _hit(
+            "c2",
+            "Microsoft stock rises 3% after earnings",
+            "Microsoft shares rose 3% on Thursday after quarterly earnings.",
+        ),
+        _hit("c3", "Apple stock falls 3% after earnings", "Apple shares fell 3% on Thursday after quarterly earnings."),
+    ]
+    for hit in hits:
+        hit["metadata"]["source"] = "Reuters"
+
+    assert handler._deduplicate_hits(hits) == hits
+
+
+def test_one_word_lead_change_exceeds_the_simhash_distance() -> None:
+    rises = handler._simhash("Apple shares rose 3% on Thursday after the company reported quarterly results.")
+    falls = handler._simhash("Apple shares fell 3% on Thursday after the company reported quarterly results.")
+    other = handler._simhash("Microsoft shares rose 3% on Thursday after the company reported quarterly results.")
+
+    assert (rises ^ falls).bit_count() > handler.SIMHASH_MAX_DISTANCE
+    assert (rises ^ other).bit_count() > handler.SIMHASH_MAX_DISTANCE
+
+
+def test_deduplicate_hits_keeps_same_titles_from_other_days() -> None:
+    first = _hit("c1", "Apple beats Q4 earnings", APPLE_LEAD)
+    second = _hit("c2", "Apple beats Q4 earnings", APPLE_LEAD)
+    second["metadata"]["published_at"] = "2023-11-02"
+
+    assert handler._deduplicate_hits([first, second]) == [first, second]
+
+
+def test_deduplicate_hits_keeps_templated_documents_without_an_outlet() -> None:
+    hits = [_hit(f"c{idx}", f"report-{idx}.csv", "quarter,revenue,margin\n" * 20) for idx in range(3)]
+    for hit in hits:
+        hit["metadata"].pop("source")
+
+    assert handler._deduplicate_hits(hits) == hits
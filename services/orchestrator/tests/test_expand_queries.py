@@ -0,0 +1,30 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[3]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from services.orchestrator import handler
+
+
+def test_duplicate_queries_keep_their_first_spelling_and_order() -> None:
+    queries = handler._expand_queries(["Revenue policy", " revenue POLICY ", "", "Travel"], "revenue", False)
+
+    assert queries == ["Revenue policy", "Travel"]
+
+
+def test_expansion_is_capped_by_max_rag_rewrites(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(handler.settings, "max_rag_rewrites", 3)
+
+    queries = handler._expand_queries(["Apple earnings"], "How did Apple do?", True)
+
+    assert len(queries) == 3
+    assert queries[0] == "Apple earnings"
+    assert len({query.lower() for query in queries}) == 3
+
+
+def test_empty_rewrites_fall_back_to_the_user_message() -> None:
+    assert handler._expand_queries(["", "  "], "What is our revenue policy?", False) == ["What is our revenue policy?"]
@@ -92,7 +92,7 @@ def test_citation_density_guard(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setattr(planner, "plan", fake_planner)
     monkeypatch.setattr(handler, "hybrid_search", fake_hybrid_search)
     monkeypatch.setattr(handler, "rerank", fake_rerank)
-    monkeypatch.setattr(handler, "estimate_confidence", fake_confidence)
+    monkeypatch.setattr(handler, "estimate_confidence_from_scores", fake_confidence)
     monkeypatch.setattr(synthesis, "compose", fake_llm_synthesis)
     monkeypatch.setattr(synthesis, "acknowledge_low_evidence", fake_no_cite)
 
@@ -150,7 +150,7 @@ def test_response_includes_meta_citations(monkeypatch: pytest.MonkeyPatch) -> No
     monkeypatch.setattr(planner, "plan", fake_planner)
     monkeypatch.setattr(handler, "hybrid_search", fake_hybrid_search)
     monkeypatch.setattr(handler, "rerank", fake_rerank)
-    monkeypatch.setattr(handler, "estimate_confidence", fake_confidence)
+    monkeypatch.setattr(handler, "estimate_confidence_from_scores", fake_confidence)
     monkeypatch.setattr(synthesis, "compose", fake_compose)
     monkeypatch.setattr(synthesis, "acknowledge_low_evidence", lambda final: final)
 
@@ -219,7 +219,7 @@ def test_meta_citations_fall_back_to_rag_docs(monkeypatch: pytest.MonkeyPatch) -
     monkeypatch.setattr(planner, "plan", fake_planner)
     monkeypatch.setattr(handler, "hybrid_search", fake_hybrid_search)
     monkeypatch.setattr(handler, "rerank", fake_rerank)
-    monkeypatch.setattr(handler, "estimate_confidence", fake_confidence)
+    monkeypatch.setattr(handler, "estimate_confidence_from_scores", fake_confidence)
     monkeypatch.setattr(synthesis, "compose", fake_compose)
     monkeypatch.setattr(synthesis, "acknowledge_low_evidence", lambda final: final)
 
@@ -260,7 +260,7 @@ def test_rag_quality_gate_returns_insufficient(monkeypatch: pytest.MonkeyPatch)
     monkeypatch.setattr(planner, "plan", fake_planner)
     monkeypatch.setattr(handler, "hybrid_search", fake_hybrid_search)
     monkeypatch.setattr(handler, "rerank", lambda hits, k: hits)
-    monkeypatch.setattr(handler, "estimate_confidence", lambda *_args, **_kwargs: 0.7)
+    monkeypatch.setattr(handler, "estimate_confidence_from_scores", lambda *_args, **_kwargs: 0.7)
 
     async def _run() -> None:
         response = await handler.handle_query("rag-gate", "Share the latest Apple earnings commentary.", {})
@@ -293,7 +293,7 @@ def test_risk_cache_signature_changes(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setattr(synthesis, "acknowledge_low_evidence", lambda final: final)
     monkeypatch.setattr(handler, "hybrid_search", lambda *_args, **_kwargs: [])
     monkeypatch.setattr(handler, "rerank", lambda hits, k: hits)
-    monkeypatch.setattr(handler, "estimate_confidence", lambda *_args, **_kwargs: 0.0)
+    monkeypatch.setattr(handler, "estimate_confidence_from_scores", lambda *_args, **_kwargs: 0.0)
     monkeypatch.setattr(handler, "risk_run", fake_risk_run, raising=False)
 
     async def _run() -> None:
@@ -343,7 +343,7 @@ def test_risk_failure_is_graceful(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setattr(synthesis, "acknowledge_low_evidence", lambda final: final)
     monkeypatch.setattr(handler, "hybrid_search", lambda *_args, **_kwargs: [])
     monkeypatch.setattr(handler, "rerank", lambda hits, k: hits)
-    monkeypatch.setattr(handler, "estimate_confidence", lambda *_args, **_kwargs: 0.0)
+    monkeypatch.setattr(handler, "estimate_confidence_from_scores", lambda *_args, **_kwargs: 0.0)
 
     async def _run() -> None:
         response = await handler.handle_query("risk-error", "Please run a Monte Carlo", {})
@@ -374,7 +374,7 @@ def test_risk_spec_missing_is_reported(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setattr(synthesis, "acknowledge_low_evidence", lambda final: final)
     monkeypatch.setattr(handler, "hybrid_search", lambda *_args, **_kwargs: [])
     monkeypatch.setattr(handler, "rerank", lambda hits, k: hits)
-    monkeypatch.setattr(handler, "estimate_confidence", lambda *_args, **_kwargs: 0.0)
+    monkeypatch.setattr(handler, "estimate_confidence_from_scores", lambda *_args, **_kwargs: 0.0)
 
     async def _run() -> None:
         response = await handler.handle_query("risk-missing", "please run monte carlo", {})
@@ -413,7 +413,7 @@ def test_memory_follow_up_skips_rag(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setattr(synthesis, "acknowledge_low_evidence", lambda final: final)
     monkeypatch.setattr(handler, "hybrid_search", fake_hybrid_search)
     monkeypatch.setattr(handler, "rerank", lambda hits, k: hits)
-    monkeypatch.setattr(handler, "estimate_confidence", lambda *_args, **_kwargs: 0.9)
+    monkeypatch.setattr(handler, "estimate_confidence_from_scores", lambda *_args, **_kwargs: 0.9)
 
     async def _run() -> None:
         await handler.handle_query("mem-thread", "What is the KPI trend?", {})
@@ -446,7 +446,7 @@ def test_latency_budget_applies_early_cut(monkeypatch: pytest.MonkeyPatch) -> No
     monkeypatch.setattr(planner, "plan", fake_planner)
     monkeypatch.setattr(handler, "hybrid_search", slow_hybrid_search)
     monkeypatch.setattr(handler, "rerank", fake_rerank)
-    monkeypatch.setattr(handler, "estimate_confidence", lambda *_args, **_kwargs: 0.9)
+    monkeypatch.setattr(handler, "estimate_confidence_from_scores", lambda *_args, **_kwargs: 0.9)
     monkeypatch.setattr(synthesis, "compose", fake_llm_synthesis)
     monkeypatch.setattr(synthesis, "acknowledge_low_evidence", lambda final: final)
 
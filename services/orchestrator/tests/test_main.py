@@ -0,0 +1,42 @@
+import sys
+from pathlib import Path
+from typing import Any, Dict
+
+import pytest
+from fastapi.testclient import TestClient
+
+ROOT = Path(__file__).resolve().parents[3]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from services.orchestrator import main
+from services.orchestrator.schemas import AssistantResponse
+
+
+def test_query_returns_the_serialized_response(monkeypatch: pytest.MonkeyPatch) -> None:
+    seen: Dict[str, Any] = {}
+
+    async def fake_handle_query(thread_id: str, message: str, meta: Dict[str, Any]) -> AssistantResponse:
+        seen.update(thread_id=thread_id, message=message, meta=meta)
+        return AssistantResponse(
+            text="Revenue is recognized on delivery.",
+            used={"rag": {"docs": 3}},
+            metrics={"latency_ms": 12.5},
+            telemetry={"docIds": ["doc-1"]},
+        )
+
+    monkeypatch.setattr(main, "handle_query", fake_handle_query)
+
+    response = TestClient(main.app).post("/v1/query", json={"message": "Revenue policy?", "meta": {"thread_id": "t-1"}})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert AssistantResponse.model_validate(response.json()).text == "Revenue is recognized on delivery."
+    assert response.json()["telemetry"] == {"docIds": ["doc-1"]}
+    assert seen == {"thread_id": "t-1", "message": "Revenue policy?", "meta": {"thread_id": "t-1"}}
+
+
+def test_query_without_a_message_is_rejected() -> None:
+    response = TestClient(main.app).post("/v1/query", json={"thread_id": "t-1"})
+
+    assert response.status_code == 400
@@ -0,0 +1,40 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[3]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from services.orchestrator.memory import MemoryStore
+
+
+def test_recall_ranks_turns_by_token_overlap() -> None:
+    store = MemoryStore()
+    store.append_turn("thread-1", "What is our Revenue policy?", "Revenue is recognized on delivery.")
+    store.append_turn("thread-1", "Who approves travel?", "Managers approve travel.")
+    store.append_turn("thread-1", "revenue forecast", "Forecast is flat.")
+
+    recalled = store.vector_recall("thread-1", "revenue FORECAST", top_k=2)
+
+    assert [item["text"] for item in recalled] == [
+        "revenue forecast\nForecast is flat.",
+        "What is our Revenue policy?\nRevenue is recognized on delivery.",
+    ]
+    assert recalled[0]["score"] > recalled[1]["score"]
+
+
+def test_recall_skips_turns_without_overlap() -> None:
+    store = MemoryStore()
+    store.append_turn("thread-1", "Who approves travel?", "Managers approve travel.")
+
+    assert store.vector_recall("thread-1", "revenue forecast") == []
+    assert store.vector_recall("thread-unknown", "travel") == []
+
+
+def test_recall_tokens_are_built_when_the_turn_is_stored() -> None:
+    store = MemoryStore()
+    store.append_turn("thread-1", "Revenue  Policy", "Approved")
+
+    turn = store._turns["thread-1"][0]
+
+    assert turn.recall_tokens == frozenset({"revenue", "policy", "approved"})
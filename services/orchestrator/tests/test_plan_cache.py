@@ -0,0 +1,83 @@
+import asyncio
+import json
+import sys
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[3]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from services.orchestrator import planner
+
+_PLAN = {
+    "needRag": True,
+    "needRisk": False,
+    "ragQueries": ["revenue"],
+    "riskSpec": None,
+    "expected": [],
+    "confidence": 0.8,
+}
+
+
+@pytest.fixture
+def llm(monkeypatch: pytest.MonkeyPatch) -> List[Dict[str, Any]]:
+    calls: List[Dict[str, Any]] = []
+
+    async def fake_complete(payload: Dict[str, Any]) -> Dict[str, Any]:
+        calls.append(payload)
+        return {"text": json.dumps(_PLAN)}
+
+    monkeypatch.setattr(planner, "complete", fake_complete)
+    monkeypatch.setattr(planner, "_PLAN_CACHE", OrderedDict())
+    monkeypatch.setattr(planner.settings, "plan_cache_ttl_s", 300.0)
+    return calls
+
+
+def test_identical_prompt_reuses_the_plan(llm: List[Dict[str, Any]]) -> None:
+    first = asyncio.run(planner.plan("Show revenue", "", "", []))
+    first.ragQueries.append("mutated by the caller")
+    second = asyncio.run(planner.plan("Show revenue", "", "", []))
+
+    assert len(llm) == 1
+    assert second.ragQueries == ["revenue"]
+
+
+def test_different_context_is_planned_again(llm: List[Dict[str, Any]]) -> None:
+    asyncio.run(planner.plan("Show revenue", "", "", []))
+    asyncio.run(planner.plan("Show revenue", "user: hi", "", []))
+
+    assert len(llm) == 2
+
+
+def test_expired_plan_is_recomputed(llm: List[Dict[str, Any]]) -> None:
+    asyncio.run(planner.plan("Show revenue", "", "", []))
+    for key, (_, plan) in list(planner._PLAN_CACHE.items()):
+        planner._PLAN_CACHE[key] = (time.monotonic() - planner.settings.plan_cache_ttl_s, plan)
+    asyncio.run(planner.plan("Show revenue", "", "", []))
+
+    assert len(llm) == 2
+
+
+def test_fallback_plans_are_not_cached(llm: List[Dict[str, Any]], monkeypatch: pytest.MonkeyPatch) -> None:
+    async def broken_complete(payload: Dict[str, Any]) -> Dict[str, Any]:
+        llm.append(payload)
+        return {"text": "not json"}
+
+    monkeypatch.setattr(planner, "complete", broken_complete)
+    fallback = asyncio.run(planner.plan("Show revenue", "", "", []))
+
+    assert fallback.confidence == 0.0
+    assert not planner._PLAN_CACHE
+
+
+def test_disabled_cache_always_calls_the_planner(llm: List[Dict[str, Any]], monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(planner.settings, "plan_cache_ttl_s", 0.0)
+    asyncio.run(planner.plan("Show revenue", "", "", []))
+    asyncio.run(planner.plan("Show revenue", "", "", []))
+
+    assert len(llm) == 2
@@ -0,0 +1,72 @@
+import asyncio
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[3]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from services.orchestrator import handler
+from services.orchestrator.schemas import Plan
+
+
+@pytest.fixture(autouse=True)
+def _no_response_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(handler.settings, "response_cache_ttl_s", 0.0)
+
+
+async def _rag_plan(*_args: Any, **_kwargs: Any) -> Plan:
+    return Plan(needRag=True, needRisk=False, ragQueries=["revenue policy"], riskSpec=None, expected=[], confidence=0.7)
+
+
+def test_prefetch_failure_is_surfaced_without_a_second_search(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: List[List[str]] = []
+
+    async def failing_search(queries: List[str], top_k: int = 8) -> List[Dict[str, Any]]:
+        calls.append(list(queries))
+        raise RuntimeError("rag down")
+
+    monkeypatch.setattr(handler.planner, "plan", _rag_plan)
+    monkeypatch.setattr(handler, "hybrid_search", failing_search)
+
+    response = asyncio.run(handler.handle_query("thread-prefetch", "What is our revenue policy?", {}))
+
+    assert response.telemetry["rag_failure"] == "INDEX_NOT_READY"
+    assert response.telemetry["rag_debug"] == {"error": "rag down"}
+    assert len(calls) == 1
+
+
+def test_prefetch_is_cancelled_when_the_query_fails_before_searching(monkeypatch: pytest.MonkeyPatch) -> None:
+    state: Dict[str, Any] = {}
+
+    async def slow_search(queries: List[str], top_k: int = 8) -> List[Dict[str, Any]]:
+        state["started"].set()
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            state["cancelled"] = True
+            raise
+        return []
+
+    async def plan_after_search_started(*args: Any, **kwargs: Any) -> Plan:
+        await state["started"].wait()
+        return await _rag_plan()
+
+    def broken_shape(_user_msg: str) -> str:
+        raise ValueError("shape failed")
+
+    monkeypatch.setattr(handler.planner, "plan", plan_after_search_started)
+    monkeypatch.setattr(handler.synthesis, "infer_shape", broken_shape)
+    monkeypatch.setattr(handler, "hybrid_search", slow_search)
+
+    async def _run() -> None:
+        state["started"] = asyncio.Event()
+        with pytest.raises(ValueError):
+            await handler.handle_query("thread-prefetch", "What is our revenue policy?", {})
+        await asyncio.sleep(0)
+        assert state.get("cancelled") is True
+
+    asyncio.run(_run())
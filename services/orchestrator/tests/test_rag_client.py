@@ -0,0 +1,128 @@
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import httpx
+import pytest
+
+ROOT = Path(__file__).resolve().parents[3]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from services.orchestrator import rag
+
+
+class _RagService:
+    """httpx transport standing in for the RAG service; records the paths it was asked for."""
+
+    def __init__(self, batch_status: int = 200) -> None:
+        self.batch_status = batch_status
+        self.paths: List[str] = []
+        self.failing: set[str] = set()
+
+    def _result(self, query: str) -> Dict[str, Any]:
+        if query in self.failing:
+            return {"query": query, "top_k": 5, "chunks": [], "error": "opensearch timeout"}
+        return {"query": query, "top_k": 5, "chunks": [{"doc_id": f"doc-{query}", "text": query, "score": 0.5}]}
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.paths.append(request.url.path)
+        payload = json.loads(request.content)
+        if request.url.path.endswith("/batch"):
+            if self.batch_status != 200:
+                return httpx.Response(self.batch_status)
+            return httpx.Response(200, json={"results": [self._result(query) for query in payload["queries"]]})
+        result = self._result(payload["query"])
+        if result.get("error"):
+            return httpx.Response(503)
+        return httpx.Response(200, json=result)
+
+
+@pytest.fixture
+def service(monkeypatch: pytest.MonkeyPatch) -> _RagService:
+    fake = _RagService()
+    monkeypatch.setattr(rag, "get_client", lambda *_args, **_kwargs: httpx.AsyncClient(transport=httpx.MockTransport(fake)))
+    monkeypatch.setattr(rag, "_batch_retry_at", 0.0)
+    return fake
+
+
+def test_rewrites_are_retrieved_in_one_batch(service: _RagService) -> None:
+    hits = asyncio.run(rag.hybrid_search(["revenue", "margin"], top_k=5))
+
+    assert service.paths == ["/v1/retrieve/batch"]
+    assert [(hit["doc_id"], hit["_query"]) for hit in hits] == [("doc-revenue", "revenue"), ("doc-margin", "margin")]
+
+
+def test_failed_batch_query_is_logged_and_skipped(service: _RagService, caplog: pytest.LogCaptureFixture) -> None:
+    service.failing = {"margin"}
+
+    hits = asyncio.run(rag.hybrid_search(["revenue", "margin"], top_k=5))
+
+    assert [hit["_query"] for hit in hits] == ["revenue"]
+    assert "opensearch timeout" in caplog.text
+
+
+def test_search_fails_when_every_batch_query_fails(service: _RagService) -> None:
+    service.failing = {"revenue", "margin"}
+
+    with pytest.raises(RuntimeError, match="opensearch timeout"):
+        asyncio.run(rag.hybrid_search(["revenue", "margin"], top_k=5))
+
+
+def test_missing_batch_endpoint_falls_back_and_is_retried_later(
+    service: _RagService, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    service.batch_status = 404
+
+    asyncio.run(rag.hybrid_search(["revenue", "margin"], top_k=5))
+    assert service.paths == ["/v1/retrieve/batch", "/v1/retrieve", "/v1/retrieve"]
+
+    service.paths.clear()
+    asyncio.run(rag.hybrid_search(["revenue", "margin"], top_k=5))
+    assert service.paths == ["/v1/retrieve", "/v1/retrieve"]
+
+    service.paths.clear()
+    service.batch_status = 200
+    # Once the retry deadline has passed the batch endpoint is tried again.
+    monkeypatch.setattr(rag, "_batch_retry_at", time.monotonic() - 1.0)
+    asyncio.run(rag.hybrid_search(["revenue", "margin"], top_k=5))
+    assert service.paths == ["/v1/retrieve/batch"]
+
+
+def test_failed_rewrite_on_the_per_query_path_keeps_the_others(service: _RagService) -> None:
+    service.batch_status = 404
+    service.failing = {"margin"}
+
+    hits = asyncio.run(rag.hybrid_search(["revenue", "margin", "churn"], top_k=5))
+
+    assert [hit["_query"] for hit in hits] == ["revenue", "churn"]
+
+
+def test_per_query_retrievals_are_bounded(service: _RagService, monkeypatch: pytest.MonkeyPatch) -> None:
+    service.batch_status = 404
+    state = {"active": 0, "peak": 0}
+
+    async def slow_post(url: str, json: Dict[str, Any]) -> httpx.Response:
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        await asyncio.sleep(0.01)
+        state["active"] -= 1
+        return httpx.Response(200, json=service._result(json["query"]), request=httpx.Request("POST", url))
+
+    class _Client:
+        post = staticmethod(slow_post)
+
+    monkeypatch.setattr(rag, "get_client", lambda *_args, **_kwargs: _Client())
+    monkeypatch.setattr(rag, "_batch_retry_at", time.monotonic() + 60.0)
+
+    async def _run() -> List[Dict[str, Any]]:
+        monkeypatch.setattr(rag, "_retrieve_slots", asyncio.Semaphore(2))
+        return await rag.hybrid_search(["revenue", "margin", "churn", "travel"], top_k=5)
+
+    hits = asyncio.run(_run())
+
+    assert len(hits) == 4
+    assert state["peak"] == 2
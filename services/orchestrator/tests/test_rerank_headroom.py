@@ -0,0 +1,65 @@
+import asyncio
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[3]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from services.orchestrator import handler
+from services.orchestrator.schemas import FinalDraft, Plan
+
+APPLE_LEAD = (
+    "Apple Inc. reported fourth-quarter revenue of $89.5 billion on Thursday, beating Wall Street estimates as "
+    "iPhone sales held up and services revenue hit a record, sending shares higher in after-hours trading. "
+    "The company said gross margin widened on a richer mix of services and wearables, and guided to flat revenue "
+    "for the holiday quarter."
+)
+
+
+def _duplicate(index: int) -> Dict[str, Any]:
+    return {
+        "chunk_id": f"apple-{index}",
+        "text": APPLE_LEAD,
+        "score": 0.95 - index * 0.001,
+        "metadata": {"title": "Apple beats Q4 earnings", "source": "Wire", "published_at": "2024-10-31"},
+    }
+
+
+def _distinct(index: int) -> Dict[str, Any]:
+    return {
+        "chunk_id": f"policy-{index}",
+        "text": f"Revenue policy section {index}. " + "Recognition rules for contracts and invoices. " * 8,
+        "score": 0.7,
+        "metadata": {"title": f"Revenue policy section {index}"},
+    }
+
+
+async def _rag_plan(*_args: Any, **_kwargs: Any) -> Plan:
+    return Plan(needRag=True, needRisk=False, ragQueries=["revenue policy"], riskSpec=None, expected=[], confidence=0.7)
+
+
+def test_duplicates_above_the_context_window_do_not_starve_it(monkeypatch: pytest.MonkeyPatch) -> None:
+    composed: List[List[Dict[str, Any]]] = []
+    hits = [_duplicate(index) for index in range(10)] + [_distinct(index) for index in range(5)]
+
+    async def search(queries: List[str], top_k: int = 8) -> List[Dict[str, Any]]:
+        return [dict(hit) for hit in hits]
+
+    async def compose(**kwargs: Any) -> FinalDraft:
+        composed.append(list(kwargs["rag_docs"]))
+        return FinalDraft(text="Revenue is recognized on delivery.")
+
+    monkeypatch.setattr(handler.settings, "response_cache_ttl_s", 0.0)
+    monkeypatch.setattr(handler.settings, "max_context_chunks", 5)
+    monkeypatch.setattr(handler.planner, "plan", _rag_plan)
+    monkeypatch.setattr(handler, "hybrid_search", search)
+    monkeypatch.setattr(handler.synthesis, "compose", compose)
+
+    asyncio.run(handler.handle_query("thread-headroom", "What is our revenue policy?", {}))
+
+    # Ten copies of one story outrank the policy docs; cutting the ranking at top_k would leave three docs.
+    assert [doc["chunk_id"] for doc in composed[0]] == ["apple-0", "policy-0", "policy-1", "policy-2", "policy-3"]
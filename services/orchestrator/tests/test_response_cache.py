@@ -0,0 +1,136 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[3]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from services.orchestrator import handler
+from services.orchestrator.schemas import AssistantResponse
+
+
+class _Answers:
+    """Fake _answer_query that counts calls and can be held open until released."""
+
+    def __init__(self) -> None:
+        self.calls: List[str] = []
+        self.used: Dict[str, Any] = {}
+        self.release: asyncio.Event | None = None
+        self.cancelled = False
+
+    async def __call__(self, thread_id: str, user_msg: str, meta: Dict[str, Any]) -> AssistantResponse:
+        self.calls.append(user_msg)
+        if self.release is not None:
+            try:
+                await self.release.wait()
+            except asyncio.CancelledError:
+                self.cancelled = True
+                raise
+        return AssistantResponse(
+            text=f"answer {len(self.calls)}",
+            used=dict(self.used),
+            metrics={"latency_ms": 1.0},
+            telemetry={},
+        )
+
+
+@pytest.fixture
+def answers(monkeypatch: pytest.MonkeyPatch) -> _Answers:
+    fake = _Answers()
+    monkeypatch.setattr(handler, "_answer_query", fake)
+    monkeypatch.setattr(handler.settings, "response_cache_ttl_s", 30.0)
+    monkeypatch.setattr(handler, "_RESPONSE_CACHE", handler.OrderedDict())
+    monkeypatch.setattr(handler, "_INFLIGHT", {})
+    return fake
+
+
+def test_repeated_message_is_answered_from_the_cache(answers: _Answers) -> None:
+    async def _run() -> None:
+        first = await handler.handle_query("thread-1", "What is our revenue policy?", {})
+        first.text = "mutated by the caller"
+        second = await handler.handle_query("thread-1", "What is our revenue policy?", {})
+        other_thread = await handler.handle_query("thread-2", "What is our revenue policy?", {})
+        assert second.text == "answer 1"
+        assert other_thread.text == "answer 2"
+
+    asyncio.run(_run())
+    assert len(answers.calls) == 2
+
+
+def test_expired_entries_are_recomputed(answers: _Answers) -> None:
+    async def _run() -> None:
+        await handler.handle_query("thread-1", "What is our revenue policy?", {})
+        key = handler._response_cache_key("thread-1", "What is our revenue policy?")
+        _, response = handler._RESPONSE_CACHE[key]
+        handler._RESPONSE_CACHE[key] = (time.monotonic() - handler.settings.response_cache_ttl_s - 1.0, response)
+        refreshed = await handler.handle_query("thread-1", "What is our revenue policy?", {})
+        assert refreshed.text == "answer 2"
+
+    asyncio.run(_run())
+    assert len(answers.calls) == 2
+
+
+def test_risk_answers_are_not_cached(answers: _Answers) -> None:
+    answers.used = {"risk": {"signature": "abc"}}
+
+    async def _run() -> None:
+        await handler.handle_query("thread-1", "Simulate churn risk", {})
+        await handler.handle_query("thread-1", "Simulate churn risk", {})
+
+    asyncio.run(_run())
+    assert len(answers.calls) == 2
+    assert not handler._RESPONSE_CACHE
+
+
+def test_concurrent_duplicates_share_one_answer(answers: _Answers) -> None:
+    async def _run() -> None:
+        answers.release = asyncio.Event()
+        pending = [asyncio.create_task(handler.handle_query("thread-1", "Summarize Q4", {})) for _ in range(3)]
+        await asyncio.sleep(0)
+        answers.release.set()
+        responses = await asyncio.gather(*pending)
+        assert [response.text for response in responses] == ["answer 1"] * 3
+        assert len({id(response) for response in responses}) == 3
+
+    asyncio.run(_run())
+    assert answers.calls == ["Summarize Q4"]
+    assert not handler._INFLIGHT
+
+
+def test_first_caller_disconnecting_does_not_cancel_duplicates(answers: _Answers) -> None:
+    async def _run() -> None:
+        answers.release = asyncio.Event()
+        owner = asyncio.create_task(handler.handle_query("thread-1", "Summarize Q4", {}))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(handler.handle_query("thread-1", "Summarize Q4", {}))
+        await asyncio.sleep(0)
+        owner.cancel()
+        await asyncio.sleep(0)
+        answers.release.set()
+        assert (await follower).text == "answer 1"
+        assert owner.cancelled()
+
+    asyncio.run(_run())
+    assert answers.cancelled is False
+    assert len(answers.calls) == 1
+
+
+def test_answer_is_cancelled_once_every_caller_is_gone(answers: _Answers) -> None:
+    async def _run() -> None:
+        answers.release = asyncio.Event()
+        pending = [asyncio.create_task(handler.handle_query("thread-1", "Summarize Q4", {})) for _ in range(2)]
+        await asyncio.sleep(0)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        await asyncio.sleep(0)
+
+    asyncio.run(_run())
+    assert answers.cancelled is True
+    assert not handler._INFLIGHT
+    assert not handler._RESPONSE_CACHE
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 from dataclasses import dataclass
@@ -31,6 +32,7 @@ Instrumentator().instrument(app).expose(app)
 logger = logging.getLogger(__name__)
 
 hybrid_retriever = HybridRetriever(settings)
+MAX_BATCH_QUERIES = 32
 
 
 @dataclass(slots=True)
@@ -122,6 +124,19 @@ class RetrieveResponse(BaseModel):
     chunks: List[RetrieveChunk] = Field(default_factory=list)
     usage: Dict[str, Any] = Field(default_factory=dict)
     documents: List[RetrieveDocument] = Field(default_factory=list)
+    # Only set on /v1/retrieve/batch results whose query failed.
+    error: Optional[str] = None
+
+
+class RetrieveBatchRequest(BaseModel):
+    # Each query fans out to its own retrieval and rerank, so keep one request's share of the backends bounded.
+    queries: List[str] = Field(min_length=1, max_length=MAX_BATCH_QUERIES)
+    top_k: int = Field(default=5, gt=0)
+    index: Optional[str] = None
+
+
+class RetrieveBatchResponse(BaseModel):
+    results: List[RetrieveResponse] = Field(default_factory=list)
 
 
 def _describe_file(metadata: Optional[Dict[str, Any]]) -> Optional[str]:
@@ -547,6 +562,29 @@ async def retrieve(request: RetrieveRequest) -> RetrieveResponse:
     )
 
 
+@app.post("/v1/retrieve/batch", response_model=RetrieveBatchResponse)
+async def retrieve_batch(request: RetrieveBatchRequest) -> RetrieveBatchResponse:
+    """Retrieve several queries (e.g. one question's rewrites) in one round trip; results keep the query order."""
+    outcomes = await asyncio.gather(
+        *(retrieve(RetrieveRequest(query=query, top_k=request.top_k, index=request.index)) for query in request.queries),
+        return_exceptions=True,
+    )
+    failures = [outcome for outcome in outcomes if isinstance(outcome, BaseException)]
+    if len(failures) == len(outcomes):
+        first = failures[0]
+        if isinstance(first, HTTPException):
+            raise first
+        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=f"Retrieval failed: {first}") from first
+    results: List[RetrieveResponse] = []
+    for query, outcome in zip(request.queries, outcomes):
+        if isinstance(outcome, BaseException):
+            # A failed query comes back empty with its error so the caller still gets the others.
+            logger.warning("Batch retrieval failed for query %r: %s", query, outcome)
+            outcome = RetrieveResponse(query=query, top_k=request.top_k, error=str(outcome) or type(outcome).__name__)
+        results.append(outcome)
+    return RetrieveBatchResponse(results=results)
+
+
 @app.get("/health")
 def health() -> Dict[str, str]:
     return {"status": "ok"}
@@ -0,0 +1,48 @@
+"""Tests for the batched retrieve endpoint."""
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from pydantic import ValidationError
+
+from services.rag import main as rag_main
+
+
+def _fake_retrieve(failing: set[str]):
+    async def retrieve(request: rag_main.RetrieveRequest) -> rag_main.RetrieveResponse:
+        if request.query in failing:
+            raise RuntimeError(f"{request.query} timed out")
+        chunk = rag_main.RetrieveChunk(doc_id=f"doc-{request.query}", chunk_id="c1", text=request.query, score=0.5)
+        return rag_main.RetrieveResponse(query=request.query, top_k=request.top_k, chunks=[chunk])
+
+    return retrieve
+
+
+def test_batch_request_caps_the_number_of_queries() -> None:
+    rag_main.RetrieveBatchRequest(queries=["q"] * rag_main.MAX_BATCH_QUERIES)
+    with pytest.raises(ValidationError):
+        rag_main.RetrieveBatchRequest(queries=["q"] * (rag_main.MAX_BATCH_QUERIES + 1))
+    with pytest.raises(ValidationError):
+        rag_main.RetrieveBatchRequest(queries=[])
+
+
+def test_batch_keeps_query_order_and_reports_failed_queries(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(rag_main, "retrieve", _fake_retrieve({"margin"}))
+    request = rag_main.RetrieveBatchRequest(queries=["revenue", "margin", "guidance"], top_k=3)
+
+    response = asyncio.run(rag_main.retrieve_batch(request))
+
+    assert [result.query for result in response.results] == ["revenue", "margin", "guidance"]
+    assert [result.error for result in response.results] == [None, "margin timed out", None]
+    assert response.results[1].chunks == []
+    assert response.results[0].chunks[0].doc_id == "doc-revenue"
+
+
+def test_batch_fails_when_every_query_fails(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(rag_main, "retrieve", _fake_retrieve({"revenue", "margin"}))
+    request = rag_main.RetrieveBatchRequest(queries=["revenue", "margin"])
+
+    with pytest.raises(HTTPException) as excinfo:
+        asyncio.run(rag_main.retrieve_batch(request))
+    assert excinfo.value.status_code == 502